@@ -0,0 +1,122 @@
+"""Scripted stand-in for the Gemini chat model, for offline benchmarks.
+
+``ScriptedChatModel`` answers from a responder function instead of calling
+an API, sleeping ``latency`` seconds per call so the agent loop keeps a
+realistic shape. Install it with ``src.models.model.set_model``.
+"""
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+Responder = Callable[[list[BaseMessage]], AIMessage]
+
+_CREATE = re.compile(r"^(?:crie|criar|adicione|adicionar)\s+(?:a\s+|uma\s+)?(?:tarefa\s+)?(?P<title>.+)$", re.IGNORECASE)
+_SEARCH = re.compile(r"^(?:busque|procure|encontre|ache)\s+(?:a\s+|as\s+)?(?:tarefas?\s+)?(?:sobre\s+|de\s+)?(?P<query>.+)$", re.IGNORECASE)
+_COMPLETE = re.compile(r"^(?:conclua|complete|finalize|marque)\s+(?:a\s+)?(?:tarefa\s+)?(?P<query>.+?)(?:\s+como\s+conclu[ií]da)?$", re.IGNORECASE)
+_call_ids = itertools.count(1)
+
+
+def _tool_call(name: str, args: dict[str, Any]) -> AIMessage:
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call-{next(_call_ids)}", "type": "tool_call"}])
+
+
+def default_responder(messages: list[BaseMessage]) -> AIMessage:
+    """Pick a plausible next step for the common Portuguese task requests.
+
+    "crie ..." creates, "busque ..." searches, "conclua ..." searches and then
+    completes the best match; anything else is answered from the context.
+    Once a tool result arrives (and nothing is left to do) it answers in text.
+    """
+    last_human = max(index for index, message in enumerate(messages) if isinstance(message, HumanMessage))
+    request = str(messages[last_human].content).strip().rstrip(".?!")
+    results = [message for message in messages[last_human + 1:] if isinstance(message, ToolMessage)]
+
+    complete = _COMPLETE.match(request)
+    if complete:
+        if not results:
+            return _tool_call("google_tasks_search", {"query": complete["query"], "status": "needsAction", "limit": 1})
+        if len(results) == 1:
+            found = json.loads(results[0].content).get("tasks") or []
+            if found:
+                return _tool_call(
+                    "google_tasks_update",
+                    {"task_id": found[0]["id"], "status": "completed", "tasklist": found[0].get("tasklist")},
+                )
+            return AIMessage(content="Não encontrei essa tarefa.")
+    elif not results:
+        create = _CREATE.match(request)
+        if create:
+            return _tool_call("google_tasks_create", {"title": create["title"]})
+        search = _SEARCH.match(request)
+        if search:
+            return _tool_call("google_tasks_search", {"query": search["query"]})
+        return AIMessage(content="Aqui está o resumo das suas tarefas com base no contexto carregado.")
+    payload = json.loads(results[-1].content) if results else {}
+    if not payload.get("ok", True):
+        return AIMessage(content=f"Não consegui concluir: {payload.get('error')}")
+    return AIMessage(content=f"Pronto. {payload.get('message') or ''} ({payload.get('count', 1)} item(ns))".strip())
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model whose replies come from ``responder``; counts its calls.
+
+    ``bind_tools`` returns the model itself, so it plugs in wherever the
+    agent expects Gemini with the Google Tasks tools bound.
+    """
+
+    responder: Responder = default_responder
+    latency: float = 0.0
+    prompt_tokens_per_char: float = 0.25
+
+    _calls: int = PrivateAttr(default=0)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def calls(self) -> int:
+        with self._lock:
+            return self._calls
+
+    def reset_calls(self) -> None:
+        with self._lock:
+            self._calls = 0
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _respond(self, messages: list[BaseMessage]) -> ChatResult:
+        with self._lock:
+            self._calls += 1
+        message = self.responder(messages)
+        prompt_chars = sum(len(str(item.content)) for item in messages)
+        input_tokens = int(prompt_chars * self.prompt_tokens_per_char)
+        output_tokens = int(len(str(message.content)) * self.prompt_tokens_per_char) + 1
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: list[str] | None = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(messages)
@@ -0,0 +1,290 @@
+"""In-process fake of the Google Tasks REST API for offline benchmarks.
+
+``FakeTasksBackend`` holds task lists in memory and serves the endpoints
+``GoogleTask`` uses (task lists, tasks list/get/insert/patch/delete and
+multipart batches) with configurable latency, page size and error injection.
+Plug it in through ``GoogleTask(http_factory=backend.http, ...)``.
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import httplib2
+
+TASKS_PREFIX = "/tasks/v1/"
+BATCH_PATH = "/batch"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class FakeTasksBackend:
+    """Shared state and counters; every ``http()`` transport talks to the same backend.
+
+    ``latency`` is the delay of each HTTP round trip in seconds (a batch costs
+    one round trip). ``page_size`` caps ``maxResults`` like the real API's 100.
+    ``error_rate`` is the fraction of operations answered with
+    ``error_status``; injected errors are drawn from a seeded generator and
+    carry a ``Retry-After`` header when ``retry_after`` is set.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        page_size: int = 100,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._lists: dict[str, dict[str, Any]] = {}
+        self._default_list: str | None = None
+        self._next_id = 0
+        self.round_trips = 0
+        self.operations: Counter[str] = Counter()
+        self.errors = 0
+
+    def add_list(self, title: str) -> str:
+        """Create a task list; the first one becomes the default list."""
+        with self._lock:
+            list_id = self._new_id("list")
+            self._lists[list_id] = {"id": list_id, "title": title, "updated": _now(), "tasks": {}}
+            if self._default_list is None:
+                self._default_list = list_id
+            return list_id
+
+    def add_task(self, list_id: str, **fields: Any) -> dict[str, Any]:
+        with self._lock:
+            return self._insert(self._lists[list_id], fields)
+
+    def seed(self, lists: int = 3, tasks_per_list: int = 50) -> None:
+        """Fill the backend with ``lists`` lists of varied Portuguese tasks."""
+        words = ["relatório", "reunião", "comprar", "pagar", "ligar", "revisar", "enviar", "agendar"]
+        objects = ["fornecedor", "orçamento", "conta de luz", "pão", "cliente", "contrato", "dentista", "projeto"]
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        for list_index in range(lists):
+            list_id = self.add_list("Minhas tarefas" if list_index == 0 else f"Lista {list_index}")
+            for task_index in range(tasks_per_list):
+                due = today + timedelta(days=(task_index % 14) - 4)
+                self.add_task(
+                    list_id,
+                    title=f"{words[task_index % len(words)]} {objects[(task_index // 3) % len(objects)]} {task_index}",
+                    notes="gerada pelo benchmark" if task_index % 4 == 0 else None,
+                    due=due.strftime("%Y-%m-%dT00:00:00.000Z") if task_index % 2 == 0 else None,
+                    status="completed" if task_index % 5 == 0 else "needsAction",
+                )
+
+    def http(self) -> "FakeTasksHttp":
+        """A new transport bound to this backend (one per pooled connection)."""
+        return FakeTasksHttp(self)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "round_trips": self.round_trips,
+                "operations": dict(self.operations),
+                "errors": self.errors,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.round_trips = 0
+            self.operations.clear()
+            self.errors = 0
+
+    def handle(self, method: str, uri: str, body: bytes | str | None, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        """Serve one HTTP request: ``(status, headers, body)``."""
+        if self.latency:
+            time.sleep(self.latency)
+        path = urlsplit(uri).path
+        with self._lock:
+            self.round_trips += 1
+        if path == BATCH_PATH:
+            return self._handle_batch(body, headers)
+        return self._dispatch(method, uri, body, headers)
+
+    def _dispatch(self, method: str, uri: str, body: bytes | str | None, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        parts = urlsplit(uri)
+        query = dict(parse_qsl(parts.query))
+        segments = [unquote(segment) for segment in parts.path[len(TASKS_PREFIX):].split("/")]
+        payload = json.loads(body) if body else {}
+        if_match = {key.lower(): value for key, value in headers.items()}.get("if-match")
+        with self._lock:
+            operation, handler = self._route(method, segments)
+            self.operations[operation] += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                status, response_headers, content = self._error(self.error_status, "Injected backend error.")
+                if self.retry_after is not None:
+                    response_headers["retry-after"] = f"{self.retry_after:g}"
+                return status, response_headers, content
+            if handler is None:
+                return self._error(404, f"No fake route for {method} {parts.path}.")
+            try:
+                result = handler(segments, query, payload, if_match)
+            except KeyError as error:
+                return self._error(404, f"Not found: {error}.")
+        if isinstance(result, tuple):
+            return result
+        if result is None:
+            return 204, {"content-length": "0"}, b""
+        return 200, {"content-type": "application/json; charset=UTF-8"}, json.dumps(result).encode()
+
+    def _route(self, method: str, segments: list[str]) -> tuple[str, Any]:
+        if segments[:2] == ["users", "@me"] and segments[2:3] == ["lists"]:
+            if len(segments) == 3 and method == "GET":
+                return "tasklists.list", self._list_tasklists
+            if len(segments) == 4 and method == "GET":
+                return "tasklists.get", self._get_tasklist
+        if segments[:1] == ["lists"] and segments[2:3] == ["tasks"]:
+            if len(segments) == 3:
+                return {"GET": ("tasks.list", self._list_tasks), "POST": ("tasks.insert", self._insert_task)}.get(
+                    method, (f"tasks.{method.lower()}", None)
+                )
+            if len(segments) == 4:
+                return {
+                    "GET": ("tasks.get", self._get_task),
+                    "PATCH": ("tasks.patch", self._patch_task),
+                    "DELETE": ("tasks.delete", self._delete_task),
+                }.get(method, (f"tasks.{method.lower()}", None))
+        return f"unknown.{method.lower()}", None
+
+    def _task_list(self, list_id: str) -> dict[str, Any]:
+        return self._lists[self._default_list if list_id == "@default" else list_id]
+
+    def _page(self, items: list[dict[str, Any]], query: dict[str, str]) -> dict[str, Any]:
+        size = min(int(query.get("maxResults", self.page_size)), self.page_size)
+        start = int(query.get("pageToken") or 0)
+        page: dict[str, Any] = {"items": items[start:start + size]}
+        if start + size < len(items):
+            page["nextPageToken"] = str(start + size)
+        return page
+
+    def _list_tasklists(self, segments, query, payload, if_match) -> dict[str, Any]:
+        return self._page([{key: value for key, value in task_list.items() if key != "tasks"} for task_list in self._lists.values()], query)
+
+    def _get_tasklist(self, segments, query, payload, if_match) -> dict[str, Any]:
+        task_list = self._task_list(segments[3])
+        return {key: value for key, value in task_list.items() if key != "tasks"}
+
+    def _list_tasks(self, segments, query, payload, if_match) -> dict[str, Any]:
+        tasks = list(self._task_list(segments[1])["tasks"].values())
+        if query.get("updatedMin"):
+            tasks = [task for task in tasks if task["updated"] >= query["updatedMin"]]
+        if query.get("showDeleted") != "true":
+            tasks = [task for task in tasks if not task.get("deleted")]
+        if query.get("showCompleted") == "false":
+            tasks = [task for task in tasks if task["status"] != "completed"]
+        return self._page([dict(task) for task in tasks], query)
+
+    def _get_task(self, segments, query, payload, if_match) -> dict[str, Any]:
+        task = self._task_list(segments[1])["tasks"][segments[3]]
+        if task.get("deleted"):
+            raise KeyError(segments[3])
+        return dict(task)
+
+    def _insert_task(self, segments, query, payload, if_match) -> dict[str, Any]:
+        return self._insert(self._task_list(segments[1]), payload)
+
+    def _patch_task(self, segments, query, payload, if_match) -> dict[str, Any] | tuple:
+        task = self._get_task(segments, query, payload, if_match)
+        if if_match and if_match != task["etag"]:
+            return self._error(412, "Precondition Failed")
+        task.update({key: value for key, value in payload.items() if key in ("title", "notes", "status", "due")})
+        self._touch(task)
+        self._task_list(segments[1])["tasks"][task["id"]] = task
+        return dict(task)
+
+    def _delete_task(self, segments, query, payload, if_match) -> None:
+        task = self._get_task(segments, query, payload, if_match)
+        task["deleted"] = True
+        self._touch(task)
+        self._task_list(segments[1])["tasks"][task["id"]] = task
+        return None
+
+    def _insert(self, task_list: dict[str, Any], fields: dict[str, Any]) -> dict[str, Any]:
+        task = {
+            "id": self._new_id("task"),
+            "title": fields.get("title") or "",
+            "status": fields.get("status") or "needsAction",
+            "position": f"{len(task_list['tasks']):020d}",
+        }
+        for key in ("notes", "due"):
+            if fields.get(key):
+                task[key] = fields[key]
+        self._touch(task)
+        task_list["tasks"][task["id"]] = task
+        return dict(task)
+
+    def _touch(self, task: dict[str, Any]) -> None:
+        task["updated"] = _now()
+        task["etag"] = f'"{self._new_id("etag")}"'
+
+    def _new_id(self, kind: str) -> str:
+        self._next_id += 1
+        return f"{kind}-{self._next_id}"
+
+    @staticmethod
+    def _error(status: int, message: str) -> tuple[int, dict[str, str], bytes]:
+        body = {"error": {"code": status, "message": message, "errors": [{"message": message}]}}
+        return status, {"content-type": "application/json; charset=UTF-8"}, json.dumps(body).encode()
+
+    def _handle_batch(self, body: bytes | str | None, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        content_type = {key.lower(): value for key, value in headers.items()}["content-type"]
+        raw = body.encode() if isinstance(body, str) else body or b""
+        message = BytesParser().parsebytes(f"content-type: {content_type}\r\n\r\n".encode() + raw)
+        boundary = "fake_batch_boundary"
+        lines = []
+        for part in message.get_payload():
+            request_line, _, rest = part.get_payload().partition("\n")
+            raw_headers, _, part_body = rest.replace("\r\n", "\n").partition("\n\n")
+            method, path, _ = request_line.strip().split(" ", 2)
+            part_headers = dict(line.split(": ", 1) for line in raw_headers.splitlines() if ": " in line)
+            status, response_headers, content = self._dispatch(method, path, part_body or None, part_headers)
+            response_head = "".join(f"{key}: {value}\r\n" for key, value in response_headers.items())
+            lines.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'].strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n{response_head}\r\n{content.decode()}\r\n"
+            )
+        lines.append(f"--{boundary}--")
+        return 200, {"content-type": f"multipart/mixed; boundary={boundary}"}, "".join(lines).encode()
+
+
+class FakeTasksHttp:
+    """``httplib2.Http`` stand-in; ``AuthorizedHttp`` wraps it like a real connection."""
+
+    def __init__(self, backend: FakeTasksBackend) -> None:
+        self.backend = backend
+        self.connections: dict = {}
+        self.timeout: float | None = None
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: bytes | str | None = None,
+        headers: dict[str, str] | None = None,
+        redirections: int = httplib2.DEFAULT_MAX_REDIRECTS,
+        connection_type: Any = None,
+    ) -> tuple[httplib2.Response, bytes]:
+        status, response_headers, content = self.backend.handle(method, uri, body, headers or {})
+        return httplib2.Response({"status": status, **response_headers}), content
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,247 @@
+"""End-to-end load benchmark, fully offline.
+
+Drives ``run_pipeline`` and/or the FastAPI ``/agent`` endpoint at several
+concurrency levels against an in-process fake of the Google Tasks API
+(``benchmarks.fake_tasks``) and a scripted chat model
+(``benchmarks.fake_model``). Reports p50/p95/p99 latency, throughput and
+LLM/API calls per request, and compares them with a stored baseline.
+
+Usage: python -m benchmarks.load [--target pipeline|api|all] [--concurrency 1,8,32]
+       [--requests N] [--error-rate F] [--error-status 429] [--rate-limit RPS]
+       [--no-mirror] [--coalesce-window SECONDS]
+       [--baseline PATH] [--save-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+# Request mix, cycled: routed listing, LLM-only answer, search, create, search + update.
+MESSAGES = [
+    "liste minhas tarefas",
+    "quais tarefas vencem hoje",
+    "busque tarefas sobre orçamento",
+    "crie a tarefa pagar boleto",
+    "conclua a tarefa ligar cliente",
+    "o que eu tenho de mais urgente?",
+]
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _summary(latencies: list[float], errors: int, wall: float, llm_calls: int, api_calls: int, requests: int) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / wall, 2) if wall else 0.0,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 1) if ordered else 0.0,
+        "llm_calls_per_request": round(llm_calls / requests, 2),
+        "api_calls_per_request": round(api_calls / requests, 2),
+    }
+
+
+def _run_pipeline_level(run_pipeline: Callable[[str], dict], concurrency: int, requests: int) -> tuple[list[float], int, float]:
+    def one(index: int) -> float | None:
+        started = time.perf_counter()
+        try:
+            run_pipeline(MESSAGES[index % len(MESSAGES)])
+        except Exception as error:
+            print(f"  request {index} failed: {error}", file=sys.stderr)
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one, range(requests)))
+    wall = time.perf_counter() - started
+    latencies = [outcome for outcome in outcomes if outcome is not None]
+    return latencies, len(outcomes) - len(latencies), wall
+
+
+async def _run_api_level(app: Any, concurrency: int, requests: int) -> tuple[list[float], int, float]:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+
+        async def one(index: int) -> float | None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/agent", json={"message": MESSAGES[index % len(MESSAGES)]})
+                if response.status_code != 200:
+                    print(f"  request {index} failed: HTTP {response.status_code} {response.text}", file=sys.stderr)
+                    return None
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(one(index) for index in range(requests)))
+        wall = time.perf_counter() - started
+    latencies = [outcome for outcome in outcomes if outcome is not None]
+    return latencies, len(outcomes) - len(latencies), wall
+
+
+def _compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Human-readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "llm_calls_per_request", "api_calls_per_request"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{key} {metric}: {previous[metric]} -> {current[metric]}")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{key} throughput_rps: {previous['throughput_rps']} -> {current['throughput_rps']}")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{key} errors: {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def _print_table(results: dict[str, dict]) -> None:
+    header = f"{'scenario':<14}{'req':>6}{'err':>5}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'llm/req':>9}{'api/req':>9}"
+    print(header)
+    print("-" * len(header))
+    for key, row in results.items():
+        print(
+            f"{key:<14}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps']:>9}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+            f"{row['llm_calls_per_request']:>9}{row['api_calls_per_request']:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("pipeline", "api", "all"), default="all")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels.")
+    parser.add_argument("--requests", type=int, default=60, help="Requests per concurrency level.")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per scripted model call.")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Seconds per fake Tasks round trip.")
+    parser.add_argument("--page-size", type=int, default=100, help="Largest page the fake Tasks API serves.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of Tasks operations that fail.")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected failures (e.g. 429).")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Tasks API requests per second (0 = no limit).")
+    parser.add_argument("--max-attempts", type=int, default=4, help="Attempts per retryable Tasks API call.")
+    parser.add_argument("--lists", type=int, default=3)
+    parser.add_argument("--tasks-per-list", type=int, default=60)
+    parser.add_argument("--no-mirror", action="store_true", help="Disable the local task mirror.")
+    parser.add_argument(
+        "--coalesce-window", type=float, default=None,
+        help="Share identical concurrent task reads, keeping results this many seconds (default: off).",
+    )
+    parser.add_argument("--response-cache", action="store_true", help="Keep the agent response cache on.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%).")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON here.")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so they must be in place before importing src.
+    os.environ["AGENT_RESPONSE_CACHE_ENABLED"] = "true" if args.response_cache else "false"
+    os.environ.setdefault("AGENT_WARMUP", "false")
+    os.environ.setdefault("GEMINI_CONTEXT_CACHE", "false")
+    os.environ["LANGFUSE_TRACING_ENABLED"] = "false"
+    # Placeholder keys keep the disabled Langfuse client from warning on every call.
+    os.environ.setdefault("LANGFUSE_PUBLIC_KEY", "pk-offline-benchmark")
+    os.environ.setdefault("LANGFUSE_SECRET_KEY", "sk-offline-benchmark")
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+
+    from google.oauth2.credentials import Credentials
+
+    from benchmarks.fake_model import ScriptedChatModel
+    from benchmarks.fake_tasks import FakeTasksBackend
+    from src.agent.main import get_agent, run_pipeline
+    from src.models.model import set_model
+    from src.services.GoogleTasks.googleTask import GoogleTask
+    from src.services.GoogleTasks.requestScheduler import RequestScheduler
+    from src.services.GoogleTasks.singleFlight import SingleFlight
+    from src.services.GoogleTasks.taskMirror import TaskMirror
+    from src.tools.tools import set_google_tasks_client
+
+    backend = FakeTasksBackend(
+        latency=args.api_latency,
+        page_size=args.page_size,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    backend.seed(lists=args.lists, tasks_per_list=args.tasks_per_list)
+    model = ScriptedChatModel(latency=args.llm_latency)
+    set_model(model)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    set_google_tasks_client(
+        GoogleTask(
+            mirror_factory=None if args.no_mirror else (lambda tasklist: TaskMirror(scope=tasklist)),
+            credentials=Credentials(token="offline-benchmark"),
+            http_factory=backend.http,
+            pool_size=max(levels),
+            interactive=False,
+            # Short backoff: the fake answers at once, and a real delay would dominate the report.
+            scheduler=RequestScheduler(rate=args.rate_limit, max_attempts=args.max_attempts, base_delay=0.05),
+            single_flight=None if args.coalesce_window is None else SingleFlight(window=args.coalesce_window),
+        )
+    )
+    get_agent()
+    # One untimed request syncs the mirrors and warms every lazy client.
+    run_pipeline(MESSAGES[0])
+
+    targets = ("pipeline", "api") if args.target == "all" else (args.target,)
+    results: dict[str, dict] = {}
+    for target in targets:
+        if target == "api":
+            from src.APP.main import app
+        for concurrency in levels:
+            backend.reset_stats()
+            model.reset_calls()
+            if target == "pipeline":
+                latencies, errors, wall = _run_pipeline_level(run_pipeline, concurrency, args.requests)
+            else:
+                latencies, errors, wall = asyncio.run(_run_api_level(app, concurrency, args.requests))
+            results[f"{target}@{concurrency}"] = _summary(
+                latencies, errors, wall, model.calls, backend.stats()["round_trips"], args.requests
+            )
+
+    print(
+        f"fake latency: llm {args.llm_latency * 1000:.0f} ms, tasks api {args.api_latency * 1000:.0f} ms; "
+        f"{args.lists} lists x {args.tasks_per_list} tasks; mirror {'off' if args.no_mirror else 'on'}\n"
+    )
+    _print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nbaseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"\nno baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    regressions = _compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    if regressions:
+        print(f"\nregressions beyond {args.tolerance:.0%} of {args.baseline.name}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nno regressions beyond {args.tolerance:.0%} of {args.baseline.name}")
+
+
+if __name__ == "__main__":
+    main()
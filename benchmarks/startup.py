@@ -0,0 +1,60 @@
+"""Cold-start benchmark: wall time and `python -X importtime` breakdown of an import.
+
+Usage: python benchmarks/startup.py [module] [--runs N] [--top N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run(module: str, importtime: bool) -> tuple[float, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", f"import {module}"]
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - started, completed.stderr
+
+
+def _slowest_imports(stderr: str, top: int) -> list[tuple[int, str]]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(cumulative), name.strip()))
+    # Direct imports of the benchmarked module; deeper ones are already in their parent's total.
+    children = [(micros, name) for depth, micros, name in rows if depth == 1]
+    return sorted(children, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("module", nargs="?", default="src.agent.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # The first run warms the OS page cache and the .pyc files.
+    _run(args.module, importtime=False)
+    timings = [_run(args.module, importtime=False)[0] for _ in range(args.runs)]
+    print(f"import {args.module}: median {statistics.median(timings) * 1000:.0f} ms "
+          f"(min {min(timings) * 1000:.0f} ms, {args.runs} runs)")
+
+    _, stderr = _run(args.module, importtime=True)
+    print("\nslowest direct imports (cumulative):")
+    for micros, name in _slowest_imports(stderr, args.top):
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight agent runs, queues the overflow and sheds load with 503."""
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._rejected = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "rejected": self._rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    def _reject(self, detail: str) -> HTTPException:
+        self._rejected += 1
+        return HTTPException(
+            status_code=503,
+            detail=detail,
+            headers={"Retry-After": str(max(1, int(self.queue_timeout)))},
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise self._reject("Servidor ocupado: fila de requisições cheia.")
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except TimeoutError:
+            raise self._reject("Servidor ocupado: tempo de espera na fila esgotado.") from None
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
@@ -1,21 +1,104 @@
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.agent.main import run_pipeline
+from src.agent.budget import make_budget
+from src.agent.config import BATCH_MAX_ITEMS, WARMUP, response_cache, shutdown_langfuse
+from src.agent.main import arun_pipeline, arun_pipeline_batch, astream_pipeline, warm_up
+from src.agent.router import router_stats
+from src.agent.state import Budget
+from src.APP.limiter import ConcurrencyLimiter
+from src.metrics import CONTENT_TYPE, render_metrics
+from src.services.GoogleTasks.googleTask import AuthorizationRequiredError
+from src.tools.tools import (
+    disable_interactive_auth,
+    google_tasks_client_cache_stats,
+    google_tasks_pool_stats,
+    google_tasks_prefetch_stats,
+    google_tasks_scheduler_stats,
+    google_tasks_single_flight_stats,
+)
+
+# Requests must never wait on a browser OAuth login; accounts are enrolled offline.
+disable_interactive_auth()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if WARMUP:
+        await asyncio.to_thread(warm_up)
+    yield
+    # Traces are exported in the background; send whatever is still queued.
+    await asyncio.to_thread(shutdown_langfuse)
+
 
 app = FastAPI(
     title="Jarvis Agent API",
     version="1.0.0",
     description="HTTP API para interagir com o agente de Google Tasks.",
+    lifespan=lifespan,
 )
 GRAPH_IMAGE_PATH = Path(__file__).resolve().parents[1] / "static" / "graph_xray.png"
+agent_limiter = ConcurrencyLimiter(
+    max_concurrency=int(os.getenv("AGENT_MAX_CONCURRENCY", "128")),
+    max_queue=int(os.getenv("AGENT_MAX_QUEUE", "256")),
+    queue_timeout=float(os.getenv("AGENT_QUEUE_TIMEOUT", "10")),
+)
+
+
+class AgentLimits(BaseModel):
+    """Optional per-request limits of the agent loop; omitted ones use the AGENT_* defaults."""
 
+    max_llm_calls: int | None = Field(default=None, ge=1, le=50, description="Máximo de chamadas ao modelo.")
+    max_tool_calls: int | None = Field(default=None, ge=1, le=200, description="Máximo de chamadas de ferramentas.")
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        le=600,
+        description="Tempo máximo em segundos; ao esgotar, o agente responde com o que já obteve.",
+    )
+    max_prompt_tokens: int | None = Field(default=None, ge=1, description="Máximo de tokens de entrada somados.")
 
-class AgentRequest(BaseModel):
+    def budget(self) -> Budget:
+        return make_budget(self.max_llm_calls, self.max_tool_calls, self.timeout, self.max_prompt_tokens)
+
+
+class AgentRequest(AgentLimits):
     message: str = Field(..., min_length=1, description="Mensagem para o agente")
+    session_id: str | None = Field(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Identificador da conversa; envie o mesmo valor para continuar um diálogo.",
+    )
+    user_id: str | None = Field(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Usuário cuja conta Google Tasks o agente usa; precisa ter sido cadastrado antes.",
+    )
+
+
+class AgentBatchRequest(AgentLimits):
+    messages: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_ITEMS,
+        description="Mensagens independentes; as respostas voltam na mesma ordem.",
+    )
+    user_id: str | None = Field(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Usuário cuja conta Google Tasks o agente usa; precisa ter sido cadastrado antes.",
+    )
 
 
 class AgentResponse(BaseModel):
@@ -30,6 +113,26 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/stats")
+def stats() -> dict[str, dict]:
+    return {
+        "limiter": agent_limiter.stats(),
+        "router": router_stats.snapshot(),
+        "response_cache": response_cache.stats(),
+        "google_tasks_pool": google_tasks_pool_stats(),
+        "google_tasks_clients": google_tasks_client_cache_stats(),
+        "google_tasks_scheduler": google_tasks_scheduler_stats(),
+        "google_tasks_prefetch": google_tasks_prefetch_stats(),
+        "google_tasks_single_flight": google_tasks_single_flight_stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint: node, tool and Google API latency, tokens, errors, in-flight."""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.get("/graph")
 def graph_image() -> FileResponse:
     if not GRAPH_IMAGE_PATH.exists():
@@ -38,9 +141,83 @@ def graph_image() -> FileResponse:
 
 
 @app.post("/agent", response_model=dict)
-def ask_agent(payload: AgentRequest) -> dict:
-    try:
-        final_state = run_pipeline(payload.message)
-        return final_state
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=f"Erro ao processar requisição: {error}") from error
+async def ask_agent(payload: AgentRequest) -> dict:
+    async with agent_limiter.slot():
+        try:
+            final_state = await arun_pipeline(
+                payload.message,
+                session_id=payload.session_id,
+                user_id=payload.user_id,
+                budget=payload.budget(),
+            )
+            return final_state
+        except AuthorizationRequiredError as error:
+            raise HTTPException(status_code=401, detail=f"Credenciais do Google Tasks indisponíveis: {error}") from error
+        except Exception as error:
+            raise HTTPException(status_code=500, detail=f"Erro ao processar requisição: {error}") from error
+
+
+@app.post("/agent/batch", response_model=dict)
+async def ask_agent_batch(payload: AgentBatchRequest) -> dict:
+    # One slot for the whole batch; AGENT_BATCH_MAX_CONCURRENCY bounds the items inside it.
+    async with agent_limiter.slot():
+        try:
+            results = await arun_pipeline_batch(payload.messages, user_id=payload.user_id, budget=payload.budget())
+            return {"results": results}
+        except AuthorizationRequiredError as error:
+            raise HTTPException(status_code=401, detail=f"Credenciais do Google Tasks indisponíveis: {error}") from error
+        except Exception as error:
+            raise HTTPException(status_code=500, detail=f"Erro ao processar requisição: {error}") from error
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class _SlotStreamingResponse(StreamingResponse):
+    """Streaming response that gives its limiter slot back however the response ends.
+
+    The generator releases the slot when the stream finishes; this covers a
+    client gone before the generator's first iteration, which never runs it.
+    """
+
+    def __init__(self, content: AsyncIterator[str], slot: AsyncExitStack, **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self._slot = slot
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # No-op when the generator already released it.
+            await self._slot.aclose()
+
+
+@app.post("/agent/stream")
+async def stream_agent(payload: AgentRequest) -> StreamingResponse:
+    # Take the slot before streaming starts so saturation still surfaces as a 503.
+    async with AsyncExitStack() as stack:
+        await stack.enter_async_context(agent_limiter.slot())
+        slot = stack.pop_all()
+
+    async def events() -> AsyncIterator[str]:
+        async with slot:
+            try:
+                async for event, data in astream_pipeline(
+                    payload.message,
+                    session_id=payload.session_id,
+                    user_id=payload.user_id,
+                    budget=payload.budget(),
+                ):
+                    yield _sse(event, data)
+            except AuthorizationRequiredError as error:
+                yield _sse("error", {"detail": f"Credenciais do Google Tasks indisponíveis: {error}", "status": 401})
+            except Exception as error:
+                yield _sse("error", {"detail": f"Erro ao processar requisição: {error}"})
+
+    return _SlotStreamingResponse(
+        events(),
+        slot,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
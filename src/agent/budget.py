@@ -0,0 +1,111 @@
+import json
+import time
+from typing import Any
+
+from langchain.messages import HumanMessage, ToolMessage
+
+from src.agent.config import (
+    BUDGET_MAX_LLM_CALLS,
+    BUDGET_MAX_PROMPT_TOKENS,
+    BUDGET_MAX_TOOL_CALLS,
+    BUDGET_TIMEOUT,
+)
+from src.agent.router import format_task
+from src.agent.state import Budget, MessagesState
+
+_EXHAUSTED = {
+    "llm_calls": "do limite de chamadas ao modelo",
+    "tool_calls": "do limite de chamadas de ferramentas",
+    "prompt_tokens": "do limite de tokens",
+    "deadline": "do tempo limite",
+}
+# Tasks listed per tool result in a fallback answer.
+_FALLBACK_MAX_TASKS = 10
+
+
+def make_budget(
+    max_llm_calls: int | None = None,
+    max_tool_calls: int | None = None,
+    timeout: float | None = None,
+    max_prompt_tokens: int | None = None,
+) -> Budget:
+    """Budget for a turn starting now; unset limits take the AGENT_* defaults (0 = no limit)."""
+    limits = {
+        "max_llm_calls": BUDGET_MAX_LLM_CALLS if max_llm_calls is None else max_llm_calls,
+        "max_tool_calls": BUDGET_MAX_TOOL_CALLS if max_tool_calls is None else max_tool_calls,
+        "max_prompt_tokens": BUDGET_MAX_PROMPT_TOKENS if max_prompt_tokens is None else max_prompt_tokens,
+    }
+    budget: Budget = {key: value for key, value in limits.items() if value}
+    timeout = BUDGET_TIMEOUT if timeout is None else timeout
+    if timeout:
+        budget["deadline"] = time.time() + timeout
+    return budget
+
+
+def time_left(state: MessagesState) -> float | None:
+    """Seconds until the turn's deadline, or None without one."""
+    deadline = state.get("budget", {}).get("deadline")
+    return None if deadline is None else deadline - time.time()
+
+
+def exhausted(state: MessagesState, pending_tool_calls: int | None = None) -> str | None:
+    """Name of the first limit the turn has reached, or None.
+
+    With ``pending_tool_calls`` it answers whether those tools may still run
+    (tool calls and deadline); without, whether another model call may.
+    """
+    budget = state.get("budget", {})
+    left = time_left(state)
+    if left is not None and left <= 0:
+        return "deadline"
+    if pending_tool_calls is not None:
+        limit = budget.get("max_tool_calls")
+        if limit is not None and state.get("tool_calls", 0) + pending_tool_calls > limit:
+            return "tool_calls"
+        return None
+    limit = budget.get("max_llm_calls")
+    if limit is not None and state.get("llm_calls", 0) >= limit:
+        return "llm_calls"
+    limit = budget.get("max_prompt_tokens")
+    if limit is not None and state.get("prompt_tokens", 0) >= limit:
+        return "prompt_tokens"
+    return None
+
+
+def _summarize(name: str, result: Any) -> list[str]:
+    if not isinstance(result, dict):
+        return [f"- {name}: {result}"]
+    if result.get("ok") is False:
+        return [f"- {name}: falhou ({result.get('error', 'erro desconhecido')})"]
+    tasks = result.get("tasks")
+    if tasks is None and result.get("tasklists"):
+        tasks = [task for task_list in result["tasklists"] for task in task_list.get("tasks", [])]
+    if tasks is not None:
+        lines = [f"- {name}: {len(tasks)} tarefa(s)"]
+        lines.extend(f"  {format_task(task)}" for task in tasks[:_FALLBACK_MAX_TASKS])
+        if len(tasks) > _FALLBACK_MAX_TASKS:
+            lines.append(f"  ... e mais {len(tasks) - _FALLBACK_MAX_TASKS}")
+        return lines
+    detail = result.get("message") or "ok"
+    if isinstance(result.get("task"), dict):
+        detail = f"{detail} {format_task(result['task'])[2:]}"
+    return [f"- {name}: {detail}"]
+
+
+def fallback_answer(state: MessagesState, reason: str | None) -> str:
+    """Answer built without the model from the tool results of the current turn."""
+    messages = state.get("messages", [])
+    turn_start = max((index for index, message in enumerate(messages) if isinstance(message, HumanMessage)), default=-1)
+    lines = [f"Não consegui concluir o pedido dentro {_EXHAUSTED.get(reason, 'dos limites da requisição')}."]
+    results = [message for message in messages[turn_start + 1:] if isinstance(message, ToolMessage)]
+    if not results:
+        lines.append("Nenhuma ferramenta chegou a ser executada; tente novamente ou simplifique o pedido.")
+        return "\n".join(lines)
+    lines.append("Isto é o que já foi feito/obtido:")
+    for message in results:
+        try:
+            result = json.loads(message.content)
+        except (TypeError, json.JSONDecodeError):
+            result = message.content
+        lines.extend(_summarize(message.name or "ferramenta", result))
+    return "\n".join(lines)
@@ -1,22 +1,96 @@
 import os
+import threading
 
 from dotenv import load_dotenv
 from langchain.messages import SystemMessage
 from langfuse import Langfuse
 
-from src.models.model import GeminiModel
+from src.agent.response_cache import ResponseCache
+from src.agent.telemetry import PayloadMask, digest
+from src.models.context_cache import GeminiContextCache
+from src.models.model import get_model
 from src.tools.tools import GOOGLE_TASKS_TOOLS
 
 load_dotenv()
 
-langfuse = Langfuse(
-    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-    host=os.getenv("LANGFUSE_BASE_URL"),
-)
+_langfuse: Langfuse | None = None
+_langfuse_lock = threading.Lock()
+
+
+def get_langfuse() -> Langfuse:
+    """Langfuse client, created on first use so imports stay cheap.
+
+    Spans are queued and exported in batches by a background thread, so
+    requests never wait on Langfuse. It must be created before the first
+    ``@observe`` span: the decorators reuse the settings of the first client.
+    """
+    global _langfuse
+    if _langfuse is None:
+        with _langfuse_lock:
+            if _langfuse is None:
+                _langfuse = Langfuse(
+                    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+                    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+                    host=os.getenv("LANGFUSE_BASE_URL"),
+                    sample_rate=float(os.getenv("LANGFUSE_SAMPLE_RATE", "1.0")),
+                    flush_at=int(os.getenv("LANGFUSE_FLUSH_AT", "128")),
+                    flush_interval=float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "5")),
+                    mask=PayloadMask(max_chars=int(os.getenv("LANGFUSE_MAX_FIELD_CHARS", "2000"))),
+                )
+    return _langfuse
+
+
+def shutdown_langfuse() -> None:
+    """Export the spans still queued; called once when the process stops."""
+    if _langfuse is not None:
+        _langfuse.shutdown()
+
+
+# Tool calls from one AIMessage run concurrently on this many workers.
+TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "4"))
+# "serialize" runs writes touching the same task_id in call order; "parallel" does not.
+TOOL_WRITE_POLICY = os.getenv("TOOL_WRITE_POLICY", "serialize")
+
+# Approximate token budget for the history sent to Gemini on each call.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("AGENT_CONTEXT_TOKEN_BUDGET", "32000"))
+# Newest tool results always sent verbatim; older ones may be compacted.
+CONTEXT_KEEP_TOOL_RESULTS = int(os.getenv("AGENT_CONTEXT_KEEP_TOOL_RESULTS", "4"))
+
+# Default per-turn limits of the llm_call <-> tool_node loop; 0 disables a limit.
+BUDGET_MAX_LLM_CALLS = int(os.getenv("AGENT_MAX_LLM_CALLS", "8"))
+BUDGET_MAX_TOOL_CALLS = int(os.getenv("AGENT_MAX_TOOL_CALLS", "24"))
+BUDGET_TIMEOUT = float(os.getenv("AGENT_TIMEOUT", "60"))
+BUDGET_MAX_PROMPT_TOKENS = int(os.getenv("AGENT_MAX_PROMPT_TOKENS", "200000"))
 
-model = GeminiModel
-model_with_tools = model.bind_tools(GOOGLE_TASKS_TOOLS)
+# Build the Tasks client, model and graph during API startup instead of on the first request.
+WARMUP = os.getenv("AGENT_WARMUP", "false").lower() == "true"
+
+# Deterministic fast path that answers plain listing requests without Gemini.
+ROUTER_ENABLED = os.getenv("AGENT_ROUTER_ENABLED", "true").lower() != "false"
+
+# Start the task snapshot with the request and inject it only when the message may need it.
+SPECULATIVE_BOOTSTRAP = os.getenv("AGENT_SPECULATIVE_BOOTSTRAP", "true").lower() != "false"
+
+# Multi-turn sessions: checkpointer backend ("memory" or "sqlite") and its limits.
+SESSION_CHECKPOINTER = os.getenv("AGENT_SESSION_CHECKPOINTER", "memory")
+SESSION_DB = os.getenv("AGENT_SESSION_DB", "sessions.sqlite")
+SESSION_MAX = int(os.getenv("AGENT_SESSION_MAX", "1000"))
+SESSION_TTL = float(os.getenv("AGENT_SESSION_TTL", "1800"))
+# Follow-up turns reuse the session's task snapshot while it is younger than this.
+SESSION_SNAPSHOT_TTL = float(os.getenv("AGENT_SESSION_SNAPSHOT_TTL", "60"))
+
+# Batch runs (/agent/batch): items answered at once, the write coalescing window and the item cap.
+BATCH_MAX_CONCURRENCY = int(os.getenv("AGENT_BATCH_MAX_CONCURRENCY", "8"))
+BATCH_WRITE_WINDOW = float(os.getenv("AGENT_BATCH_WRITE_WINDOW", "0.05"))
+BATCH_MAX_ITEMS = int(os.getenv("AGENT_BATCH_MAX_ITEMS", "100"))
+
+# Answers to sessionless read-only questions, keyed on input + task-list version.
+RESPONSE_CACHE_ENABLED = os.getenv("AGENT_RESPONSE_CACHE_ENABLED", "true").lower() != "false"
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("AGENT_RESPONSE_CACHE_MAX_ENTRIES", "512")),
+    max_bytes=int(os.getenv("AGENT_RESPONSE_CACHE_MAX_BYTES", str(4 * 1024 * 1024))),
+    ttl=float(os.getenv("AGENT_RESPONSE_CACHE_TTL", "300")),
+)
 
 SYS_PROMPT = SystemMessage(
     content=[
@@ -25,5 +99,24 @@ SYS_PROMPT = SystemMessage(
         "A snapshot from google_tasks_list may be preloaded in the conversation context before your first response.",
         "Prefer the preloaded snapshot before calling google_tasks_list again.",
         "To obtain the task ID, you can first use a tool to list all tasks and then retrieve the task ID to execute what was requested.",
+        "To find a specific task by name, words in its notes, status or due date, use google_tasks_search instead of listing every task.",
+        "When the same action applies to several tasks, use the google_tasks_bulk_* tools in a single call instead of one call per task.",
+        "Tasks may live in several task lists; the snapshot groups them by list. Pass the list's tasklist id to write tools for tasks outside the default list.",
+        "If google_tasks_update reports a conflict, the task was changed by someone else: show the user its current values and ask before retrying.",
     ]
 )
+
+# Traces reference the system prompt by digest instead of repeating it in every generation.
+SYS_PROMPT_DIGEST = digest(SYS_PROMPT.content)
+
+# Opt-in explicit Gemini context caching of SYS_PROMPT and the tool declarations.
+context_cache = (
+    GeminiContextCache(
+        get_model,
+        system_instruction="\n".join(str(line) for line in SYS_PROMPT.content),
+        tools=GOOGLE_TASKS_TOOLS,
+        ttl_seconds=int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600")),
+    )
+    if os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() == "true"
+    else None
+)
@@ -0,0 +1,120 @@
+import json
+from typing import Any
+
+from langchain.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage, ToolMessage
+
+SNAPSHOT_PREFIX = "Initial context from google_tasks_list"
+# Compacted messages are cut to this many characters as a last resort.
+MAX_COMPACTED_CHARS = 400
+
+
+def estimate_tokens(message: AnyMessage) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    tool_calls = getattr(message, "tool_calls", None) or []
+    return (len(content) + len(json.dumps(tool_calls, default=str))) // 4 + 4
+
+
+def _dedupe(messages: list[AnyMessage]) -> list[AnyMessage]:
+    """Drop repeated system messages, superseded snapshots and echoed answers."""
+    latest_snapshot = max(
+        (
+            index
+            for index, message in enumerate(messages)
+            if isinstance(message, SystemMessage) and str(message.content).startswith(SNAPSHOT_PREFIX)
+        ),
+        default=None,
+    )
+    seen_system: set[str] = set()
+    kept: list[AnyMessage] = []
+    for index in range(len(messages) - 1, -1, -1):
+        message = messages[index]
+        if isinstance(message, SystemMessage):
+            content = str(message.content)
+            if content in seen_system:
+                continue
+            if content.startswith(SNAPSHOT_PREFIX) and index != latest_snapshot:
+                continue
+            seen_system.add(content)
+        elif isinstance(message, AIMessage) and not message.tool_calls and kept:
+            # finalize_node re-emits the last answer; keep a single copy.
+            following = kept[-1]
+            if isinstance(following, AIMessage) and not following.tool_calls and following.content == message.content:
+                continue
+        kept.append(message)
+    kept.reverse()
+    return kept
+
+
+def _compact_payload(payload: Any) -> Any:
+    if not isinstance(payload, dict):
+        return payload
+    compacted: dict[str, Any] = {key: payload[key] for key in ("ok", "error", "count") if key in payload}
+    if isinstance(payload.get("tasks"), list):
+        compacted["tasks"] = [{"id": task.get("id"), "title": task.get("title")} for task in payload["tasks"]]
+    if isinstance(payload.get("tasklists"), list):
+        compacted["tasklists"] = [
+            {
+                "id": task_list.get("id"),
+                "title": task_list.get("title"),
+                "tasks": [{"id": task.get("id"), "title": task.get("title")} for task in task_list.get("tasks") or []],
+            }
+            for task_list in payload["tasklists"]
+        ]
+    if isinstance(payload.get("task"), dict):
+        task = payload["task"]
+        compacted["task"] = {"id": task.get("id"), "title": task.get("title"), "status": task.get("status")}
+    if isinstance(payload.get("results"), list):
+        compacted["results"] = [{"ok": result.get("ok")} for result in payload["results"]]
+    compacted["compacted"] = True
+    return compacted
+
+
+def _compact(message: ToolMessage) -> ToolMessage:
+    try:
+        content = json.dumps(_compact_payload(json.loads(message.content)), ensure_ascii=False)
+    except (TypeError, json.JSONDecodeError):
+        content = str(message.content)
+    if len(content) > MAX_COMPACTED_CHARS:
+        content = content[:MAX_COMPACTED_CHARS] + "…"
+    return message.model_copy(update={"content": content})
+
+
+def fit_to_budget(messages: list[AnyMessage], max_tokens: int, keep_tool_results: int) -> list[AnyMessage]:
+    """Shrink the prompt history to roughly ``max_tokens``.
+
+    The state itself is left untouched; only the list sent to the model is
+    rewritten. Steps, applied until the budget fits: dedupe system messages,
+    compact tool results older than the newest ``keep_tool_results`` (oldest
+    first), then drop whole messages preceding the latest human message.
+    """
+    fitted = _dedupe(messages)
+    total = sum(estimate_tokens(message) for message in fitted)
+    if total <= max_tokens:
+        return fitted
+
+    tool_indexes = [index for index, message in enumerate(fitted) if isinstance(message, ToolMessage)]
+    compactable = tool_indexes[: max(0, len(tool_indexes) - keep_tool_results)]
+    for index in compactable:
+        if total <= max_tokens:
+            break
+        compacted = _compact(fitted[index])
+        total += estimate_tokens(compacted) - estimate_tokens(fitted[index])
+        fitted[index] = compacted
+    if total <= max_tokens:
+        return fitted
+
+    last_human = max(
+        (index for index, message in enumerate(fitted) if isinstance(message, HumanMessage)),
+        default=0,
+    )
+    start = 0
+    while total > max_tokens and start < last_human:
+        total -= estimate_tokens(fitted[start])
+        start += 1
+    # Tool results must follow the AIMessage that requested them.
+    while start < len(fitted) and isinstance(fitted[start], ToolMessage):
+        start += 1
+    # System context (e.g. the latest snapshot) survives even when its turn is dropped.
+    head = [message for message in fitted[:start] if isinstance(message, SystemMessage)]
+    return head + fitted[start:]
@@ -0,0 +1,61 @@
+import json
+from typing import Any
+
+# Short status codes used in the snapshot table; the legend maps them back.
+_STATUS_CODES = {"needsAction": "open", "completed": "done"}
+_SNAPSHOT_COLUMNS = ("id", "title", "status", "due", "notes")
+
+
+def _drop_empty(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _drop_empty(item) for key, item in value.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_drop_empty(item) for item in value]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """JSON without null/empty fields or whitespace, for tool results sent to the model."""
+    return json.dumps(_drop_empty(value), ensure_ascii=False, separators=(",", ":"))
+
+
+def _cell(task: dict[str, Any], column: str) -> str:
+    value = task.get(column) or ""
+    if column == "status":
+        value = _STATUS_CODES.get(value, value)
+    elif column == "due":
+        value = value[:10]
+    return str(value).replace("|", "/").replace("\n", " ")
+
+
+_LEGEND = "status: open=needsAction, done=completed; due: YYYY-MM-DD"
+
+
+def _table_rows(tasks: list[dict[str, Any]]) -> list[str]:
+    columns = [column for column in _SNAPSHOT_COLUMNS if any(task.get(column) for task in tasks)]
+    if not columns:
+        return []
+    return ["|".join(columns)] + ["|".join(_cell(task, column) for column in columns) for task in tasks]
+
+
+def encode_tasks_table(tasks: list[dict[str, Any]]) -> str:
+    """Encode tasks as a pipe-separated table, omitting columns empty in every row."""
+    return "\n".join([f"count={len(tasks)}; {_LEGEND}"] + _table_rows(tasks))
+
+
+def encode_tasklists(task_lists: list[dict[str, Any]]) -> str:
+    """One table per task list, each under a header carrying the list id for write tools."""
+    lines = [f"lists={len(task_lists)}; {_LEGEND}"]
+    for task_list in task_lists:
+        lines.append(f"## {task_list.get('title') or '(untitled)'} (tasklist={task_list['id']}, count={len(task_list['tasks'])})")
+        lines.extend(_table_rows(task_list["tasks"]))
+    return "\n".join(lines)
+
+
+def encode_snapshot(list_result: dict[str, Any]) -> str:
+    """Compact rendering of a google_tasks_list result for the prompt."""
+    if list_result.get("ok") and isinstance(list_result.get("tasklists"), list):
+        return encode_tasklists(list_result["tasklists"])
+    if not list_result.get("ok") or not isinstance(list_result.get("tasks"), list):
+        return compact_json(list_result)
+    return encode_tasks_table(list_result["tasks"])
@@ -1,37 +1,140 @@
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from pathlib import Path
+import asyncio
 import json
-from typing import cast
+import threading
+from datetime import date
+from typing import Any, cast
 
-from langchain.messages import AIMessage, HumanMessage
+from langchain.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
 from langfuse import propagate_attributes
 from langgraph.graph import END, START, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
-from src.agent.config import langfuse
-from src.agent.nodes import bootstrap_tasks_node, finalize_node, llm_call, should_continue, tool_node
-from src.agent.session import generate_session_id
-from src.agent.state import MessagesState
+from src.agent.config import (
+    BATCH_MAX_CONCURRENCY,
+    BATCH_WRITE_WINDOW,
+    RESPONSE_CACHE_ENABLED,
+    SESSION_CHECKPOINTER,
+    SESSION_DB,
+    SESSION_MAX,
+    SESSION_TTL,
+    SPECULATIVE_BOOTSTRAP,
+    get_langfuse,
+    response_cache,
+)
+from src.agent.nodes import (
+    abootstrap_tasks_node,
+    allm_call,
+    apreload_snapshot,
+    arouter_node,
+    atool_node,
+    bootstrap_tasks_node,
+    finalize_node,
+    llm_call,
+    prefetch_snapshot,
+    preload_snapshot,
+    route_after_router,
+    route_after_tools,
+    router_node,
+    should_continue,
+    tool_node,
+)
+from src.agent.budget import make_budget
+from src.agent.router import normalize
+from src.agent.session import build_checkpointer, generate_session_id
+from src.agent.state import Budget, MessagesState
+from src.metrics import instrument_node, track_pipeline
+from src.models.model import get_model_with_tools
+from src.services.GoogleTasks.googleTask import AuthorizationRequiredError
+from src.services.GoogleTasks.requestScheduler import current_deadline, within_deadline
+from src.tools.tools import (
+    GOOGLE_TASKS_WRITE_TOOLS,
+    ListPrefetch,
+    acting_as,
+    coalescing_writes,
+    current_list_prefetch,
+    current_user_id,
+    get_google_tasks_client,
+    google_tasks_version,
+    using_list_prefetch,
+)
 
 
 agent_builder = StateGraph(MessagesState)
-agent_builder.add_node("bootstrap_tasks_node", bootstrap_tasks_node)
-agent_builder.add_node("llm_call", llm_call) 
-agent_builder.add_node("tool_node", tool_node)
-agent_builder.add_node("finalize_node", finalize_node)
 
-agent_builder.add_edge(START, "bootstrap_tasks_node")
+
+def _node(name: str, func: Any, afunc: Any = None) -> RunnableLambda:
+    """Graph node timed per call; nodes that do I/O carry both sync and async variants."""
+    return RunnableLambda(
+        instrument_node(name, func),
+        afunc=instrument_node(name, afunc) if afunc is not None else None,
+        name=name,
+    )
+
+
+# invoke() runs the sync variant of each node, ainvoke() the async one.
+agent_builder.add_node("bootstrap_tasks_node", _node("bootstrap_tasks_node", bootstrap_tasks_node, abootstrap_tasks_node))
+agent_builder.add_node("router_node", _node("router_node", router_node, arouter_node))
+agent_builder.add_node("llm_call", _node("llm_call", llm_call, allm_call))
+agent_builder.add_node("tool_node", _node("tool_node", tool_node, atool_node))
+agent_builder.add_node("finalize_node", _node("finalize_node", finalize_node))
+
+# The router runs first: a routed listing makes its single list call and skips the snapshot preload.
+agent_builder.add_edge(START, "router_node")
+agent_builder.add_conditional_edges("router_node", route_after_router, ["bootstrap_tasks_node", "finalize_node"])
 agent_builder.add_edge("bootstrap_tasks_node", "llm_call")
 agent_builder.add_conditional_edges("llm_call", should_continue, ["tool_node", "finalize_node"])
-agent_builder.add_edge("tool_node", "llm_call")
+agent_builder.add_conditional_edges("tool_node", route_after_tools, ["llm_call", "finalize_node"])
 agent_builder.add_edge("finalize_node", END)
 
-agent = agent_builder.compile()
+_agent: CompiledStateGraph | None = None
+_session_agent: CompiledStateGraph | None = None
+_compile_lock = threading.Lock()
+
+
+def get_agent() -> CompiledStateGraph:
+    """Graph compiled without a checkpointer, on first use."""
+    global _agent
+    if _agent is None:
+        with _compile_lock:
+            if _agent is None:
+                _agent = agent_builder.compile()
+    return _agent
+
+
+def _get_session_agent() -> CompiledStateGraph:
+    """Graph compiled with a checkpointer, used when a request carries a session_id."""
+    global _session_agent
+    if _session_agent is None:
+        with _compile_lock:
+            if _session_agent is None:
+                _session_agent = agent_builder.compile(
+                    checkpointer=build_checkpointer(SESSION_CHECKPOINTER, SESSION_DB, SESSION_MAX, SESSION_TTL)
+                )
+    return _session_agent
+
+
+def warm_up() -> None:
+    """Build everything the first request would otherwise pay for."""
+    get_langfuse()
+    get_model_with_tools()
+    get_agent()
+    try:
+        get_google_tasks_client()
+    except AuthorizationRequiredError as error:
+        # Multi-user deployments may have no default account; requests name their user.
+        print(f"Skipping Google Tasks warm-up: {error}")
 
 
 def save_graph_image(output_path: str | Path = Path("src/static/graph_xray.png")) -> Path:
     target_path = Path(output_path)
     target_path.parent.mkdir(parents=True, exist_ok=True)
 
-    graph_png = agent.get_graph().draw_mermaid_png()
+    graph_png = get_agent().get_graph().draw_mermaid_png()
     target_path.write_bytes(graph_png)
     return target_path
 
@@ -63,22 +166,282 @@ def _extract_text_from_state(state: MessagesState) -> str:
         return str(content)
     return ""
 
-def run_pipeline(user_input: str) -> dict:
-    resolved_session_id = generate_session_id()
-    with propagate_attributes(session_id=resolved_session_id):
-        final_state = cast(
-            MessagesState,
-            agent.invoke(
-            {
-                "messages": [HumanMessage(content=user_input)],
-                "llm_calls": 0,
-                "used_tools": [],
-            }
-            ),
+def _initial_state(user_input: str, budget: Budget) -> MessagesState:
+    # llm_calls has no reducer, so a session's counter restarts on every turn.
+    return {
+        "messages": [HumanMessage(content=user_input)],
+        "llm_calls": 0,
+        "used_tools": [],
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_tokens": 0,
+        "tool_calls": 0,
+        "budget": budget,
+    }
+
+
+def _graph_for(session_id: str | None, user_id: str | None = None) -> tuple[CompiledStateGraph, dict, str]:
+    # Configures tracing (sampling, batching, masking) before the first node opens a span.
+    get_langfuse()
+    if session_id is None:
+        return get_agent(), {}, generate_session_id()
+    # Sessions are namespaced by user so one account can never resume another's thread.
+    thread_id = session_id if user_id is None else f"{user_id}:{session_id}"
+    return _get_session_agent(), {"configurable": {"thread_id": thread_id}}, session_id
+
+
+def _pipeline_result(final_state: MessagesState, session_id: str | None = None, tools_offset: int = 0) -> dict:
+    result = {
+        "text": _extract_text_from_state(final_state),
+        "llm_calls": final_state.get("llm_calls", 0),
+        # used_tools accumulates across a session; report only this turn's tools.
+        "used_tools": final_state.get("used_tools", [])[tools_offset:],
+        "token_usage": {
+            "prompt": final_state.get("prompt_tokens", 0),
+            "completion": final_state.get("completion_tokens", 0),
+            "cached": final_state.get("cached_tokens", 0),
+        },
+    }
+    if final_state.get("budget_exhausted"):
+        result["budget_exhausted"] = final_state["budget_exhausted"]
+    if session_id is not None:
+        result["session_id"] = session_id
+    return result
+
+
+def _cache_key(user_input: str, version: int | None, user_id: str | None = None) -> str | None:
+    """Key for a cached answer, or None when the answer must not be cached.
+
+    "Hoje" changes meaning at midnight, so the date is part of the key.
+    """
+    tokens = normalize(user_input)
+    if version is None or not tokens:
+        return None
+    return f"{user_id or ''}:{version}:{date.today().isoformat()}:{' '.join(tokens)}"
+
+
+def _prefetch() -> ListPrefetch | None:
+    # Started once the cache missed, so the snapshot fetch overlaps with the graph instead of preceding it.
+    return prefetch_snapshot() if SPECULATIVE_BOOTSTRAP else None
+
+
+def _cache_result(key: str | None, result: dict) -> None:
+    if key is None or result.get("budget_exhausted"):
+        # A fallback answer reflects this turn's limits, not the question.
+        return
+    if not any(name in GOOGLE_TASKS_WRITE_TOOLS for name in result["used_tools"]):
+        response_cache.put(key, result)
+
+
+def run_pipeline(
+    user_input: str,
+    session_id: str | None = None,
+    user_id: str | None = None,
+    budget: Budget | None = None,
+) -> dict:
+    """Answer one message, acting for ``user_id``'s Google account when given.
+
+    ``budget`` (see ``make_budget``) bounds the model calls, tool calls,
+    prompt tokens and time of this turn; the AGENT_* defaults apply without
+    it. A turn that runs out answers from the data gathered so far.
+    """
+    budget = make_budget() if budget is None else budget
+    with acting_as(user_id), within_deadline(budget.get("deadline")), track_pipeline("run"):
+        if user_id is not None:
+            # Fail fast (AuthorizationRequiredError) before spending a model call.
+            get_google_tasks_client()
+        return _run_pipeline(user_input, session_id, user_id, budget)
+
+
+def _run_pipeline(user_input: str, session_id: str | None, user_id: str | None, budget: Budget) -> dict:
+    # Session turns depend on the conversation history, so only sessionless calls are cached.
+    cacheable = RESPONSE_CACHE_ENABLED and session_id is None
+    # The version only comes from fresh mirrors: with stale ones the lookup is skipped
+    # rather than syncing every list ahead of the graph and its prefetch.
+    cache_key = _cache_key(user_input, google_tasks_version(), user_id) if cacheable else None
+    if cache_key is not None and (cached := response_cache.get(cache_key)) is not None:
+        return {**cached, "cached": True}
+
+    graph, config, trace_session_id = _graph_for(session_id, user_id)
+    with using_list_prefetch(_prefetch()), propagate_attributes(session_id=trace_session_id, user_id=user_id):
+        tools_offset = len(graph.get_state(config).values.get("used_tools", [])) if config else 0
+        final_state = cast(MessagesState, graph.invoke(_initial_state(user_input, budget), config))
+        result = _pipeline_result(final_state, session_id, tools_offset)
+    if cacheable and cache_key is None:
+        # The run synced the mirrors it read, so the answer is keyed on their version now.
+        cache_key = _cache_key(user_input, google_tasks_version(), user_id)
+    _cache_result(cache_key, result)
+    return result
+
+
+async def arun_pipeline(
+    user_input: str,
+    session_id: str | None = None,
+    user_id: str | None = None,
+    budget: Budget | None = None,
+) -> dict:
+    """Async variant of run_pipeline: never blocks the event loop."""
+    budget = make_budget() if budget is None else budget
+    with acting_as(user_id), within_deadline(budget.get("deadline")), track_pipeline("arun"):
+        if user_id is not None:
+            await asyncio.to_thread(get_google_tasks_client)
+        return await _arun_pipeline(user_input, session_id, user_id, budget)
+
+
+async def _arun_pipeline(user_input: str, session_id: str | None, user_id: str | None, budget: Budget) -> dict:
+    cacheable = RESPONSE_CACHE_ENABLED and session_id is None
+    cache_key = _cache_key(user_input, await asyncio.to_thread(google_tasks_version), user_id) if cacheable else None
+    if cache_key is not None and (cached := response_cache.get(cache_key)) is not None:
+        return {**cached, "cached": True}
+
+    graph, config, trace_session_id = _graph_for(session_id, user_id)
+    with using_list_prefetch(_prefetch()), propagate_attributes(session_id=trace_session_id, user_id=user_id):
+        tools_offset = len((await graph.aget_state(config)).values.get("used_tools", [])) if config else 0
+        final_state = cast(MessagesState, await graph.ainvoke(_initial_state(user_input, budget), config))
+        result = _pipeline_result(final_state, session_id, tools_offset)
+    if cacheable and cache_key is None:
+        cache_key = _cache_key(user_input, await asyncio.to_thread(google_tasks_version), user_id)
+    _cache_result(cache_key, result)
+    return result
+
+
+def _batch_state(user_input: str, budget: Budget, preload: SystemMessage, snapshot_at: float) -> MessagesState:
+    # The shared snapshot is already in place, so the item's bootstrap node skips the preload.
+    state = _initial_state(user_input, budget)
+    state["messages"].append(preload)
+    state["used_tools"] = ["google_tasks_list"]
+    state["snapshot_at"] = snapshot_at
+    return state
+
+
+def run_pipeline_batch(messages: list[str], user_id: str | None = None, budget: Budget | None = None) -> list[dict]:
+    """Answer independent messages together, returning one result per message, in order.
+
+    The task snapshot is fetched once and shared by every item, up to
+    BATCH_MAX_CONCURRENCY items run at once and their Google writes are sent
+    as batched API calls. A failing item gets ``{"error": ...}`` instead of
+    failing the whole batch. Items have no session and skip the response cache.
+    Each item gets the limits of ``budget``; its deadline covers the whole batch.
+    """
+    budget = make_budget() if budget is None else budget
+    with acting_as(user_id), within_deadline(budget.get("deadline")), track_pipeline("batch"):
+        get_google_tasks_client()
+        graph, _, _ = _graph_for(None, user_id)
+        preload, snapshot_at = preload_snapshot()
+
+        def run_one(user_input: str) -> dict:
+            try:
+                with propagate_attributes(session_id=generate_session_id(), user_id=user_id):
+                    final_state = graph.invoke(_batch_state(user_input, budget, preload, snapshot_at))
+                return _pipeline_result(cast(MessagesState, final_state))
+            except Exception as error:
+                return {"error": str(error)}
+
+        with coalescing_writes(BATCH_WRITE_WINDOW), ThreadPoolExecutor(max_workers=BATCH_MAX_CONCURRENCY) as executor:
+            # Contexts are copied here so every worker sees the user and the coalescer.
+            contexts = [copy_context() for _ in messages]
+            futures = [
+                executor.submit(context.run, run_one, user_input)
+                for context, user_input in zip(contexts, messages)
+            ]
+            return [future.result() for future in futures]
+
+
+async def arun_pipeline_batch(
+    messages: list[str],
+    user_id: str | None = None,
+    budget: Budget | None = None,
+) -> list[dict]:
+    """Async variant of run_pipeline_batch."""
+    budget = make_budget() if budget is None else budget
+    with acting_as(user_id), within_deadline(budget.get("deadline")), track_pipeline("batch"):
+        await asyncio.to_thread(get_google_tasks_client)
+        graph, _, _ = _graph_for(None, user_id)
+        preload, snapshot_at = await apreload_snapshot()
+        semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+        async def run_one(user_input: str) -> dict:
+            async with semaphore:
+                try:
+                    with propagate_attributes(session_id=generate_session_id(), user_id=user_id):
+                        final_state = await graph.ainvoke(_batch_state(user_input, budget, preload, snapshot_at))
+                    return _pipeline_result(cast(MessagesState, final_state))
+                except Exception as error:
+                    return {"error": str(error)}
+
+        with coalescing_writes(BATCH_WRITE_WINDOW):
+            return list(await asyncio.gather(*(run_one(user_input) for user_input in messages)))
+
+
+def _chunk_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part["text"] if isinstance(part, dict) and isinstance(part.get("text"), str) else ""
+            for part in content
         )
-        langfuse.flush()
-        return {
-            "text": _extract_text_from_state(final_state),
-            "llm_calls": final_state.get("llm_calls", 0),
-            "used_tools": final_state.get("used_tools", []),
-        }
+    return ""
+
+
+async def astream_pipeline(
+    user_input: str,
+    session_id: str | None = None,
+    user_id: str | None = None,
+    budget: Budget | None = None,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Run the agent and yield (event, data) pairs as the graph progresses.
+
+    Events: ``node`` when a node finishes, ``tool_result`` for each tool
+    output, ``token`` for Gemini output text and a closing ``final`` with the
+    same shape ``run_pipeline`` returns.
+    """
+    budget = make_budget() if budget is None else budget
+    # Not acting_as()/within_deadline(): a generator closed after a client disconnect
+    # may run its cleanup in another context, where resetting a ContextVar would fail.
+    current_user_id.set(user_id)
+    current_deadline.set(budget.get("deadline"))
+    with track_pipeline("stream"):
+        if user_id is not None:
+            await asyncio.to_thread(get_google_tasks_client)
+        async for event in _astream_pipeline(user_input, session_id, user_id, budget):
+            yield event
+
+
+async def _astream_pipeline(
+    user_input: str,
+    session_id: str | None,
+    user_id: str | None,
+    budget: Budget,
+) -> AsyncIterator[tuple[str, dict]]:
+    graph, config, trace_session_id = _graph_for(session_id, user_id)
+    current_list_prefetch.set(_prefetch())
+    with propagate_attributes(session_id=trace_session_id, user_id=user_id):
+        tools_offset = len((await graph.aget_state(config)).values.get("used_tools", [])) if config else 0
+        final_state = cast(MessagesState, _initial_state(user_input, budget))
+        emitted_tool_calls: set[str] = set()
+        async for mode, chunk in graph.astream(
+            _initial_state(user_input, budget),
+            config,
+            stream_mode=["updates", "messages", "values"],
+        ):
+            if mode == "values":
+                final_state = cast(MessagesState, chunk)
+            elif mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") == "llm_call" and isinstance(message, AIMessageChunk):
+                    text = _chunk_text(message.content)
+                    if text:
+                        yield "token", {"text": text}
+            elif mode == "updates":
+                for node_name, update in chunk.items():
+                    yield "node", {"node": node_name}
+                    for message in (update or {}).get("messages", []):
+                        if isinstance(message, ToolMessage) and message.tool_call_id not in emitted_tool_calls:
+                            emitted_tool_calls.add(message.tool_call_id)
+                            yield "tool_result", {
+                                "tool": message.name,
+                                "tool_call_id": message.tool_call_id,
+                                "result": json.loads(message.content),
+                            }
+        yield "final", _pipeline_result(final_state, session_id, tools_offset)
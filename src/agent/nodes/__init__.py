@@ -1,6 +1,29 @@
-from src.agent.nodes.bootstrap_tasks_node import bootstrap_tasks_node
-from src.agent.nodes.finalize_node import finalize_node, should_continue
-from src.agent.nodes.llm_call import llm_call
-from src.agent.nodes.tool_node import tool_node
+from src.agent.nodes.bootstrap_tasks_node import (
+    abootstrap_tasks_node,
+    apreload_snapshot,
+    bootstrap_tasks_node,
+    prefetch_snapshot,
+    preload_snapshot,
+)
+from src.agent.nodes.finalize_node import finalize_node, route_after_tools, should_continue
+from src.agent.nodes.llm_call import allm_call, llm_call
+from src.agent.nodes.router_node import arouter_node, route_after_router, router_node
+from src.agent.nodes.tool_node import atool_node, tool_node
 
-__all__ = ["bootstrap_tasks_node", "finalize_node", "llm_call", "should_continue", "tool_node"]
+__all__ = [
+    "abootstrap_tasks_node",
+    "allm_call",
+    "apreload_snapshot",
+    "arouter_node",
+    "atool_node",
+    "bootstrap_tasks_node",
+    "finalize_node",
+    "llm_call",
+    "prefetch_snapshot",
+    "preload_snapshot",
+    "route_after_router",
+    "route_after_tools",
+    "router_node",
+    "should_continue",
+    "tool_node",
+]
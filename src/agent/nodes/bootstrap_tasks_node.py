@@ -1,44 +1,127 @@
-import json
+import time
 
 from langchain.messages import SystemMessage
 from langfuse import observe
 
+from src.agent.config import SESSION_SNAPSHOT_TTL, SPECULATIVE_BOOTSTRAP
+from src.agent.encoding import encode_snapshot
+from src.agent.nodes.router_node import _latest_user_text
+from src.agent.router import needs_snapshot
 from src.agent.state import MessagesState
 from src.models.model import tools_by_name
+from src.tools.tools import ListPrefetch, get_google_tasks_client
+
+# Every task list is fetched concurrently, so the snapshot covers all of them in one round trip.
+_PRELOAD_ARGS = {"limit": 20, "all_lists": True}
+# Enough for the snapshot and for router_node's listing, so both reuse the prefetch.
+_PREFETCH_LIMIT = 100
+
+
+def _snapshot_message(list_result: dict) -> SystemMessage:
+    return SystemMessage(
+        content=(
+            "Initial context from google_tasks_list (fetched before first model call). "
+            "Use this snapshot first; call google_tasks_list again only if needed.\n"
+            f"{encode_snapshot(list_result)}"
+        )
+    )
+
+
+def _has_fresh_snapshot(state: MessagesState) -> bool:
+    # Session follow-ups already carry a snapshot in their history.
+    return time.time() - state.get("snapshot_at", 0.0) < SESSION_SNAPSHOT_TTL
+
+
+def prefetch_snapshot() -> ListPrefetch | None:
+    """Start fetching the snapshot in the background, before the graph runs.
+
+    Installed with ``using_list_prefetch``, it turns the bootstrap preload
+    into a wait on a request already in flight, and a google_tasks_list call
+    from the model on a turn that skipped the snapshot reuses it as well.
+    None when fresh mirrors would answer the listing: there is no API
+    latency to hide then, only work that might be thrown away.
+    """
+    try:
+        if get_google_tasks_client().listsAreLocal():
+            return None
+    except Exception:
+        # The background listing reports the same failure through its result.
+        pass
+    return ListPrefetch(limit=_PREFETCH_LIMIT)
+
+
+def _skip_preload(state: MessagesState) -> bool:
+    if "google_tasks_list" not in tools_by_name or _has_fresh_snapshot(state):
+        return True
+    # A plain "create X" never reads the list: the model starts without waiting for it.
+    return SPECULATIVE_BOOTSTRAP and not needs_snapshot(_latest_user_text(state))
+
+
+def _preload_failed_message(error: Exception) -> SystemMessage:
+    return SystemMessage(
+        content=f"Initial google_tasks_list preload failed. Continue without preload. Error: {error}"
+    )
+
+
+def preload_snapshot() -> tuple[SystemMessage, float]:
+    """Snapshot message and its timestamp (0.0 when the preload failed).
+
+    Batch runs fetch it once and seed every item's state with it, so their
+    bootstrap nodes skip the preload.
+    """
+    try:
+        list_result = tools_by_name["google_tasks_list"].invoke(_PRELOAD_ARGS)
+        return _snapshot_message(list_result), time.time()
+    except Exception as error:
+        return _preload_failed_message(error), 0.0
+
+
+async def apreload_snapshot() -> tuple[SystemMessage, float]:
+    """Async variant of preload_snapshot."""
+    try:
+        list_result = await tools_by_name["google_tasks_list"].ainvoke(_PRELOAD_ARGS)
+        return _snapshot_message(list_result), time.time()
+    except Exception as error:
+        return _preload_failed_message(error), 0.0
 
 
 @observe(name="Bootstrap Tasks Node")
 def bootstrap_tasks_node(state: MessagesState) -> MessagesState:
     """Preload google_tasks_list output into state before the first LLM call."""
-    result = state.get("messages", [])
-    list_tool = tools_by_name.get("google_tasks_list")
-    if list_tool is None:
+    if _skip_preload(state):
         return {
-            "messages": result,
+            "messages": [],
             "used_tools": [],
             "llm_calls": state.get("llm_calls", 0),
         }
 
-    try:
-        list_result = list_tool.invoke({"limit": 20})
-        result.append(
-            SystemMessage(
-                content=(
-                    "Initial context from google_tasks_list (fetched before first model call). "
-                    "Use this snapshot first; call google_tasks_list again only if needed.\n"
-                    f"{json.dumps(list_result, ensure_ascii=False)}"
-                )
-            )
-        )
-    except Exception as error:
-        result.append(
-            SystemMessage(
-                content=f"Initial google_tasks_list preload failed. Continue without preload. Error: {error}"
-            )
-        )
+    preload, snapshot_at = preload_snapshot()
+
+    # Only the new message: the reducer appends it to the existing history.
+    return {
+        "messages": [preload],
+        "used_tools": ["google_tasks_list"],
+        "llm_calls": state.get("llm_calls", 0),
+        "snapshot_at": snapshot_at,
+    }
+
+
+@observe(name="Bootstrap Tasks Node")
+async def abootstrap_tasks_node(state: MessagesState) -> MessagesState:
+    """Async variant of bootstrap_tasks_node."""
+    if _skip_preload(state):
+        return {
+            "messages": [],
+            "used_tools": [],
+            "llm_calls": state.get("llm_calls", 0),
+        }
+
+    preload, snapshot_at = await apreload_snapshot()
 
+    # Only the new message: the reducer appends it to the existing history.
     return {
-        "messages": result,
+        "messages": [preload],
         "used_tools": ["google_tasks_list"],
         "llm_calls": state.get("llm_calls", 0),
+        "snapshot_at": snapshot_at,
     }
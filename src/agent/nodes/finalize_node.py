@@ -3,26 +3,55 @@ from typing import Literal
 from langchain.messages import AIMessage
 from langfuse import observe
 
+from src.agent.budget import exhausted, fallback_answer
 from src.agent.state import MessagesState
+from src.metrics import ERRORS
 
 
 @observe(name="Should Continue?")
 def should_continue(state: MessagesState) -> Literal["tool_node", "finalize_node"]:
-    """Decide if we should continue the loop or stop based on tool calls."""
+    """Decide if we should continue the loop or stop based on tool calls and the budget."""
     last_message = state["messages"][-1]
     if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        return "tool_node"
+        if exhausted(state, pending_tool_calls=len(last_message.tool_calls)) is None:
+            return "tool_node"
     return "finalize_node"
 
 
+def route_after_tools(state: MessagesState) -> Literal["llm_call", "finalize_node"]:
+    """Hand tool results back to the model unless the turn's budget ran out."""
+    return "finalize_node" if exhausted(state) is not None else "llm_call"
+
+
+def _cut_short(state: MessagesState) -> str | None:
+    """Budget limit that ended the loop before the model answered, or None."""
+    messages = state.get("messages") or []
+    if not messages:
+        return None
+    last_message = messages[-1]
+    if isinstance(last_message, AIMessage):
+        if not last_message.tool_calls:
+            return None
+        return exhausted(state, pending_tool_calls=len(last_message.tool_calls)) or exhausted(state) or "deadline"
+    # No answer after tool results (or after a model call abandoned at the deadline).
+    return exhausted(state) or "deadline"
+
+
 @observe(name="Finalize Node")
 def finalize_node(state: MessagesState) -> MessagesState:
-    final_message = AIMessage(
-        content=state.get("messages", "")[-1].content if state.get("messages") else "No messages",
-        tool_calls=[],
-    )
+    reason = _cut_short(state)
+    if reason is None:
+        final_message = AIMessage(
+            content=state.get("messages", "")[-1].content if state.get("messages") else "No messages",
+            tool_calls=[],
+        )
+    else:
+        # Answer from what the tools already returned instead of failing the request.
+        ERRORS.labels("budget", reason).inc()
+        final_message = AIMessage(content=fallback_answer(state, reason), tool_calls=[])
     return {
         "messages": [final_message],
         "llm_calls": state.get("llm_calls", 0),
         "used_tools": [],
+        "budget_exhausted": reason,
     }
@@ -1,23 +1,117 @@
+from typing import Any
+
+from langchain.messages import AIMessage, AnyMessage
+from langchain_core.runnables import Runnable
 from langfuse import observe
 
-from src.agent.config import SYS_PROMPT, langfuse, model_with_tools
+from src.agent.config import (
+    CONTEXT_KEEP_TOOL_RESULTS,
+    CONTEXT_TOKEN_BUDGET,
+    SYS_PROMPT,
+    SYS_PROMPT_DIGEST,
+    context_cache,
+    get_langfuse,
+)
+from src.agent.budget import time_left
+from src.agent.context import fit_to_budget
 from src.agent.state import MessagesState
+from src.metrics import record_tokens
+from src.models.model import get_model, get_model_with_tools
+
+# Shortest timeout handed to Gemini, so a nearly spent deadline still gets one try.
+_MIN_TIMEOUT = 1.0
+
+
+def _request(state: MessagesState) -> tuple[Runnable, list[AnyMessage], dict[str, Any]]:
+    """Pick the runnable, prompt and call options for this model call."""
+    history = fit_to_budget(state["messages"], CONTEXT_TOKEN_BUDGET, CONTEXT_KEEP_TOOL_RESULTS)
+    left = time_left(state)
+    # Gemini gives up at the turn's deadline instead of holding the request past it.
+    options: dict[str, Any] = {"timeout": max(left, _MIN_TIMEOUT)} if left is not None else {}
+    cache_name = context_cache.name() if context_cache is not None else None
+    if cache_name is not None:
+        # System prompt and tools live in the cache; only the conversation is sent.
+        return get_model(), history, {**options, "cached_content": cache_name}
+    return get_model_with_tools(), [SYS_PROMPT] + history, options
+
+
+def _past_deadline(state: MessagesState) -> bool:
+    left = time_left(state)
+    return left is not None and left <= 0
+
+
+def _abandoned(state: MessagesState) -> MessagesState:
+    # No message: finalize_node sees the turn unanswered and falls back to the tool results.
+    return {"messages": [], "llm_calls": state.get("llm_calls", 0), "used_tools": []}
+
+
+def _trace_input(prompt: list[AnyMessage]) -> list[AnyMessage]:
+    return [message for message in prompt if message is not SYS_PROMPT]
+
+
+def _usage(message: AIMessage) -> dict[str, int]:
+    usage = message.usage_metadata or {}
+    return {
+        "input": usage.get("input_tokens", 0),
+        "output": usage.get("output_tokens", 0),
+        "cache_read": (usage.get("input_token_details") or {}).get("cache_read", 0),
+    }
+
+
+def _update(state: MessagesState, message: AIMessage) -> MessagesState:
+    usage = _usage(message)
+    record_tokens(usage["input"], usage["output"], usage["cache_read"])
+    return {
+        "messages": [message],
+        "llm_calls": state.get("llm_calls", 0) + 1,
+        "used_tools": [],
+        "prompt_tokens": state.get("prompt_tokens", 0) + usage["input"],
+        "completion_tokens": state.get("completion_tokens", 0) + usage["output"],
+        "cached_tokens": state.get("cached_tokens", 0) + usage["cache_read"],
+    }
 
 
 @observe(name="LLM Call")
 def llm_call(state: MessagesState) -> MessagesState:
     """LLM decides whether to call a tool or not."""
-    with langfuse.start_as_current_observation(
+    runnable, prompt, options = _request(state)
+    with get_langfuse().start_as_current_observation(
         as_type="generation",
         name="llm-response",
         model="gemini-2.5-flash",
-        input=[SYS_PROMPT] + state["messages"],
+        input=_trace_input(prompt),
+        metadata={"system_prompt_sha256": SYS_PROMPT_DIGEST},
     ) as generation:
-        message = model_with_tools.invoke([SYS_PROMPT] + state["messages"])
-        generation.update(output=message, metadata=message.response_metadata)
+        try:
+            message = runnable.invoke(prompt, **options)
+        except Exception:
+            if not _past_deadline(state):
+                raise
+            generation.update(level="WARNING", status_message="Model call abandoned at the request deadline.")
+            return _abandoned(state)
+        generation.update(output=message, metadata=message.response_metadata, usage_details=_usage(message))
 
-    return {
-        "messages": [message],
-        "llm_calls": state.get("llm_calls", 0) + 1,
-        "used_tools": [],
-    }
+    return _update(state, message)
+
+
+@observe(name="LLM Call")
+async def allm_call(state: MessagesState) -> MessagesState:
+    """Async variant of llm_call."""
+    runnable, prompt, options = _request(state)
+    with get_langfuse().start_as_current_observation(
+        as_type="generation",
+        name="llm-response",
+        model="gemini-2.5-flash",
+        input=_trace_input(prompt),
+        metadata={"system_prompt_sha256": SYS_PROMPT_DIGEST},
+    ) as generation:
+        try:
+            message = await runnable.ainvoke(prompt, **options)
+        except Exception:
+            if not _past_deadline(state):
+                raise
+            generation.update(level="WARNING", status_message="Model call abandoned at the request deadline.")
+            return _abandoned(state)
+        generation.update(output=message, metadata=message.response_metadata, usage_details=_usage(message))
+
+    return _update(state, message)
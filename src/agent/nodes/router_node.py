@@ -0,0 +1,82 @@
+from typing import Literal
+
+from langchain.messages import AIMessage, HumanMessage
+from langfuse import observe
+
+from src.agent.config import ROUTER_ENABLED
+from src.agent.router import classify, render, router_stats
+from src.agent.state import MessagesState
+from src.models.model import tools_by_name
+
+
+def _latest_user_text(state: MessagesState) -> str:
+    for message in reversed(state.get("messages", [])):
+        if isinstance(message, HumanMessage):
+            return message.content if isinstance(message.content, str) else ""
+    return ""
+
+
+def _fall_through(state: MessagesState) -> MessagesState:
+    return {
+        "messages": [],
+        "used_tools": [],
+        "llm_calls": state.get("llm_calls", 0),
+    }
+
+
+def _tasks_of(list_result: dict) -> list[dict]:
+    """Flatten an all_lists result, tagging tasks with their list when there are several."""
+    task_lists = list_result["tasklists"]
+    if len(task_lists) == 1:
+        return task_lists[0]["tasks"]
+    return [{**task, "tasklist": task_list["title"]} for task_list in task_lists for task in task_list["tasks"]]
+
+
+def _answer(state: MessagesState, intent: str, list_result: dict) -> MessagesState:
+    router_stats.record(intent)
+    return {
+        "messages": [AIMessage(content=render(intent, _tasks_of(list_result)))],
+        # Record the fast-path decision; llm_calls stays untouched since no model ran.
+        "used_tools": ["google_tasks_list", f"router:{intent}"],
+        "llm_calls": state.get("llm_calls", 0),
+    }
+
+
+@observe(name="Router Node")
+def router_node(state: MessagesState) -> MessagesState:
+    """Answer simple listing requests from google_tasks_list without calling the LLM."""
+    list_tool = tools_by_name.get("google_tasks_list")
+    intent = classify(_latest_user_text(state)) if ROUTER_ENABLED and list_tool else None
+    if intent is None:
+        router_stats.record(None)
+        return _fall_through(state)
+
+    list_result = list_tool.invoke({"limit": 100, "all_lists": True})
+    if not list_result.get("ok"):
+        router_stats.record(None)
+        return _fall_through(state)
+    return _answer(state, intent, list_result)
+
+
+@observe(name="Router Node")
+async def arouter_node(state: MessagesState) -> MessagesState:
+    """Async variant of router_node."""
+    list_tool = tools_by_name.get("google_tasks_list")
+    intent = classify(_latest_user_text(state)) if ROUTER_ENABLED and list_tool else None
+    if intent is None:
+        router_stats.record(None)
+        return _fall_through(state)
+
+    list_result = await list_tool.ainvoke({"limit": 100, "all_lists": True})
+    if not list_result.get("ok"):
+        router_stats.record(None)
+        return _fall_through(state)
+    return _answer(state, intent, list_result)
+
+
+def route_after_router(state: MessagesState) -> Literal["bootstrap_tasks_node", "finalize_node"]:
+    """Skip the snapshot and the LLM when the router already answered."""
+    last_message = state["messages"][-1]
+    if isinstance(last_message, AIMessage) and not last_message.tool_calls:
+        return "finalize_node"
+    return "bootstrap_tasks_node"
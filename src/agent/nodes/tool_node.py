@@ -1,46 +1,178 @@
-import json
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any
 
-from langchain.messages import AIMessage, ToolMessage
+from langchain.messages import AIMessage, ToolCall, ToolMessage
 from langfuse import observe
 
+from src.agent.config import TOOL_MAX_WORKERS, TOOL_WRITE_POLICY, response_cache
+from src.agent.encoding import compact_json
 from src.agent.state import MessagesState
+from src.metrics import record_tool
 from src.models.model import tools_by_name
+from src.tools.tools import GOOGLE_TASKS_WRITE_TOOLS, discard_list_prefetch
+
+def _written_task_ids(tool_call: ToolCall) -> set[str]:
+    if tool_call["name"] not in GOOGLE_TASKS_WRITE_TOOLS:
+        return set()
+    args = tool_call["args"]
+    task_ids = {args["task_id"]} if args.get("task_id") else set()
+    task_ids.update(args.get("task_ids") or [])
+    task_ids.update(update["task_id"] for update in args.get("updates") or [] if update.get("task_id"))
+    return task_ids
+
+
+def _group_tool_calls(tool_calls: list[ToolCall]) -> list[list[int]]:
+    """Split tool calls into groups that may run concurrently.
+
+    Calls inside a group keep their original order and run one after another;
+    with the "serialize" policy, writes sharing a task_id land in one group.
+    """
+    parents = list(range(len(tool_calls)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    if TOOL_WRITE_POLICY == "serialize":
+        owner_by_task_id: dict[str, int] = {}
+        for index, tool_call in enumerate(tool_calls):
+            for task_id in _written_task_ids(tool_call):
+                if task_id in owner_by_task_id:
+                    parents[find(index)] = find(owner_by_task_id[task_id])
+                else:
+                    owner_by_task_id[task_id] = index
+
+    groups: dict[int, list[int]] = {}
+    for index in range(len(tool_calls)):
+        groups.setdefault(find(index), []).append(index)
+    return list(groups.values())
+
+
+def _invoke_tool(tool_call: ToolCall) -> Any:
+    selected_tool = tools_by_name.get(tool_call["name"])
+    if selected_tool is None:
+        return {"ok": False, "error": f"Ferramenta não encontrada: {tool_call['name']}"}
+    started = time.perf_counter()
+    try:
+        output = selected_tool.invoke(tool_call["args"])
+    except Exception as error:
+        # One failing call must not discard the results of its siblings.
+        output = {"ok": False, "error": f"Tool execution failed: {error}"}
+    record_tool(tool_call["name"], started, output)
+    return output
+
+
+async def _ainvoke_tool(tool_call: ToolCall) -> Any:
+    selected_tool = tools_by_name.get(tool_call["name"])
+    if selected_tool is None:
+        return {"ok": False, "error": f"Ferramenta não encontrada: {tool_call['name']}"}
+    started = time.perf_counter()
+    try:
+        output = await selected_tool.ainvoke(tool_call["args"])
+    except Exception as error:
+        output = {"ok": False, "error": f"Tool execution failed: {error}"}
+    record_tool(tool_call["name"], started, output)
+    return output
+
+
+def _run_group(tool_calls: list[ToolCall], group: list[int]) -> list[tuple[int, Any]]:
+    return [(index, _invoke_tool(tool_calls[index])) for index in group]
+
+
+async def _arun_group(
+    tool_calls: list[ToolCall],
+    group: list[int],
+    semaphore: asyncio.Semaphore,
+) -> list[tuple[int, Any]]:
+    async with semaphore:
+        return [(index, await _ainvoke_tool(tool_calls[index])) for index in group]
+
+
+def _tool_messages(tool_calls: list[ToolCall], completed: list[list[tuple[int, Any]]]) -> list[ToolMessage]:
+    outputs: list[Any] = [None] * len(tool_calls)
+    for group_outputs in completed:
+        for index, tool_output in group_outputs:
+            outputs[index] = tool_output
+    return [
+        ToolMessage(
+            content=compact_json(tool_output),
+            tool_call_id=tool_call["id"],
+            name=tool_call["name"],
+        )
+        for tool_call, tool_output in zip(tool_calls, outputs)
+    ]
+
+
+def _tool_node_update(
+    state: MessagesState,
+    tool_calls: list[ToolCall],
+    completed: list[list[tuple[int, Any]]],
+) -> MessagesState:
+    # Deltas only: the reducers append these to the existing state.
+    update: MessagesState = {
+        "messages": _tool_messages(tool_calls, completed),
+        "used_tools": [tool_call["name"] for tool_call in tool_calls],
+        "llm_calls": state.get("llm_calls", 0),
+        "tool_calls": state.get("tool_calls", 0) + len(tool_calls),
+    }
+    if any(tool_call["name"] in GOOGLE_TASKS_WRITE_TOOLS for tool_call in tool_calls):
+        # The preloaded snapshot, the prefetched listing and any cached answers
+        # no longer match the remote list.
+        update["snapshot_at"] = 0.0
+        discard_list_prefetch()
+        response_cache.invalidate()
+    return update
 
 
 @observe(name="Tool Call")
 def tool_node(state: MessagesState) -> MessagesState:
     """Performs the tool call decided by the LLM."""
-    result = state.get("messages", [])
-    used_tools: list[str] = state.get("used_tools", [])
     last_message = state["messages"][-1]
 
     # Only AIMessage has tool_calls; guard access to satisfy type checkers.
     if not isinstance(last_message, AIMessage) or not getattr(last_message, "tool_calls", None):
         return {
-            "messages": result,
-            "used_tools": used_tools,
+            "messages": [],
+            "used_tools": [],
             "llm_calls": state.get("llm_calls", 0),
         }
 
-    for tool_call in last_message.tool_calls:
-        tool_name = tool_call["name"]
-        selected_tool = tools_by_name.get(tool_name)
-        used_tools.append(tool_name)
-        if selected_tool is None:
-            tool_output = {"ok": False, "error": f"Ferramenta não encontrada: {tool_name}"}
-        else:
-            tool_output = selected_tool.invoke(tool_call["args"])
-
-        result.append(
-            ToolMessage(
-                content=json.dumps(tool_output, ensure_ascii=False),
-                tool_call_id=tool_call["id"],
-                name=tool_name,
-            )
-        )
+    tool_calls = last_message.tool_calls
+    groups = _group_tool_calls(tool_calls)
+    if len(groups) == 1:
+        completed = [_run_group(tool_calls, groups[0])]
+    else:
+        # A pool per call: TOOL_MAX_WORKERS bounds this turn only, so concurrent
+        # requests never queue behind each other's tool calls.
+        with ThreadPoolExecutor(max_workers=min(TOOL_MAX_WORKERS, len(groups)), thread_name_prefix="tool-node") as executor:
+            # Each task gets its own context copy so tracing spans nest under this node.
+            futures = [executor.submit(copy_context().run, _run_group, tool_calls, group) for group in groups]
+            completed = [future.result() for future in futures]
 
-    return {
-        "messages": result,
-        "used_tools": used_tools,
-        "llm_calls": state.get("llm_calls", 0),
-    }
+    return _tool_node_update(state, tool_calls, completed)
+
+
+@observe(name="Tool Call")
+async def atool_node(state: MessagesState) -> MessagesState:
+    """Async variant of tool_node."""
+    last_message = state["messages"][-1]
+
+    if not isinstance(last_message, AIMessage) or not getattr(last_message, "tool_calls", None):
+        return {
+            "messages": [],
+            "used_tools": [],
+            "llm_calls": state.get("llm_calls", 0),
+        }
+
+    tool_calls = last_message.tool_calls
+    semaphore = asyncio.Semaphore(TOOL_MAX_WORKERS)
+    completed = await asyncio.gather(
+        *(_arun_group(tool_calls, group, semaphore) for group in _group_tool_calls(tool_calls))
+    )
+
+    return _tool_node_update(state, tool_calls, list(completed))
@@ -0,0 +1,140 @@
+import re
+import threading
+import unicodedata
+from collections import Counter
+from datetime import date
+from typing import Any, Literal
+
+Intent = Literal["list", "list_pending", "list_due_today"]
+
+_TASK_WORDS = {"tarefa", "tarefas", "tasks"}
+_LIST_WORDS = {
+    "liste", "listar", "lista", "mostre", "mostrar", "mostra", "exiba", "exibir",
+    "ver", "veja", "quais", "qual", "sao", "tenho", "todas",
+}
+_PENDING_WORDS = {"pendente", "pendentes", "aberta", "abertas", "aberto", "fazer"}
+_TODAY_WORDS = {"hoje", "vencem", "vence", "vencendo"}
+_FILLER_WORDS = {
+    "a", "as", "o", "os", "me", "minha", "minhas", "meu", "meus", "de", "do", "da", "em",
+    "para", "pra", "que", "eu", "por", "favor", "agora", "ai", "aqui", "jarvis", "oi", "ola",
+}
+_VOCABULARY = _TASK_WORDS | _LIST_WORDS | _PENDING_WORDS | _TODAY_WORDS | _FILLER_WORDS
+
+# Opening words of a request to add something new, which needs no task snapshot...
+_CREATE_WORDS = {
+    "crie", "criar", "cria", "adicione", "adicionar", "adiciona", "anote", "anotar", "anota",
+    "inclua", "incluir", "inclui", "lembre", "lembrar", "lembra", "agende", "agendar", "agenda",
+}
+# ...unless it also points back at tasks that already exist.
+_EXISTING_WORDS = {
+    "todas", "todos", "cada", "minhas", "meus", "pendente", "pendentes", "aberta", "abertas",
+    "atrasada", "atrasadas", "vencida", "vencidas", "existe", "existem", "existente", "existentes",
+    "ja", "mesma", "mesmo", "igual", "duplicada", "duplicado", "outra", "outras", "anterior", "ultima",
+}
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase, strip accents and split into word tokens."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.findall(r"[a-z0-9]+", stripped)
+
+
+def needs_snapshot(text: str) -> bool:
+    """Whether the task snapshot is worth putting in the first prompt.
+
+    Only a message that starts by asking to add something and never refers
+    to existing tasks goes without it; anything else keeps the snapshot.
+    """
+    tokens = normalize(text)
+    if not tokens or tokens[0] not in _CREATE_WORDS:
+        return True
+    return bool(set(tokens) & _EXISTING_WORDS)
+
+
+def classify(text: str) -> Intent | None:
+    """Match a high-confidence listing intent, or None to let the LLM decide.
+
+    Every word must belong to the known vocabulary, so anything beyond a plain
+    listing request (a task name, a date, a negation...) falls through.
+    """
+    tokens = normalize(text)
+    if not tokens or len(tokens) > 12:
+        return None
+    words = set(tokens)
+    if not words <= _VOCABULARY or not words & _TASK_WORDS or not words & (_LIST_WORDS | _TODAY_WORDS):
+        return None
+    if "hoje" in words:
+        return "list_due_today"
+    if words & {"vencem", "vence", "vencendo"}:
+        # "vencem" without "hoje" asks about another period.
+        return None
+    if words & _PENDING_WORDS:
+        return "list_pending"
+    return "list"
+
+
+def _format_due(due: str | None) -> str:
+    if not due:
+        return ""
+    year, month, day = due[:10].split("-")
+    return f" (vence em {day}/{month}/{year})"
+
+
+def format_task(task: dict[str, Any]) -> str:
+    done = " ✓" if task.get("status") == "completed" else ""
+    task_list = f" [{task['tasklist']}]" if task.get("tasklist") else ""
+    return f"- {task.get('title') or '(sem título)'}{_format_due(task.get('due'))}{done}{task_list}"
+
+
+def render(intent: Intent, tasks: list[dict[str, Any]], today: date | None = None) -> str:
+    """Answer a routed intent in Portuguese from google_tasks_list output."""
+    if intent == "list_pending":
+        selected = [task for task in tasks if task.get("status") != "completed"]
+        empty, header = "Você não tem tarefas pendentes.", "Você tem {count} tarefa(s) pendente(s):"
+    elif intent == "list_due_today":
+        today_iso = (today or date.today()).isoformat()
+        selected = [
+            task
+            for task in tasks
+            if (task.get("due") or "")[:10] == today_iso and task.get("status") != "completed"
+        ]
+        empty, header = "Nenhuma tarefa pendente vence hoje.", "{count} tarefa(s) vence(m) hoje:"
+    else:
+        selected = tasks
+        empty, header = "Você não tem tarefas.", "Você tem {count} tarefa(s):"
+
+    if not selected:
+        return empty
+    lines = [header.format(count=len(selected))]
+    lines.extend(format_task(task) for task in selected)
+    return "\n".join(lines)
+
+
+class RouterStats:
+    """Thread-safe hit/miss counters for tuning the routing rules."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routed: Counter[str] = Counter()
+        self._fallthrough = 0
+
+    def record(self, intent: str | None) -> None:
+        with self._lock:
+            if intent is None:
+                self._fallthrough += 1
+            else:
+                self._routed[intent] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            routed = sum(self._routed.values())
+            total = routed + self._fallthrough
+            return {
+                "routed": dict(self._routed),
+                "fallthrough": self._fallthrough,
+                "hit_rate": routed / total if total else 0.0,
+            }
+
+
+router_stats = RouterStats()
@@ -1,5 +1,127 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
 from uuid import uuid4
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
 
 def generate_session_id() -> str:
     return f"{uuid4()}"
+
+
+class LRUMemorySaver(InMemorySaver):
+    """In-memory checkpointer that keeps at most ``max_sessions`` recent threads.
+
+    Threads idle for longer than ``ttl`` seconds are forgotten as well.
+    """
+
+    def __init__(self, max_sessions: int, ttl: float) -> None:
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        self._lru_lock = threading.Lock()
+
+    def _touch(self, thread_id: str) -> None:
+        now = time.monotonic()
+        expired: list[str] = []
+        with self._lru_lock:
+            self._last_used[thread_id] = now
+            self._last_used.move_to_end(thread_id)
+            for candidate, last_used in self._last_used.items():
+                if now - last_used <= self.ttl:
+                    break
+                expired.append(candidate)
+            while len(self._last_used) - len(expired) > self.max_sessions:
+                expired.append(next(key for key in self._last_used if key not in expired))
+            for candidate in expired:
+                del self._last_used[candidate]
+        for candidate in expired:
+            self.delete_thread(candidate)
+
+    def _is_expired(self, thread_id: str) -> bool:
+        with self._lru_lock:
+            last_used = self._last_used.get(thread_id)
+        return last_used is not None and time.monotonic() - last_used > self.ttl
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = str(config["configurable"]["thread_id"])
+        if self._is_expired(thread_id):
+            with self._lru_lock:
+                self._last_used.pop(thread_id, None)
+            self.delete_thread(thread_id)
+            return None
+        return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        self._touch(str(config["configurable"]["thread_id"]))
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """SqliteSaver usable from ainvoke: async methods run the sync ones in a thread."""
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def build_checkpointer(backend: str, db_path: str, max_sessions: int, ttl: float) -> BaseCheckpointSaver:
+    """Create the session checkpointer: "memory" (LRU + TTL) or "sqlite"."""
+    if backend == "sqlite":
+        return ThreadedSqliteSaver(sqlite3.connect(db_path, check_same_thread=False))
+    return LRUMemorySaver(max_sessions=max_sessions, ttl=ttl)
@@ -3,13 +3,34 @@ from typing import Any
 
 from langchain.messages import AnyMessage
 from pydantic import BaseModel, Field
-from typing_extensions import Annotated, TypedDict
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+
+class Budget(TypedDict, total=False):
+    """Limits of one turn of the agent loop; a missing key means no limit."""
+
+    max_llm_calls: int
+    max_tool_calls: int
+    max_prompt_tokens: int
+    # Epoch seconds by which the turn must answer.
+    deadline: float
 
 
 class MessagesState(TypedDict):
     messages: Annotated[list[AnyMessage], operator.add]
     llm_calls: int
     used_tools: Annotated[list[str], operator.add]
+    # Epoch seconds of the task snapshot in messages; 0 once a write made it stale.
+    snapshot_at: NotRequired[float]
+    # Gemini token usage for the current turn, summed over llm_call invocations.
+    prompt_tokens: NotRequired[int]
+    completion_tokens: NotRequired[int]
+    cached_tokens: NotRequired[int]
+    # Tool calls run in the current turn, checked against budget["max_tool_calls"].
+    tool_calls: NotRequired[int]
+    budget: NotRequired[Budget]
+    # Limit that cut the last turn short ("llm_calls", "deadline", ...), None when it finished.
+    budget_exhausted: NotRequired[str | None]
 
 
 class AgentOutput(BaseModel):
@@ -0,0 +1,53 @@
+import hashlib
+import json
+from typing import Any
+
+# Strings longer than this are cut in trace payloads; the digest still identifies the full value.
+DEFAULT_MAX_CHARS = 2000
+# Lists longer than this keep only their first items in trace payloads.
+DEFAULT_MAX_ITEMS = 50
+
+
+def digest(value: Any) -> str:
+    """Short, stable sha256 of a value (strings as-is, anything else as JSON)."""
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class PayloadMask:
+    """Langfuse ``mask`` that shrinks large trace inputs and outputs.
+
+    Long strings keep a prefix plus the length and digest of the original, so
+    identical payloads can still be matched across traces without exporting
+    them in full. Message objects are reduced to their type and content.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS, max_items: int = DEFAULT_MAX_ITEMS) -> None:
+        self.max_chars = max_chars
+        self.max_items = max_items
+
+    def __call__(self, *, data: Any, **kwargs: Any) -> Any:
+        return self._shrink(data, depth=0)
+
+    def _shrink(self, data: Any, depth: int) -> Any:
+        if depth > 8:
+            return f"<nested {type(data).__name__}>"
+        if isinstance(data, str):
+            if len(data) <= self.max_chars:
+                return data
+            return f"{data[:self.max_chars]}… [{len(data)} chars, sha256:{digest(data)}]"
+        if isinstance(data, dict):
+            return {key: self._shrink(value, depth + 1) for key, value in data.items()}
+        if isinstance(data, (list, tuple)):
+            items = [self._shrink(item, depth + 1) for item in data[:self.max_items]]
+            if len(data) > self.max_items:
+                items.append(f"… {len(data) - self.max_items} more items")
+            return items
+        content = getattr(data, "content", None)
+        if content is not None and hasattr(data, "type"):
+            # LangChain messages: the content is what matters when reading a trace.
+            shrunk = {"type": data.type, "content": self._shrink(content, depth + 1)}
+            if getattr(data, "tool_calls", None):
+                shrunk["tool_calls"] = self._shrink(data.tool_calls, depth + 1)
+            return shrunk
+        return data
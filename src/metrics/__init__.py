@@ -0,0 +1,39 @@
+from src.metrics.instruments import (
+    ERRORS,
+    GOOGLE_API_DURATION,
+    GOOGLE_API_RETRIES,
+    IN_FLIGHT,
+    LLM_TOKENS,
+    LOOP_ITERATIONS,
+    NODE_DURATION,
+    PIPELINE_DURATION,
+    TOOL_DURATION,
+    instrument_node,
+    record_tokens,
+    record_tool,
+    render_metrics,
+    track_pipeline,
+)
+from src.metrics.registry import CONTENT_TYPE, REGISTRY, Counter, Gauge, Histogram
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "ERRORS",
+    "GOOGLE_API_DURATION",
+    "GOOGLE_API_RETRIES",
+    "Gauge",
+    "Histogram",
+    "IN_FLIGHT",
+    "LLM_TOKENS",
+    "LOOP_ITERATIONS",
+    "NODE_DURATION",
+    "PIPELINE_DURATION",
+    "REGISTRY",
+    "TOOL_DURATION",
+    "instrument_node",
+    "record_tokens",
+    "record_tool",
+    "render_metrics",
+    "track_pipeline",
+]
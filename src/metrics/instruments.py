@@ -0,0 +1,120 @@
+import functools
+import inspect
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from src.metrics.registry import REGISTRY, Counter, Gauge, Histogram
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+NODE_DURATION = REGISTRY.register(
+    Histogram("jarvis_node_duration_seconds", "Time spent in each agent graph node.", ("node",))
+)
+TOOL_DURATION = REGISTRY.register(
+    Histogram("jarvis_tool_duration_seconds", "Time spent running each tool called by the model.", ("tool", "outcome"))
+)
+GOOGLE_API_DURATION = REGISTRY.register(
+    Histogram(
+        "jarvis_google_api_duration_seconds",
+        "Google Tasks API round trips by method and HTTP outcome.",
+        ("method", "status"),
+    )
+)
+GOOGLE_API_RETRIES = REGISTRY.register(
+    Counter(
+        "jarvis_google_api_retries_total",
+        "Google Tasks API calls sent again, by method and reason (rate_limited, server_error, transport).",
+        ("method", "reason"),
+    )
+)
+PIPELINE_DURATION = REGISTRY.register(
+    Histogram("jarvis_pipeline_duration_seconds", "End-to-end time to answer one message.", ("entrypoint",))
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter("jarvis_llm_tokens_total", "Model tokens by kind (prompt, completion, cached).", ("kind",))
+)
+LOOP_ITERATIONS = REGISTRY.register(
+    Counter("jarvis_agent_loop_iterations_total", "Model calls made by the agent loop.")
+)
+ERRORS = REGISTRY.register(
+    Counter("jarvis_errors_total", "Failures by component and name.", ("component", "name"))
+)
+IN_FLIGHT = REGISTRY.register(
+    Gauge("jarvis_in_flight", "Operations currently running, by component and name.", ("component", "name"))
+)
+
+
+def instrument_node(name: str, func: F) -> F:
+    """Wrap a graph node (sync or async) with duration, in-flight and error metrics."""
+    duration = NODE_DURATION.labels(name)
+    in_flight = IN_FLIGHT.labels("node", name)
+    errors = ERRORS.labels("node", name)
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            in_flight.inc()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                in_flight.dec()
+                duration.observe(time.perf_counter() - started)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        in_flight.inc()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            in_flight.dec()
+            duration.observe(time.perf_counter() - started)
+
+    return wrapper  # type: ignore[return-value]
+
+
+@contextmanager
+def track_pipeline(entrypoint: str) -> Iterator[None]:
+    """Time one pipeline run and count it as in flight until it finishes."""
+    in_flight = IN_FLIGHT.labels("pipeline", entrypoint)
+    started = time.perf_counter()
+    in_flight.inc()
+    try:
+        yield
+    except Exception:
+        ERRORS.labels("pipeline", entrypoint).inc()
+        raise
+    finally:
+        in_flight.dec()
+        PIPELINE_DURATION.labels(entrypoint).observe(time.perf_counter() - started)
+
+
+def record_tool(name: str, started: float, output: Any) -> None:
+    """Record one tool run; a ``{"ok": False}`` result counts as an error."""
+    failed = isinstance(output, dict) and output.get("ok") is False
+    TOOL_DURATION.labels(name, "error" if failed else "ok").observe(time.perf_counter() - started)
+    if failed:
+        ERRORS.labels("tool", name).inc()
+
+
+def record_tokens(prompt: int, completion: int, cached: int) -> None:
+    LOOP_ITERATIONS.labels().inc()
+    LLM_TOKENS.labels("prompt").inc(prompt)
+    LLM_TOKENS.labels("completion").inc(completion)
+    LLM_TOKENS.labels("cached").inc(cached)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
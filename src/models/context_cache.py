@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_core.tools import BaseTool
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+# Recreate the cache this long before it expires so no request races the TTL.
+REFRESH_MARGIN_SECONDS = 60
+# After a failed creation (e.g. prompt below the caching minimum) wait before retrying.
+RETRY_AFTER_SECONDS = 600
+
+
+class GeminiContextCache:
+    """Explicit Gemini context cache holding the static system prompt and tool block.
+
+    Requests that reference the cache send only the conversation; the system
+    instruction and the tool declarations are billed at the cached rate.
+    """
+
+    def __init__(
+        self,
+        get_model: Callable[[], ChatGoogleGenerativeAI],
+        system_instruction: str,
+        tools: list[BaseTool],
+        ttl_seconds: int = 3600,
+    ) -> None:
+        self._get_model = get_model
+        self._system_instruction = system_instruction
+        self._tools = tools
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._name: str | None = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+
+    def name(self) -> str | None:
+        """Return the cache resource name, creating or renewing it when needed.
+
+        Returns None when caching is unavailable; callers then send the full prompt.
+        """
+        now = time.monotonic()
+        if self._name is not None and now < self._expires_at - REFRESH_MARGIN_SECONDS:
+            return self._name
+        with self._lock:
+            now = time.monotonic()
+            if self._name is not None and now < self._expires_at - REFRESH_MARGIN_SECONDS:
+                return self._name
+            if now < self._retry_at:
+                return None
+            from google.genai import types
+            from langchain_google_genai._function_utils import convert_to_genai_function_declarations
+
+            try:
+                model = self._get_model()
+                cache = model.client.caches.create(
+                    model=model.model,
+                    config=types.CreateCachedContentConfig(
+                        display_name="jarvis-static-context",
+                        system_instruction=self._system_instruction,
+                        tools=convert_to_genai_function_declarations(self._tools),
+                        ttl=f"{self._ttl_seconds}s",
+                    ),
+                )
+            except Exception as error:
+                print(f"Gemini context cache unavailable, sending full prompt: {error}")
+                self._name = None
+                self._retry_at = now + RETRY_AFTER_SECONDS
+                return None
+            self._name = cache.name
+            self._expires_at = now + self._ttl_seconds
+            return self._name
@@ -1,14 +1,56 @@
+from __future__ import annotations
+
 import os
+import threading
+from typing import TYPE_CHECKING
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 
 from src.tools.tools import GOOGLE_TASKS_TOOLS
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.runnables import Runnable
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 load_dotenv()
 
 tools_by_name = {tool.name: tool for tool in GOOGLE_TASKS_TOOLS}
-GeminiModel = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("GOOGLE_API_KEY"),
-)
+
+_model: ChatGoogleGenerativeAI | None = None
+_model_with_tools: Runnable | None = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> ChatGoogleGenerativeAI:
+    """Gemini chat model, built on first use (langchain_google_genai is slow to import)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+
+                _model = ChatGoogleGenerativeAI(
+                    model="gemini-2.5-flash",
+                    api_key=os.getenv("GOOGLE_API_KEY"),
+                )
+    return _model
+
+
+def set_model(model: BaseChatModel) -> None:
+    """Use ``model`` instead of Gemini (e.g. a scripted model for offline benchmarks)."""
+    global _model, _model_with_tools
+    with _model_lock:
+        _model = model
+        _model_with_tools = None
+
+
+def get_model_with_tools() -> Runnable:
+    """get_model() with the Google Tasks tools bound."""
+    global _model_with_tools
+    if _model_with_tools is None:
+        model = get_model()
+        with _model_lock:
+            if _model_with_tools is None:
+                _model_with_tools = model.bind_tools(GOOGLE_TASKS_TOOLS)
+    return _model_with_tools
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+
+from src.services.GoogleTasks.credentialStore import CredentialStore
+from src.services.GoogleTasks.googleTask import SCOPES, AuthorizationRequiredError, GoogleTask
+
+
+class GoogleTaskClientCache:
+    """LRU of authorized ``GoogleTask`` clients, one per user.
+
+    Clients are built from the credential store on first use and the least
+    recently used ones are dropped beyond ``max_clients``. A background thread
+    refreshes access tokens that expire within ``refresh_margin`` seconds, so
+    requests rarely wait on a refresh. Every refreshed token, including one
+    refreshed while a request was being sent, is written back to the store.
+    """
+
+    def __init__(
+        self,
+        store: CredentialStore,
+        factory: Callable[[str, Credentials, Callable[[Credentials], None]], GoogleTask],
+        max_clients: int = 100,
+        refresh_interval: float = 60.0,
+        refresh_margin: float = 300.0,
+    ) -> None:
+        self.max_clients = max_clients
+        self.refresh_interval = refresh_interval
+        self.refresh_margin = refresh_margin
+        self._store = store
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._clients: OrderedDict[str, tuple[Credentials, GoogleTask]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    def get(self, user_id: str) -> GoogleTask:
+        with self._lock:
+            entry = self._clients.get(user_id)
+            if entry is not None:
+                self._clients.move_to_end(user_id)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        credentials = self._store.get(user_id, SCOPES)
+        if credentials is None:
+            raise AuthorizationRequiredError(f"No Google Tasks credentials enrolled for user {user_id}.")
+        client = self._factory(user_id, credentials, lambda refreshed: self._save(user_id, refreshed))
+
+        dropped: list[GoogleTask] = []
+        with self._lock:
+            # Another request may have built the same client meanwhile; keep the first.
+            entry = self._clients.setdefault(user_id, (credentials, client))
+            if entry[1] is not client:
+                dropped.append(client)
+            self._clients.move_to_end(user_id)
+            while len(self._clients) > self.max_clients:
+                dropped.append(self._clients.popitem(last=False)[1][1])
+                self._evictions += 1
+            self._start_refresher()
+        # Closed outside the lock: shutting down a client must not stall other lookups.
+        for stale in dropped:
+            stale.close()
+        return entry[1]
+
+    def evict(self, user_id: str) -> None:
+        with self._lock:
+            entry = self._clients.pop(user_id, None)
+        if entry is not None:
+            entry[1].close()
+
+    def refresh_expiring(self) -> None:
+        """Refresh every cached token close to expiry; the client hands the new ones to ``_save``."""
+        with self._lock:
+            entries = list(self._clients.items())
+        for user_id, (_, client) in entries:
+            try:
+                client.refreshCredentials(self.refresh_margin)
+            except RefreshError as error:
+                # Revoked or expired grant: the user has to enroll again.
+                print(f"Could not refresh Google credentials for user {user_id}: {error}")
+                with self._lock:
+                    self._refresh_failures += 1
+                self.evict(user_id)
+            except Exception as error:
+                print(f"Token refresh for user {user_id} failed, will retry: {error}")
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def _save(self, user_id: str, credentials: Credentials) -> None:
+        # Runs on whichever thread refreshed the token, often mid-request: never raise.
+        try:
+            self._store.put(user_id, credentials)
+        except Exception as error:
+            print(f"Could not save refreshed Google credentials for user {user_id}: {error}")
+            return
+        with self._lock:
+            self._refreshes += 1
+
+    def _start_refresher(self) -> None:
+        if self._refresher is not None:
+            return
+        self._refresher = threading.Thread(target=self._refresh_loop, name="google-tasks-token-refresher", daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_expiring()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "max_clients": self.max_clients,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "token_refreshes": self._refreshes,
+                "token_refresh_failures": self._refresh_failures,
+            }
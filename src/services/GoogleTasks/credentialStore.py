@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from cryptography.fernet import Fernet, InvalidToken
+from google.oauth2.credentials import Credentials
+
+
+class CredentialStore:
+    """Per-user OAuth credentials, encrypted at rest with Fernet.
+
+    ``backend="file"`` keeps one encrypted file per user under ``location``
+    (file names are hashes, so user ids never hit the disk in clear);
+    ``backend="sqlite"`` keeps them in a single SQLite database.
+    """
+
+    def __init__(self, key: str | bytes, backend: str = "file", location: str = "credentials") -> None:
+        self._fernet = Fernet(key)
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if backend == "sqlite":
+            self._db = sqlite3.connect(location, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS user_credentials (user_id TEXT PRIMARY KEY, token BLOB NOT NULL)"
+            )
+            self._db.commit()
+        elif backend == "file":
+            self._directory = Path(location)
+            self._directory.mkdir(parents=True, exist_ok=True)
+        else:
+            raise ValueError(f"Unknown credential store backend: {backend}")
+
+    def get(self, user_id: str, scopes: list[str] | None = None) -> Credentials | None:
+        token = self._read(user_id)
+        if token is None:
+            return None
+        try:
+            info = json.loads(self._fernet.decrypt(token))
+        except InvalidToken:
+            print(f"Stored credentials for user {user_id} could not be decrypted.")
+            return None
+        return Credentials.from_authorized_user_info(info, scopes)
+
+    def put(self, user_id: str, credentials: Credentials) -> None:
+        token = self._fernet.encrypt(credentials.to_json().encode())
+        with self._lock:
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO user_credentials (user_id, token) VALUES (?, ?)",
+                    (user_id, token),
+                )
+                self._db.commit()
+                return
+            path = self._path(user_id)
+            temporary = path.with_suffix(".tmp")
+            temporary.write_bytes(token)
+            os.chmod(temporary, 0o600)
+            temporary.replace(path)
+
+    def delete(self, user_id: str) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM user_credentials WHERE user_id = ?", (user_id,))
+                self._db.commit()
+                return
+            self._path(user_id).unlink(missing_ok=True)
+
+    def _read(self, user_id: str) -> bytes | None:
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT token FROM user_credentials WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                return row[0] if row else None
+            path = self._path(user_id)
+            return path.read_bytes() if path.exists() else None
+
+    def _path(self, user_id: str) -> Path:
+        return self._directory / f"{hashlib.sha256(user_id.encode()).hexdigest()}.enc"
@@ -0,0 +1,62 @@
+"""Enroll a user's Google account in the encrypted credential store.
+
+Runs the browser OAuth flow once, offline, so the API never has to:
+
+    python -m src.services.GoogleTasks.enroll <user_id>
+    python -m src.services.GoogleTasks.enroll <user_id> --from-token token.json
+    python -m src.services.GoogleTasks.enroll <user_id> --remove
+    python -m src.services.GoogleTasks.enroll --generate-key
+"""
+import argparse
+import sys
+
+from cryptography.fernet import Fernet
+from dotenv import load_dotenv
+from google.oauth2.credentials import Credentials
+
+from src.services.GoogleTasks.googleTask import SCOPES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cadastra a conta Google Tasks de um usuário.")
+    parser.add_argument("user_id", nargs="?")
+    parser.add_argument("--client-secrets", default="credentials.json")
+    parser.add_argument("--from-token", help="Importa um token.json existente em vez de abrir o login.")
+    parser.add_argument("--remove", action="store_true", help="Apaga as credenciais do usuário.")
+    parser.add_argument("--generate-key", action="store_true", help="Gera um valor para GOOGLE_TASKS_CREDENTIALS_KEY.")
+    args = parser.parse_args()
+
+    if args.generate_key:
+        print(Fernet.generate_key().decode())
+        return
+    if not args.user_id:
+        parser.error("user_id é obrigatório")
+
+    load_dotenv()
+    # Imported late so --generate-key works without the agent's dependencies configured.
+    from src.tools.tools import build_credential_store
+
+    store = build_credential_store()
+    if store is None:
+        sys.exit("Defina GOOGLE_TASKS_CREDENTIALS_KEY (gere uma com --generate-key).")
+
+    if args.remove:
+        store.delete(args.user_id)
+        print(f"Credenciais removidas: {args.user_id}")
+        return
+
+    if args.from_token:
+        credentials = Credentials.from_authorized_user_file(args.from_token, SCOPES)
+    else:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        flow = InstalledAppFlow.from_client_secrets_file(args.client_secrets, SCOPES)
+        credentials = flow.run_local_server(port=0)
+    if not credentials.refresh_token:
+        sys.exit("O token não tem refresh_token; refaça o login para permitir acesso offline.")
+    store.put(args.user_id, credentials)
+    print(f"Usuário cadastrado: {args.user_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,121 @@
 import os.path
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 
 from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from src.metrics import ERRORS, GOOGLE_API_DURATION, IN_FLIGHT
+from src.services.GoogleTasks.httpPool import HttpPool
+from src.services.GoogleTasks.requestScheduler import (
+    READ,
+    DeadlineExceeded,
+    RequestScheduler,
+    retry_class_for,
+    time_left,
+)
+from src.services.GoogleTasks.singleFlight import SingleFlight
+from src.services.GoogleTasks.taskIndex import TaskIndex
+from src.services.GoogleTasks.taskMirror import TaskMirror
+
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/tasks"]
+# Largest page the Tasks API serves for tasks().list.
+MAX_PAGE_SIZE = 100
+# Partial-response projections: only the fields the agent actually reads.
+TASK_FIELDS = "id,etag,title,status,due,notes,updated"
+MIRROR_TASK_FIELDS = f"{TASK_FIELDS},position,parent,deleted,hidden"
+TASKLIST_FIELDS = "id,title,updated"
+# Task lists rarely change; their enumeration is reused for this long.
+TASKLISTS_TTL_SECONDS = 60
+# Operations sent per multipart batch request.
+MAX_BATCH_SIZE = 50
+# Fields updateTask may change; patches carry only the ones given.
+UPDATABLE_FIELDS = ("title", "notes", "status", "due")
+
+
+class AuthorizationRequiredError(Exception):
+  """No usable Google credentials, and interactive login is not allowed here."""
+
+
+class TaskConflictError(Exception):
+  """The task changed remotely since it was last read, in a field being updated."""
+
+  def __init__(self, task_id: str, current: dict | None = None):
+    super().__init__(f"Task {task_id} was modified by someone else since it was last read.")
+    self.task_id = task_id
+    self.current = current
+
+
 class GoogleTask:
 
-  def __init__(self):
-    """Shows basic usage of the Tasks API.
-    Prints the title and ID of the first 10 task lists.
+  def __init__(
+      self,
+      mirror_factory: Callable[[str], TaskMirror] | None = None,
+      use_etags: bool = True,
+      pool_size: int = 10,
+      pool_timeout: float = 30.0,
+      credentials: Credentials | None = None,
+      interactive: bool = True,
+      http_factory: Callable[[], object] | None = None,
+      scheduler: RequestScheduler | None = None,
+      single_flight: SingleFlight | None = None,
+      on_credentials_refresh: Callable[[Credentials], None] | None = None,
+  ):
+    """Client for one Google account.
+
+    Without ``credentials`` the account comes from ``token.json``; when that
+    is missing or unusable the browser login runs only if ``interactive``,
+    otherwise ``AuthorizationRequiredError`` is raised. ``http_factory``
+    replaces the ``httplib2.Http`` transport of pooled connections.
+    ``scheduler`` rate-limits and retries every API call; share one across
+    clients so they stay within the project quota together.
+    ``single_flight`` lets identical concurrent task reads of this account
+    share one API call; any write drops the results it keeps.
+    ``on_credentials_refresh`` receives the credentials after every token
+    refresh, including the ones made while sending a request.
     """
+    creds = credentials if credentials is not None else self.__loadTokenFile(interactive)
+    # Imported here: googleapiclient.discovery is slow to import and only needed once.
+    from googleapiclient.discovery import build
+
+    # The discovery document ships with the client library; no network round trip.
+    self.__service = build("tasks", "v1", credentials=creds, static_discovery=True)
+    # httplib2 connections are not thread-safe: every request borrows one from the pool.
+    pool_options = {"http_factory": http_factory} if http_factory is not None else {}
+    self.__pool = HttpPool(
+        creds,
+        max_size=pool_size,
+        acquire_timeout=pool_timeout,
+        on_refresh=on_credentials_refresh,
+        **pool_options,
+    )
+    self.__scheduler = scheduler
+    self.__singleFlight = single_flight
+    # One mirror per task list, created on first use ("@default" is its own key).
+    self.__mirrorFactory = mirror_factory
+    self.__mirrors: dict[str, TaskMirror] = {}
+    self.__mirrorsLock = threading.Lock()
+    self.__taskLists: list[dict] | None = None
+    self.__taskListsAt = 0.0
+    self.__defaultListId: str | None = None
+    # Fan-out across task lists; each request still borrows a pooled connection.
+    self.__fanout = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="google-tasks-fanout")
+    # Search index over every list, rebuilt only when a mirror version moves.
+    self.__index: TaskIndex | None = None
+    self.__indexVersion: int | None = None
+    # Last version of each task seen, so updates can send If-Match with its etag.
+    self.__useEtags = use_etags
+    self.__lastRead: dict[tuple[str, str], dict] = {}
+    self.__lastReadLock = threading.Lock()
+
+  @staticmethod
+  def __loadTokenFile(interactive: bool) -> Credentials:
     creds = None
     if os.path.exists("token.json"):
       creds = Credentials.from_authorized_user_file("token.json", SCOPES)
@@ -31,6 +132,10 @@ class GoogleTask:
       else:
         creds = None
       if not creds:
+        if not interactive:
+          raise AuthorizationRequiredError("token.json is missing or expired and interactive login is disabled.")
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         flow = InstalledAppFlow.from_client_secrets_file(
             "credentials.json", SCOPES
         )
@@ -38,12 +143,11 @@ class GoogleTask:
       # Save the credentials for the next run
       with open("token.json", "w") as token:
         token.write(creds.to_json())
-    self.__service = build("tasks", "v1", credentials=creds)
+    return creds
 
-  def getTasks(self) -> None:
+  def getTasks(self, limit: int | None = None) -> list[dict] | None:
     try:
-      result = self.__service.tasks().list(tasklist="@default").execute()
-      items = result.get("items", [])
+      items = self.__readTasks(limit=limit)
 
       if not items:
         print("No task lists found.")
@@ -53,6 +157,287 @@ class GoogleTask:
     except HttpError as error:
       print(f"An error occurred: {error}")
 
+  def iterTasks(
+      self,
+      tasklist: str = "@default",
+      limit: int | None = None,
+      fields: str = TASK_FIELDS,
+      **params,
+  ) -> Iterator[dict]:
+    """Stream tasks page by page, stopping as soon as ``limit`` is reached.
+
+    Extra keyword arguments are forwarded to ``tasks().list`` (e.g.
+    ``updatedMin``, ``showDeleted``, ``showHidden``).
+    """
+    yielded = 0
+    page_token = None
+    while limit is None or yielded < limit:
+      page_size = MAX_PAGE_SIZE if limit is None else min(MAX_PAGE_SIZE, limit - yielded)
+      result = self.__execute(
+          self.__service.tasks().list(
+              tasklist=tasklist,
+              maxResults=page_size,
+              pageToken=page_token,
+              fields=f"nextPageToken,items({fields})",
+              **params,
+          )
+      )
+      for item in result.get("items", []):
+        self.__remember(tasklist, item)
+        yield item
+        yielded += 1
+        if limit is not None and yielded >= limit:
+          return
+      page_token = result.get("nextPageToken")
+      if not page_token:
+        return
+
+  def getCachedTasks(self, limit: int | None = None, tasklist: str = "@default") -> list[dict] | None:
+    """Serve tasks from the local mirror, syncing incrementally when stale."""
+    mirror = self.__mirrorFor(tasklist)
+    if mirror is None:
+      try:
+        return self.__readTasks(tasklist=tasklist, limit=limit) or None
+      except HttpError as error:
+        print(f"An error occurred while listing tasks of {tasklist}: {error}")
+        return None
+    try:
+      tasks = mirror.refresh(lambda updated_min: self.__listChanges(updated_min, tasklist))
+    except HttpError as error:
+      print(f"An error occurred while syncing tasks: {error}")
+      # A stale snapshot is more useful to the agent than no snapshot at all.
+      tasks = mirror.tasks()
+    return tasks[:limit] or None
+
+  def getTaskLists(self) -> list[dict] | None:
+    """Every task list of the account (id, title), the default one first."""
+    with self.__mirrorsLock:
+      if self.__taskLists is not None and time.monotonic() - self.__taskListsAt < TASKLISTS_TTL_SECONDS:
+        return self.__taskLists
+    try:
+      if self.__singleFlight is None:
+        task_lists = self.__fetchTaskLists()
+      else:
+        task_lists = list(self.__singleFlight.do((self, "tasklists.list"), self.__fetchTaskLists))
+    except HttpError as error:
+      print(f"An error occurred while listing task lists: {error}")
+      return None
+    task_lists.sort(key=lambda task_list: task_list["id"] != self.__defaultListId)
+    with self.__mirrorsLock:
+      self.__taskLists = task_lists
+      self.__taskListsAt = time.monotonic()
+    return task_lists
+
+  def __fetchTaskLists(self) -> list[dict]:
+    task_lists = []
+    page_token = None
+    while True:
+      result = self.__execute(
+          self.__service.tasklists().list(
+              maxResults=MAX_PAGE_SIZE,
+              pageToken=page_token,
+              fields=f"nextPageToken,items({TASKLIST_FIELDS})",
+          )
+      )
+      task_lists.extend(result.get("items", []))
+      page_token = result.get("nextPageToken")
+      if not page_token:
+        break
+    if self.__defaultListId is None:
+      default = self.__execute(self.__service.tasklists().get(tasklist="@default", fields="id"))
+      self.__defaultListId = default["id"]
+    return task_lists
+
+  def getAllTasks(self, limit: int | None = None) -> list[dict] | None:
+    """Tasks of every list, fetched concurrently.
+
+    Returns one entry per list: ``{"id", "title", "tasks"}`` with at most
+    ``limit`` tasks each. Lists that fail to load come back with no tasks.
+    """
+    task_lists = self.getTaskLists()
+    if task_lists is None:
+      return None
+    futures = [
+        self.__fanOut(self.getCachedTasks, limit, self.__listKey(task_list["id"]))
+        for task_list in task_lists
+    ]
+    return [
+        {"id": task_list["id"], "title": task_list.get("title"), "tasks": future.result() or []}
+        for task_list, future in zip(task_lists, futures)
+    ]
+
+  def listsAreLocal(self) -> bool:
+    """Whether getAllTasks() would be answered from fresh mirrors, with no API call."""
+    if self.__mirrorFactory is None:
+      return False
+    with self.__mirrorsLock:
+      if self.__taskLists is None or time.monotonic() - self.__taskListsAt >= TASKLISTS_TTL_SECONDS:
+        return False
+      mirrors = [self.__mirrors.get(self.__listKey(task_list["id"])) for task_list in self.__taskLists]
+    return all(mirror is not None and not mirror.is_stale() for mirror in mirrors)
+
+  def getTasksVersion(self) -> int | None:
+    """Combined version of every mirrored list, or None unless all of them are fresh.
+
+    Never syncs: a caller that needs the data calls getAllTasks() itself.
+    """
+    if not self.listsAreLocal():
+      return None
+    return self.__mirrorsVersion()
+
+  def searchTasks(
+      self,
+      query: str | None = None,
+      status: str | None = None,
+      due_from: str | None = None,
+      due_to: str | None = None,
+      updated_after: str | None = None,
+      tasklist: str | None = None,
+      limit: int = 10,
+  ) -> tuple[list[tuple[str, dict, float]], int] | None:
+    """Search the tasks of every list; see ``TaskIndex.search``.
+
+    With mirrors the index is reused until a list changes; without them every
+    search re-reads the lists and indexes them afresh.
+    """
+    task_lists = self.getAllTasks()
+    if task_lists is None:
+      return None
+    version = self.__mirrorsVersion() if self.__mirrorFactory is not None else None
+    with self.__mirrorsLock:
+      index = self.__index if version is not None and version == self.__indexVersion else None
+    if index is None:
+      index = TaskIndex([(task_list["id"], task) for task_list in task_lists for task in task_list["tasks"]])
+      with self.__mirrorsLock:
+        self.__index, self.__indexVersion = index, version
+    return index.search(query, status, due_from, due_to, updated_after, tasklist, limit)
+
+  def close(self) -> None:
+    """Release the fan-out threads and pooled connections; for clients dropped from a cache.
+
+    Requests still running on this client finish, with list fan-out done inline.
+    """
+    self.__fanout.shutdown(wait=False)
+    self.__pool.close()
+
+  def poolStats(self) -> dict:
+    return self.__pool.stats()
+
+  def refreshCredentials(self, margin: float = 0.0) -> bool:
+    """Refresh the access token if it expires within ``margin`` seconds."""
+    return self.__pool.refresh_credentials(margin)
+
+  def schedulerStats(self) -> dict:
+    return self.__scheduler.stats() if self.__scheduler is not None else {}
+
+  def singleFlightStats(self) -> dict:
+    return self.__singleFlight.stats() if self.__singleFlight is not None else {}
+
+  def __fanOut(self, func: Callable, *args) -> Future:
+    # Each call gets a copy of the caller's context, so the request deadline still applies.
+    try:
+      return self.__fanout.submit(copy_context().run, func, *args)
+    except RuntimeError:
+      # Closed client still serving a request that got it before close().
+      future = Future()
+      try:
+        future.set_result(func(*args))
+      except Exception as error:
+        future.set_exception(error)
+      return future
+
+  def __execute(self, request, cost: int = 1):
+    # Batches have no methodId; their sub-requests are not timed separately.
+    method = getattr(request, "methodId", None) or "batch"
+    if self.__singleFlight is not None and retry_class_for(method) != READ:
+      # Reads shared from before this write would hide it.
+      self.__singleFlight.forget(self)
+    if self.__scheduler is None:
+      return self.__send(request, method)
+    return self.__scheduler.run(method, lambda: self.__send(request, method), cost)
+
+  def __send(self, request, method: str):
+    # One attempt: a scheduler retry is timed (and counted as an error) on its own.
+    left = time_left()
+    if left is not None and left <= 0:
+      raise DeadlineExceeded(f"Request deadline passed before {method} could be sent.")
+    in_flight = IN_FLIGHT.labels("google_api", method)
+    status = "ok"
+    started = time.perf_counter()
+    in_flight.inc()
+    try:
+      # Under a request deadline, a slow response fails instead of outliving the request.
+      with self.__pool.connection(timeout=left) as http:
+        return request.execute(http=http)
+    except HttpError as error:
+      status = str(error.resp.status)
+      raise
+    except Exception:
+      status = "error"
+      raise
+    finally:
+      in_flight.dec()
+      GOOGLE_API_DURATION.labels(method, status).observe(time.perf_counter() - started)
+      if status != "ok":
+        ERRORS.labels("google_api", method).inc()
+
+  def __mirrorsVersion(self) -> int:
+    with self.__mirrorsLock:
+      return hash(tuple(sorted((key, mirror.version) for key, mirror in self.__mirrors.items())))
+
+  def __remember(self, tasklist: str, task: dict) -> None:
+    if not self.__useEtags or "id" not in task:
+      return
+    tasklist = self.__listKey(tasklist)
+    with self.__lastReadLock:
+      if task.get("deleted") or not task.get("etag"):
+        self.__lastRead.pop((tasklist, task["id"]), None)
+      else:
+        self.__lastRead[(tasklist, task["id"])] = task
+
+  def __forget(self, tasklist: str, task_id: str) -> None:
+    tasklist = self.__listKey(tasklist)
+    with self.__lastReadLock:
+      self.__lastRead.pop((tasklist, task_id), None)
+
+  def __listKey(self, tasklist: str) -> str:
+    # The default list answers to "@default" and to its id; keep one mirror for both.
+    return "@default" if tasklist == self.__defaultListId else tasklist
+
+  def __mirrorFor(self, tasklist: str) -> TaskMirror | None:
+    if self.__mirrorFactory is None:
+      return None
+    key = self.__listKey(tasklist)
+    with self.__mirrorsLock:
+      mirror = self.__mirrors.get(key)
+      if mirror is None:
+        mirror = self.__mirrors[key] = self.__mirrorFactory(key)
+      return mirror
+
+  def __listChanges(self, updated_min: str | None, tasklist: str = "@default") -> list[dict]:
+    params = {"showHidden": True}
+    if updated_min is not None:
+      params["updatedMin"] = updated_min
+      params["showDeleted"] = True
+    return self.__readTasks(tasklist=tasklist, fields=MIRROR_TASK_FIELDS, **params)
+
+  def __readTasks(
+      self,
+      tasklist: str = "@default",
+      limit: int | None = None,
+      fields: str = TASK_FIELDS,
+      **params,
+  ) -> list[dict]:
+    """``list(iterTasks(...))``, shared with identical reads of this account already in flight."""
+    if self.__singleFlight is None:
+      return list(self.iterTasks(tasklist=tasklist, limit=limit, fields=fields, **params))
+    key = (self, "tasks.list", self.__listKey(tasklist), limit, fields, tuple(sorted(params.items())))
+    tasks = self.__singleFlight.do(
+        key, lambda: list(self.iterTasks(tasklist=tasklist, limit=limit, fields=fields, **params))
+    )
+    # A copy per caller: the task dicts are shared, the list is theirs to slice or extend.
+    return list(tasks)
+
   def createTask(
       self,
       title: str,
@@ -70,10 +455,14 @@ class GoogleTask:
       if status is not None:
         task_body["status"] = status
 
-      created_task = (
-          self.__service.tasks().insert(tasklist=tasklist, body=task_body).execute()
+      created_task = self.__execute(
+          self.__service.tasks().insert(tasklist=tasklist, body=task_body)
       )
       print(f"Task created: {created_task['title']} ({created_task['id']})")
+      self.__remember(tasklist, created_task)
+      mirror = self.__mirrorFor(tasklist)
+      if mirror is not None:
+        mirror.upsert(created_task)
       return created_task
     except HttpError as error:
       print(f"An error occurred while creating task '{title}': {error}")
@@ -88,38 +477,215 @@ class GoogleTask:
       due: str | None = None,
       tasklist: str = "@default",
   ) -> dict | None:
-    try:
-      task = self.__service.tasks().get(tasklist=tasklist, task=task_id).execute()
+    """Patch only the given fields in a single round trip.
 
-      if title is not None:
-        task["title"] = title
-      if notes is not None:
-        task["notes"] = notes
-      if status is not None:
-        task["status"] = status
-      if due is not None:
-        task["due"] = due
-
-      updated_task = (
-          self.__service.tasks()
-          .update(tasklist=tasklist, task=task_id, body=task)
-          .execute()
-      )
+    When the task was read before, the patch carries ``If-Match`` with that
+    etag. On a 412 the task is re-read: if it already holds the new values
+    nothing is sent, if none of the fields being changed moved remotely the
+    patch is retried once, otherwise ``TaskConflictError`` is raised with the
+    current task.
+    """
+    changes = dict(zip(UPDATABLE_FIELDS, (title, notes, status, due)))
+    changes = {field: value for field, value in changes.items() if value is not None}
+    with self.__lastReadLock:
+      last_read = self.__lastRead.get((self.__listKey(tasklist), task_id))
+    try:
+      try:
+        updated_task = self.__patch(tasklist, task_id, changes, last_read)
+      except HttpError as error:
+        if error.resp.status != 412 or last_read is None:
+          raise
+        updated_task = self.__resolveStale(tasklist, task_id, changes, last_read, error)
       print(f"Task updated: {updated_task['title']} ({updated_task['id']})")
+      self.__remember(tasklist, updated_task)
+      mirror = self.__mirrorFor(tasklist)
+      if mirror is not None:
+        mirror.upsert(updated_task)
       return updated_task
     except HttpError as error:
       print(f"An error occurred while updating task {task_id}: {error}")
       return None
 
+  def __resolveStale(
+      self,
+      tasklist: str,
+      task_id: str,
+      changes: dict,
+      last_read: dict,
+      error: HttpError,
+  ) -> dict:
+    """Settle a patch refused with 412: re-read the task and retry it once if no changed field moved."""
+    current = self.__execute(
+        self.__service.tasks().get(tasklist=tasklist, task=task_id, fields=TASK_FIELDS)
+    )
+    self.__remember(tasklist, current)
+    if all(current.get(field) == value for field, value in changes.items()):
+      # Already applied, e.g. by a retried patch whose first response was lost.
+      return current
+    if any(current.get(field) != last_read.get(field) for field in changes):
+      raise TaskConflictError(task_id, current) from error
+    try:
+      return self.__patch(tasklist, task_id, changes, current)
+    except HttpError as retry_error:
+      if retry_error.resp.status == 412:
+        raise TaskConflictError(task_id) from retry_error
+      raise
+
+  @staticmethod
+  def __changes(update: dict) -> dict:
+    """The fields of a batch update item that are actually being set."""
+    return {key: update[key] for key in UPDATABLE_FIELDS if update.get(key) is not None}
+
+  def __patch(self, tasklist: str, task_id: str, changes: dict, last_read: dict | None) -> dict:
+    request = self.__service.tasks().patch(tasklist=tasklist, task=task_id, body=changes)
+    if self.__useEtags and last_read is not None and last_read.get("etag"):
+      request.headers["If-Match"] = last_read["etag"]
+    return self.__execute(request)
+
   def deleteTask(self, task_id: str, tasklist: str = "@default") -> bool:
     try:
-      self.__service.tasks().delete(tasklist=tasklist, task=task_id).execute()
+      self.__execute(self.__service.tasks().delete(tasklist=tasklist, task=task_id))
       print(f"Task deleted: {task_id}")
+      self.__forget(tasklist, task_id)
+      mirror = self.__mirrorFor(tasklist)
+      if mirror is not None:
+        mirror.remove(task_id)
       return True
     except HttpError as error:
       print(f"An error occurred while deleting task {task_id}: {error}")
       return False
 
+  def batchCreateTasks(self, tasks: list[dict], tasklist: str = "@default") -> list[dict | None]:
+    """Create many tasks in one batch request.
+
+    Each item accepts ``title``, ``notes``, ``due`` and ``status``. Returns the
+    created task, or ``None`` when that item failed, in input order.
+    """
+    requests = [
+        self.__service.tasks().insert(
+            tasklist=tasklist,
+            body={key: task[key] for key in ("title", "notes", "due", "status") if task.get(key) is not None},
+        )
+        for task in tasks
+    ]
+    results = []
+    mirror = self.__mirrorFor(tasklist)
+    for task, (created_task, error) in zip(tasks, self.__executeBatch(requests)):
+      if error is not None:
+        print(f"An error occurred while creating task '{task.get('title')}': {error}")
+        results.append(None)
+        continue
+      print(f"Task created: {created_task['title']} ({created_task['id']})")
+      self.__remember(tasklist, created_task)
+      if mirror is not None:
+        mirror.upsert(created_task)
+      results.append(created_task)
+    return results
+
+  def batchUpdateTasks(
+      self,
+      updates: list[dict],
+      tasklist: str = "@default",
+      check_etags: bool = False,
+  ) -> list[dict | TaskConflictError | None]:
+    """Patch many tasks in one batch request.
+
+    Each item carries ``task_id`` plus any of ``title``, ``notes``, ``status``
+    and ``due``; only the given fields are sent. With ``check_etags`` each
+    patch carries ``If-Match`` like ``updateTask`` does, and an item refused
+    with 412 is settled the same way: re-read, retried once when none of its
+    fields moved, or returned as a ``TaskConflictError``. Returns the updated
+    task, the conflict, or ``None`` when that item failed, in input order.
+    """
+    requests = []
+    last_reads = []
+    for update in updates:
+      last_read = None
+      if check_etags:
+        with self.__lastReadLock:
+          last_read = self.__lastRead.get((self.__listKey(tasklist), update["task_id"]))
+      request = self.__service.tasks().patch(
+          tasklist=tasklist,
+          task=update["task_id"],
+          body=self.__changes(update),
+      )
+      if self.__useEtags and last_read is not None and last_read.get("etag"):
+        request.headers["If-Match"] = last_read["etag"]
+      requests.append(request)
+      last_reads.append(last_read)
+    results = []
+    mirror = self.__mirrorFor(tasklist)
+    for update, last_read, (updated_task, error) in zip(updates, last_reads, self.__executeBatch(requests)):
+      if error is not None and error.resp.status == 412 and last_read is not None:
+        # Only stale etags get another round trip; other failures are final.
+        try:
+          updated_task = self.__resolveStale(tasklist, update["task_id"], self.__changes(update), last_read, error)
+          error = None
+        except TaskConflictError as conflict:
+          results.append(conflict)
+          continue
+        except HttpError as retry_error:
+          error = retry_error
+      if error is not None:
+        print(f"An error occurred while updating task {update['task_id']}: {error}")
+        results.append(None)
+        continue
+      print(f"Task updated: {updated_task['title']} ({updated_task['id']})")
+      self.__remember(tasklist, updated_task)
+      if mirror is not None:
+        mirror.upsert(updated_task)
+      results.append(updated_task)
+    return results
+
+  def batchDeleteTasks(self, task_ids: list[str], tasklist: str = "@default") -> list[bool]:
+    """Delete many tasks in one batch request, returning per-item success."""
+    requests = [self.__service.tasks().delete(tasklist=tasklist, task=task_id) for task_id in task_ids]
+    results = []
+    mirror = self.__mirrorFor(tasklist)
+    for task_id, (_, error) in zip(task_ids, self.__executeBatch(requests)):
+      if error is not None:
+        print(f"An error occurred while deleting task {task_id}: {error}")
+        results.append(False)
+        continue
+      print(f"Task deleted: {task_id}")
+      self.__forget(tasklist, task_id)
+      if mirror is not None:
+        mirror.remove(task_id)
+      results.append(True)
+    return results
+
+  def __executeBatch(self, requests: list) -> list[tuple[dict | None, HttpError | None]]:
+    """Send requests as multipart batches and collect (response, error) pairs in order."""
+    results: list[tuple[dict | None, HttpError | None]] = [(None, None)] * len(requests)
+
+    def collect(request_id: str, response: dict | None, exception: HttpError | None) -> None:
+      results[int(request_id)] = (response, exception)
+
+    for start in range(0, len(requests), MAX_BATCH_SIZE):
+      pending = list(range(start, min(start + MAX_BATCH_SIZE, len(requests))))
+      attempt = 1
+      while pending:
+        batch = self.__service.new_batch_http_request(callback=collect)
+        for index in pending:
+          batch.add(requests[index], request_id=str(index))
+        try:
+          # Every operation in a batch counts against the quota.
+          self.__execute(batch, cost=len(pending))
+        except HttpError as error:
+          for index in pending:
+            results[index] = (None, error)
+          break
+        if self.__scheduler is None:
+          break
+        # Parts fail on their own inside a 200 batch; throttled ones go out again.
+        failed = [index for index in pending if results[index][1] is not None]
+        retry = self.__scheduler.retry_batch_items(
+            [(requests[index].methodId, results[index][1]) for index in failed], attempt
+        )
+        pending = [failed[position] for position in retry]
+        attempt += 1
+    return results
+
 # if __name__ == "__main__":
 #   task = GoogleTask()
 #   task.getTasks()
@@ -0,0 +1,189 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from typing import Any
+
+import httplib2
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+
+from src.services.GoogleTasks.requestScheduler import time_left
+
+
+class HttpPoolTimeout(Exception):
+    """No connection became available within the pool's acquire timeout (or the request deadline)."""
+
+
+def _set_timeout(http: AuthorizedHttp, timeout: float | None) -> None:
+    # httplib2 hands its timeout only to connections it opens; update the open ones too.
+    transport = http.http
+    transport.timeout = timeout
+    for connection in getattr(transport, "connections", {}).values():
+        connection.timeout = timeout
+        if getattr(connection, "sock", None) is not None:
+            connection.sock.settimeout(timeout)
+
+
+class HttpPool:
+    """Bounded pool of authorized ``httplib2`` connections sharing one credential.
+
+    ``httplib2.Http`` is not thread-safe, so each connection is handed to one
+    thread at a time. Idle connections are reused most-recently-released
+    first, which keeps their TLS sessions warm. The shared credential is
+    refreshed behind a lock so concurrent requests never refresh it twice.
+    ``on_refresh`` receives the credential whenever its token changed, whether
+    the pool refreshed it or a connection did after a 401.
+    """
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        max_size: int = 10,
+        acquire_timeout: float = 30.0,
+        http_factory: Callable[[], httplib2.Http] = httplib2.Http,
+        on_refresh: Callable[[Credentials], None] | None = None,
+    ) -> None:
+        """``http_factory`` builds the transport wrapped by each connection (e.g. an in-process fake)."""
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._credentials = credentials
+        self._http_factory = http_factory
+        self._on_refresh = on_refresh
+        self._token = credentials.token
+        self._refresh_lock = threading.Lock()
+        self._idle: queue.LifoQueue[AuthorizedHttp] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._in_use = 0
+        self._acquired = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+        self._refreshes = 0
+        self._closed = False
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[AuthorizedHttp]:
+        """Borrow a connection, blocking up to ``acquire_timeout`` when all are busy.
+
+        The wait never outlasts the current request deadline (``within_deadline``).
+
+        ``timeout`` bounds each socket operation of the requests sent on it;
+        None waits as long as the server takes.
+        """
+        self._ensure_fresh_credentials()
+        http = self._acquire()
+        _set_timeout(http, timeout)
+        try:
+            yield http
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                closed = self._closed
+            # AuthorizedHttp refreshes the shared credential itself on a 401.
+            self._notify_if_refreshed()
+            if closed:
+                # Borrowed before close(): not worth keeping for anyone.
+                http.http.close()
+            else:
+                self._idle.put(http)
+
+    def close(self) -> None:
+        """Close the idle connections; borrowed ones are closed when they come back."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                http = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            http.http.close()
+
+    def _acquire(self) -> AuthorizedHttp:
+        try:
+            http = self._idle.get_nowait()
+        except queue.Empty:
+            http = self._create()
+            if http is None:
+                started = time.monotonic()
+                wait = self.acquire_timeout
+                left = time_left()
+                if left is not None:
+                    wait = max(0.0, min(wait, left))
+                try:
+                    http = self._idle.get(timeout=wait)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise HttpPoolTimeout(
+                        f"No Google Tasks connection available after {wait:g}s "
+                        f"({self.max_size} in use"
+                        f"{', request deadline reached' if wait < self.acquire_timeout else ''})."
+                    ) from None
+                with self._lock:
+                    self._waits += 1
+                    self._wait_seconds += time.monotonic() - started
+        with self._lock:
+            self._in_use += 1
+            self._acquired += 1
+        return http
+
+    def _create(self) -> AuthorizedHttp | None:
+        with self._lock:
+            if self._size >= self.max_size:
+                return None
+            self._size += 1
+        return AuthorizedHttp(self._credentials, http=self._http_factory())
+
+    def _ensure_fresh_credentials(self) -> None:
+        if not self._credentials.valid:
+            self.refresh_credentials()
+
+    def refresh_credentials(self, margin: float = 0.0) -> bool:
+        """Refresh the shared credential if it expires within ``margin`` seconds.
+
+        Returns True when a refresh happened.
+        """
+        with self._refresh_lock:
+            if self._credentials.valid and not self._expires_within(margin):
+                return False
+            self._credentials.refresh(Request())
+            with self._lock:
+                self._refreshes += 1
+        self._notify_if_refreshed()
+        return True
+
+    def _notify_if_refreshed(self) -> None:
+        with self._lock:
+            token = self._credentials.token
+            if token == self._token:
+                return
+            self._token = token
+        if self._on_refresh is not None:
+            self._on_refresh(self._credentials)
+
+    def _expires_within(self, margin: float) -> bool:
+        expiry = self._credentials.expiry
+        if expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime.
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return expiry - now <= timedelta(seconds=margin)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": self._size - self._in_use,
+                "acquired": self._acquired,
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 3),
+                "timeouts": self._timeouts,
+                "credential_refreshes": self._refreshes,
+            }
@@ -0,0 +1,293 @@
+import random
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import TypeVar
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from src.metrics import GOOGLE_API_RETRIES
+
+T = TypeVar("T")
+
+# Retry classes: reads can always be repeated; idempotent writes leave the same
+# state when applied twice; other writes (insert, move, batches) may not.
+READ = "read"
+IDEMPOTENT_WRITE = "idempotent_write"
+WRITE = "write"
+RETRY_CLASSES = {
+    "tasks.tasks.list": READ,
+    "tasks.tasks.get": READ,
+    "tasks.tasklists.list": READ,
+    "tasks.tasklists.get": READ,
+    "tasks.tasks.patch": IDEMPOTENT_WRITE,
+    "tasks.tasks.update": IDEMPOTENT_WRITE,
+    "tasks.tasks.delete": IDEMPOTENT_WRITE,
+}
+SERVER_ERRORS = frozenset({500, 502, 503, 504})
+# Google reports per-user and per-project rate limits as 403 with these reasons.
+RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+TRANSPORT_ERRORS = (TimeoutError, ConnectionError, socket.timeout, httplib2.HttpLib2Error)
+
+# Epoch seconds by which the request being served must answer; API calls made
+# under it never wait, retry or block on a socket past that instant.
+current_deadline: ContextVar[float | None] = ContextVar("current_deadline", default=None)
+
+
+class RateLimitTimeout(Exception):
+    """No quota token became available within the scheduler's acquire timeout."""
+
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed before this API call could be sent."""
+
+
+@contextmanager
+def within_deadline(deadline: float | None) -> Iterator[None]:
+    """Bound the API calls made inside the block by ``deadline`` (epoch seconds)."""
+    token = current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+def time_left() -> float | None:
+    """Seconds until the current deadline, or None when there is none."""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def retry_class_for(method: str) -> str:
+    return RETRY_CLASSES.get(method, WRITE)
+
+
+def _is_rate_limited(error: HttpError) -> bool:
+    if error.resp.status == 429:
+        return True
+    if error.resp.status != 403 or not isinstance(error.error_details, list):
+        return False
+    return any(isinstance(detail, dict) and detail.get("reason") in RATE_LIMIT_REASONS for detail in error.error_details)
+
+
+def retry_reason(retry_class: str, error: Exception) -> str | None:
+    """Why ``error`` may be retried for an operation of ``retry_class``, or None.
+
+    Rate-limited requests were rejected before running, so any operation may
+    be sent again. Server errors and broken connections leave the outcome
+    unknown: only operations that are safe to apply twice are retried.
+    """
+    if isinstance(error, HttpError):
+        if _is_rate_limited(error):
+            return "rate_limited"
+        if error.resp.status in SERVER_ERRORS and retry_class != WRITE:
+            return "server_error"
+        return None
+    if isinstance(error, TRANSPORT_ERRORS) and retry_class != WRITE:
+        return "transport"
+    return None
+
+
+def retry_after(error: Exception) -> float | None:
+    """Seconds requested by the ``Retry-After`` header, if the response has one."""
+    if not isinstance(error, HttpError):
+        return None
+    value = error.resp.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``burst``.
+
+    ``pause`` stops every caller until a cooldown ends, so one 429 slows the
+    whole process down instead of each request discovering the limit alone.
+    A ``rate`` of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def acquire(self, cost: float = 1.0, timeout: float | None = None) -> float:
+        """Take ``cost`` tokens, waiting for them; returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        # A batch larger than the bucket could never run otherwise.
+        cost = min(cost, self.burst)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                else:
+                    wait = (cost - self._tokens) / self.rate
+            if timeout is not None and waited + wait > timeout:
+                raise RateLimitTimeout(f"No Google Tasks quota available within {timeout}s.")
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def available(self) -> float:
+        with self._lock:
+            elapsed = time.monotonic() - self._refilled_at
+            return min(self.burst, self._tokens + elapsed * self.rate)
+
+
+class RequestScheduler:
+    """Shared gate for Google Tasks API calls: quota limiter plus retry policy.
+
+    Every attempt takes ``cost`` tokens from a bucket sized to the project
+    quota. Failures are retried by retry class (see ``retry_reason``) with
+    exponential backoff and full jitter, capped at ``max_delay``; a
+    ``Retry-After`` header sets the minimum wait. A rate-limited response
+    pauses the bucket for every caller. Nothing waits or retries past the
+    current request's deadline (``within_deadline``). One scheduler is meant to be shared
+    by all clients of the process, since the quota is per project.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: float | None = None,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 32.0,
+        acquire_timeout: float | None = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.acquire_timeout = acquire_timeout
+        self._bucket = TokenBucket(rate, burst)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._throttled = 0
+        self._throttle_seconds = 0.0
+        self._retries: dict[str, int] = {}
+        self._given_up = 0
+        self._backoff_seconds = 0.0
+
+    def run(self, method: str, send: Callable[[], T], cost: float = 1.0) -> T:
+        """Call ``send`` within the quota, retrying it as ``method``'s retry class allows."""
+        retry_class = retry_class_for(method)
+        attempt = 1
+        while True:
+            left = time_left()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"Request deadline passed before {method} could be sent.")
+            timeout = self.acquire_timeout
+            if left is not None:
+                timeout = left if timeout is None else min(timeout, left)
+            waited = self._bucket.acquire(cost, timeout)
+            with self._lock:
+                self._requests += 1
+                if waited > 0:
+                    self._throttled += 1
+                    self._throttle_seconds += waited
+            try:
+                return send()
+            except Exception as error:
+                reason = retry_reason(retry_class, error)
+                if reason is None:
+                    raise
+                delay = self.backoff(attempt, retry_after(error))
+                left = time_left()
+                if attempt >= self.max_attempts or (left is not None and delay >= left):
+                    with self._lock:
+                        self._given_up += 1
+                    raise
+                if reason == "rate_limited":
+                    self._bucket.pause(delay)
+                with self._lock:
+                    self._retries[reason] = self._retries.get(reason, 0) + 1
+                    self._backoff_seconds += delay
+                GOOGLE_API_RETRIES.labels(method, reason).inc()
+                self._sleep(delay)
+                attempt += 1
+
+    def retry_batch_items(self, failures: list[tuple[str, Exception]], attempt: int) -> list[int]:
+        """Positions of the failed batch sub-requests to send again, after waiting for them.
+
+        A batch answers 200 even when its parts fail, so ``run`` never sees a
+        part's 429. ``failures`` pairs each failed part's method with its
+        error; parts are picked by their own retry class, the wait honours the
+        longest ``Retry-After`` and a rate limit pauses the bucket as in
+        ``run``. Returns nothing (without waiting) once ``attempt`` reaches
+        ``max_attempts`` or the wait would outlast the request's deadline.
+        """
+        retryable = [
+            (position, method, reason, error)
+            for position, (method, error) in enumerate(failures)
+            if (reason := retry_reason(retry_class_for(method), error)) is not None
+        ]
+        if not retryable:
+            return []
+        hints = [hint for _, _, _, error in retryable if (hint := retry_after(error)) is not None]
+        delay = self.backoff(attempt, max(hints) if hints else None)
+        left = time_left()
+        if attempt >= self.max_attempts or (left is not None and delay >= left):
+            with self._lock:
+                self._given_up += len(retryable)
+            return []
+        if any(reason == "rate_limited" for _, _, reason, _ in retryable):
+            self._bucket.pause(delay)
+        with self._lock:
+            for _, _, reason, _ in retryable:
+                self._retries[reason] = self._retries.get(reason, 0) + 1
+            self._backoff_seconds += delay
+        for _, method, reason, _ in retryable:
+            GOOGLE_API_RETRIES.labels(method, reason).inc()
+        self._sleep(delay)
+        return [position for position, _, _, _ in retryable]
+
+    def backoff(self, attempt: int, retry_after_seconds: float | None = None) -> float:
+        """Delay before retry number ``attempt`` (1-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after_seconds is not None:
+            # The server's hint is a floor; the jitter spreads callers released together.
+            delay = min(self.max_delay, retry_after_seconds) + random.uniform(0, self.base_delay)
+        return delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self._bucket.rate,
+                "burst": self._bucket.burst,
+                "tokens_available": round(self._bucket.available(), 2) if self._bucket.rate > 0 else None,
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "throttle_seconds": round(self._throttle_seconds, 3),
+                "retries": dict(self._retries),
+                "given_up": self._given_up,
+                "backoff_seconds": round(self._backoff_seconds, 3),
+            }
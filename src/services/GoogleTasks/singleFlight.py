@@ -0,0 +1,126 @@
+import threading
+import time
+import weakref
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import TypeVar
+
+from src.services.GoogleTasks.requestScheduler import DeadlineExceeded, time_left
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs one call per key at a time and hands its result to every caller.
+
+    A caller that finds a call with the same key in flight waits for it
+    instead of starting another; a successful result is also handed out for
+    ``window`` seconds after it arrived, so callers landing just behind the
+    burst share it as well; a kept result is dropped once its window
+    passes, even if no other call comes in. Failures are only shared with callers that were
+    already waiting. ``forget`` drops the results kept for one owner (e.g.
+    after it wrote), so reads issued after a write never see older data.
+
+    Keys start with an owner (the client, i.e. the account) followed by
+    whatever makes two calls interchangeable. One instance can be shared by
+    every client, so ``stats`` covers the whole process.
+    """
+
+    def __init__(self, window: float = 0.0) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._flights: dict[tuple[int, Hashable], Future] = {}
+        self._results: dict[Hashable, tuple[float, object]] = {}
+        self._expiry: threading.Timer | None = None
+        # Bumped by forget: calls started before it are neither joined nor kept.
+        self._generations: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._calls = 0
+        self._upstream = 0
+        self._shared_in_flight = 0
+        self._shared_window = 0
+
+    def do(self, key: tuple, call: Callable[[], T]) -> T:
+        """Result of ``call``, or of an identical call already in flight or just finished."""
+        now = time.monotonic()
+        with self._lock:
+            self._calls += 1
+            kept = self._results.get(key)
+            if kept is not None and now - kept[0] <= self.window:
+                self._shared_window += 1
+                return kept[1]
+            generation = self._generations.get(key[0], 0)
+            flight_key = (generation, key)
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = Future()
+                self._upstream += 1
+            else:
+                self._shared_in_flight += 1
+        if not leader:
+            # The leader is bounded by its own deadline; ours may be shorter.
+            left = time_left()
+            try:
+                return flight.result(timeout=None if left is None else max(left, 0.0))
+            except TimeoutError:
+                raise DeadlineExceeded("Request deadline passed while waiting for a shared Google Tasks call.")
+        try:
+            result = call()
+        except BaseException as error:
+            with self._lock:
+                self._flights.pop(flight_key, None)
+            flight.set_exception(error)
+            raise
+        with self._lock:
+            self._flights.pop(flight_key, None)
+            if self.window > 0 and self._generations.get(key[0], 0) == generation:
+                self._results[key] = (time.monotonic(), result)
+                self._prune()
+                self._schedule_expiry()
+        flight.set_result(result)
+        return result
+
+    def forget(self, owner: Hashable) -> None:
+        """Drop the results kept for ``owner``; its calls still in flight are not joined or kept.
+
+        Callers already waiting on such a call still get its result.
+        """
+        with self._lock:
+            self._generations[owner] = self._generations.get(owner, 0) + 1
+            for key in [key for key in self._results if key[0] is owner]:
+                del self._results[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "window": self.window,
+                "calls": self._calls,
+                "upstream": self._upstream,
+                "saved": self._shared_in_flight + self._shared_window,
+                "shared_in_flight": self._shared_in_flight,
+                "shared_window": self._shared_window,
+                "in_flight": len(self._flights),
+            }
+
+    def _prune(self) -> None:
+        # Called with the lock held.
+        expired_before = time.monotonic() - self.window
+        for key in [key for key, (stored_at, _) in self._results.items() if stored_at < expired_before]:
+            del self._results[key]
+
+    def _schedule_expiry(self) -> None:
+        # Called with the lock held. One timer at a time, armed for the oldest
+        # result, so kept results (and the clients in their keys) do not
+        # outlive the window while no new call comes in to prune them.
+        if self._expiry is not None or not self._results:
+            return
+        oldest = min(stored_at for stored_at, _ in self._results.values())
+        self._expiry = threading.Timer(max(oldest + self.window - time.monotonic(), 0.0), self._expire)
+        self._expiry.daemon = True
+        self._expiry.start()
+
+    def _expire(self) -> None:
+        with self._lock:
+            self._expiry = None
+            self._prune()
+            self._schedule_expiry()
@@ -0,0 +1,147 @@
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Any
+
+# Frequent Portuguese words that carry no meaning for matching tasks.
+STOPWORDS = frozenset(
+    {
+        "a", "as", "o", "os", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das",
+        "em", "no", "na", "nos", "nas", "e", "ou", "para", "pra", "por", "com", "sem",
+        "que", "se", "ao", "aos", "meu", "minha", "meus", "minhas",
+    }
+)
+TITLE_WEIGHT = 3.0
+NOTES_WEIGHT = 1.0
+# A query word that only prefixes an indexed word ("relat" -> "relatorio") scores less.
+PREFIX_FACTOR = 0.5
+
+
+def _stem(token: str) -> str:
+    """Fold common Portuguese plurals onto the singular (reuniões -> reuniao)."""
+    if len(token) <= 3:
+        return token
+    for suffix, replacement in (("oes", "ao"), ("aes", "ao"), ("ns", "m"), ("ores", "or"), ("zes", "z")):
+        if token.endswith(suffix):
+            return token[: -len(suffix)] + replacement
+    if token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, strip accents, split into words, drop stopwords and fold plurals."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return [_stem(token) for token in re.findall(r"[a-z0-9]+", stripped) if token not in STOPWORDS]
+
+
+class TaskIndex:
+    """Immutable search index over a snapshot of tasks.
+
+    Holds an inverted index on title and notes plus sorted indexes on the
+    due date and the update time, and a per-status grouping. Build a new one
+    whenever the underlying tasks change.
+    """
+
+    def __init__(self, entries: list[tuple[str, dict[str, Any]]]) -> None:
+        """``entries`` are ``(tasklist_id, task)`` pairs."""
+        self._entries = entries
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._by_status: dict[str, set[int]] = defaultdict(set)
+        self._by_tasklist: dict[str, set[int]] = defaultdict(set)
+        due: list[tuple[str, int]] = []
+        updated: list[tuple[str, int]] = []
+        for position, (tasklist, task) in enumerate(entries):
+            for field, weight in (("title", TITLE_WEIGHT), ("notes", NOTES_WEIGHT)):
+                for token in tokenize(task.get(field) or ""):
+                    postings = self._postings[token]
+                    postings[position] = postings.get(position, 0.0) + weight
+            self._by_status[task.get("status") or "needsAction"].add(position)
+            self._by_tasklist[tasklist].add(position)
+            if task.get("due"):
+                due.append((task["due"][:10], position))
+            if task.get("updated"):
+                updated.append((task["updated"], position))
+        due.sort()
+        updated.sort()
+        self._due_keys = [key for key, _ in due]
+        self._due_positions = [position for _, position in due]
+        self._updated_keys = [key for key, _ in updated]
+        self._updated_positions = [position for _, position in updated]
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(
+        self,
+        query: str | None = None,
+        status: str | None = None,
+        due_from: str | None = None,
+        due_to: str | None = None,
+        updated_after: str | None = None,
+        tasklist: str | None = None,
+        limit: int = 10,
+    ) -> tuple[list[tuple[str, dict[str, Any], float]], int]:
+        """Return up to ``limit`` ``(tasklist_id, task, score)`` matches and the total match count.
+
+        Every query word must match (exactly or as a prefix). Dates are
+        ``YYYY-MM-DD`` and inclusive. Text matches rank by score; ties and
+        filter-only searches rank by due date, soonest first.
+        """
+        candidates: set[int] | None = None
+        if status is not None:
+            candidates = self._narrow(candidates, self._by_status.get(status, set()))
+        if tasklist is not None:
+            candidates = self._narrow(candidates, self._by_tasklist.get(tasklist, set()))
+        if due_from is not None or due_to is not None:
+            start = bisect_left(self._due_keys, due_from) if due_from else 0
+            end = bisect_right(self._due_keys, due_to) if due_to else len(self._due_keys)
+            candidates = self._narrow(candidates, set(self._due_positions[start:end]))
+        if updated_after is not None:
+            start = bisect_right(self._updated_keys, updated_after)
+            candidates = self._narrow(candidates, set(self._updated_positions[start:]))
+
+        scores: dict[int, float] = {}
+        words = tokenize(query or "")
+        if words:
+            for index, word in enumerate(words):
+                word_scores = self._match(word)
+                if index == 0:
+                    scores = word_scores
+                else:
+                    scores = {position: scores[position] + score for position, score in word_scores.items() if position in scores}
+            if candidates is not None:
+                scores = {position: score for position, score in scores.items() if position in candidates}
+            matches = list(scores)
+        else:
+            matches = list(candidates) if candidates is not None else list(range(len(self._entries)))
+
+        def rank(position: int) -> tuple[float, str, str]:
+            task = self._entries[position][1]
+            return (-scores.get(position, 0.0), (task.get("due") or "9999")[:10], task.get("title") or "")
+
+        matches.sort(key=rank)
+        results = [
+            (self._entries[position][0], self._entries[position][1], scores.get(position, 0.0))
+            for position in matches[:limit]
+        ]
+        return results, len(matches)
+
+    def _match(self, word: str) -> dict[int, float]:
+        scores = dict(self._postings.get(word, {}))
+        start = bisect_left(self._vocabulary, word)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(word):
+                break
+            if token == word:
+                continue
+            for position, score in self._postings[token].items():
+                scores[position] = max(scores.get(position, 0.0), score * PREFIX_FACTOR)
+        return scores
+
+    @staticmethod
+    def _narrow(candidates: set[int] | None, allowed: set[int]) -> set[int]:
+        return set(allowed) if candidates is None else candidates & allowed
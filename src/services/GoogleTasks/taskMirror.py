@@ -0,0 +1,159 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+# Changes written close to the sync instant may carry a slightly older
+# "updated" timestamp, so incremental syncs overlap the previous window.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _to_rfc3339(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class TaskMirror:
+    """Local copy of one task list, kept fresh through incremental syncs.
+
+    Tasks live in memory and are optionally persisted to a SQLite file so a
+    restart can resume with an incremental sync instead of a full download.
+    """
+
+    def __init__(
+        self,
+        max_staleness: float = 30.0,
+        db_path: str | None = None,
+        scope: str = "@default",
+    ) -> None:
+        self.max_staleness = max_staleness
+        self.scope = scope
+        self._lock = threading.RLock()
+        self._tasks: dict[str, dict[str, Any]] = {}
+        self._synced_at: datetime | None = None
+        self._checked_at: float | None = None
+        self._version = 0
+        self._db: sqlite3.Connection | None = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS mirror_tasks "
+                "(scope TEXT NOT NULL, id TEXT NOT NULL, payload TEXT NOT NULL, PRIMARY KEY (scope, id))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS mirror_state (scope TEXT PRIMARY KEY, synced_at TEXT NOT NULL)"
+            )
+            self._db.commit()
+            self._load()
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped whenever the mirrored content changes."""
+        return self._version
+
+    def is_stale(self) -> bool:
+        with self._lock:
+            if self._checked_at is None:
+                return True
+            return time.monotonic() - self._checked_at > self.max_staleness
+
+    def tasks(self) -> list[dict[str, Any]]:
+        """Return mirrored tasks in list order (by ``position``)."""
+        with self._lock:
+            return sorted(self._tasks.values(), key=lambda task: task.get("position") or "")
+
+    def refresh(
+        self,
+        fetch_changes: Callable[[str | None], list[dict[str, Any]]],
+        force: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Sync with the API when stale and return the mirrored tasks.
+
+        ``fetch_changes`` receives the ``updatedMin`` bound (``None`` for a full
+        download) and must return every task changed since then, including
+        deleted and hidden ones.
+        """
+        with self._lock:
+            if force or self.is_stale():
+                started_at = datetime.now(timezone.utc)
+                updated_min = None if self._synced_at is None else _to_rfc3339(self._synced_at - SYNC_OVERLAP)
+                items = fetch_changes(updated_min)
+                self._apply(items, full=updated_min is None)
+                self._synced_at = started_at
+                self._checked_at = time.monotonic()
+                self._persist_state()
+            return self.tasks()
+
+    def upsert(self, task: dict[str, Any]) -> None:
+        """Write-through for a task created or updated by this client."""
+        with self._lock:
+            self._apply([task], full=False)
+
+    def remove(self, task_id: str) -> None:
+        """Write-through for a task deleted by this client."""
+        with self._lock:
+            self._apply([{"id": task_id, "deleted": True}], full=False)
+
+    def invalidate(self) -> None:
+        """Force the next read to sync with the API."""
+        with self._lock:
+            self._checked_at = None
+
+    def _apply(self, items: list[dict[str, Any]], full: bool) -> None:
+        changed = False
+        if full and self._tasks:
+            self._tasks.clear()
+            changed = True
+            if self._db is not None:
+                self._db.execute("DELETE FROM mirror_tasks WHERE scope = ?", (self.scope,))
+
+        for item in items:
+            task_id = item.get("id")
+            if not task_id:
+                continue
+            if item.get("deleted") or item.get("hidden"):
+                if self._tasks.pop(task_id, None) is not None:
+                    changed = True
+                    if self._db is not None:
+                        self._db.execute(
+                            "DELETE FROM mirror_tasks WHERE scope = ? AND id = ?", (self.scope, task_id)
+                        )
+                continue
+            if self._tasks.get(task_id) != item:
+                self._tasks[task_id] = item
+                changed = True
+                if self._db is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO mirror_tasks (scope, id, payload) VALUES (?, ?, ?)",
+                        (self.scope, task_id, json.dumps(item, ensure_ascii=False)),
+                    )
+
+        if changed:
+            self._version += 1
+        if self._db is not None:
+            self._db.commit()
+
+    def _persist_state(self) -> None:
+        if self._db is None or self._synced_at is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO mirror_state (scope, synced_at) VALUES (?, ?)",
+            (self.scope, self._synced_at.isoformat()),
+        )
+        self._db.commit()
+
+    def _load(self) -> None:
+        assert self._db is not None
+        rows = self._db.execute("SELECT payload FROM mirror_tasks WHERE scope = ?", (self.scope,))
+        for (payload,) in rows:
+            task = json.loads(payload)
+            self._tasks[task["id"]] = task
+        state = self._db.execute(
+            "SELECT synced_at FROM mirror_state WHERE scope = ?", (self.scope,)
+        ).fetchone()
+        if state is not None:
+            self._synced_at = datetime.fromisoformat(state[0])
+        if self._tasks:
+            self._version += 1
@@ -0,0 +1,134 @@
+import threading
+from concurrent.futures import Future
+from contextvars import copy_context
+from typing import Any
+
+from src.services.GoogleTasks.googleTask import MAX_BATCH_SIZE, GoogleTask, TaskConflictError
+
+
+class _Pending:
+    __slots__ = ("payload", "task_id", "future")
+
+    def __init__(self, payload: Any, task_id: str | None) -> None:
+        self.payload = payload
+        self.task_id = task_id
+        self.future: Future = Future()
+
+
+class WriteCoalescer:
+    """Groups single task writes issued close together into batch requests.
+
+    Writes of the same kind to the same task list wait up to ``window``
+    seconds for company and are then sent as one ``batch*Tasks`` call; a
+    group is sent at once when it reaches ``max_batch`` items. A write to a
+    task that already has a pending write sends the pending groups of that
+    list first, so writes to one task keep their order.
+
+    Callers block until their own item is done and get the same result the
+    single-write method would return.
+    """
+
+    def __init__(self, client: GoogleTask, window: float = 0.05, max_batch: int = MAX_BATCH_SIZE) -> None:
+        self.client = client
+        self.window = window
+        self.max_batch = max(1, min(max_batch, MAX_BATCH_SIZE))
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], list[_Pending]] = {}
+        self._timers: dict[tuple[str, str], threading.Timer] = {}
+        self._operations = 0
+        self._batches = 0
+        self._conflicts = 0
+
+    def create(self, task: dict, tasklist: str = "@default") -> dict | None:
+        """Batched ``createTask``; ``task`` holds ``title``, ``notes``, ``due``, ``status``."""
+        return self._submit("create", tasklist, task, None).result()
+
+    def update(self, update: dict, tasklist: str = "@default") -> dict | None:
+        """Batched ``updateTask``; ``update`` holds ``task_id`` and the fields to change.
+
+        Batched patches carry ``If-Match`` like single ones; the batch settles
+        a stale etag the way ``updateTask`` does and a real conflict raises
+        ``TaskConflictError`` here. Any other failure returns ``None``.
+        """
+        result = self._submit("update", tasklist, update, update["task_id"]).result()
+        if isinstance(result, TaskConflictError):
+            with self._lock:
+                self._conflicts += 1
+            raise result
+        return result
+
+    def delete(self, task_id: str, tasklist: str = "@default") -> bool:
+        """Batched ``deleteTask``."""
+        return self._submit("delete", tasklist, task_id, task_id).result()
+
+    def flush(self) -> None:
+        """Send every pending group now."""
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            self._flush(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "operations": self._operations,
+                "batches": self._batches,
+                "conflicts": self._conflicts,
+                "pending": sum(len(group) for group in self._pending.values()),
+            }
+
+    def _submit(self, kind: str, tasklist: str, payload: Any, task_id: str | None) -> Future:
+        key = (kind, tasklist)
+        item = _Pending(payload, task_id)
+        with self._lock:
+            blocking = [
+                pending_key
+                for pending_key, group in self._pending.items()
+                if task_id is not None
+                and pending_key[1] == tasklist
+                and any(pending.task_id == task_id for pending in group)
+            ]
+        for pending_key in blocking:
+            self._flush(pending_key)
+
+        with self._lock:
+            self._operations += 1
+            group = self._pending.setdefault(key, [])
+            group.append(item)
+            full = len(group) >= self.max_batch
+            if len(group) == 1 and not full:
+                # Timer threads start with an empty context: carry the request's
+                # user and deadline over to the batch call.
+                timer = threading.Timer(self.window, copy_context().run, args=(self._flush, key))
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+        if full:
+            self._flush(key)
+        return item.future
+
+    def _flush(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            group = self._pending.pop(key, [])
+            timer = self._timers.pop(key, None)
+            if group:
+                self._batches += 1
+        if timer is not None:
+            timer.cancel()
+        if not group:
+            return
+        kind, tasklist = key
+        payloads = [item.payload for item in group]
+        try:
+            if kind == "create":
+                results = self.client.batchCreateTasks(payloads, tasklist=tasklist)
+            elif kind == "update":
+                results = self.client.batchUpdateTasks(payloads, tasklist=tasklist, check_etags=True)
+            else:
+                results = self.client.batchDeleteTasks(payloads, tasklist=tasklist)
+        except Exception as error:
+            for item in group:
+                item.future.set_exception(error)
+            return
+        for item, result in zip(group, results):
+            item.future.set_result(result)
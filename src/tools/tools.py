@@ -1,22 +1,219 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import threading
+import unicodedata
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import date, datetime, timezone
 from typing import Any
 
+from google.oauth2.credentials import Credentials
 from langchain.tools import tool
 from pydantic import BaseModel, Field
 
-from src.services.GoogleTasks.googleTask import GoogleTask
+from src.services.GoogleTasks.clientCache import GoogleTaskClientCache
+from src.services.GoogleTasks.credentialStore import CredentialStore
+from src.services.GoogleTasks.googleTask import AuthorizationRequiredError, GoogleTask, TaskConflictError
+from src.services.GoogleTasks.requestScheduler import RequestScheduler
+from src.services.GoogleTasks.singleFlight import SingleFlight
+from src.services.GoogleTasks.taskMirror import TaskMirror
+from src.services.GoogleTasks.writeCoalescer import WriteCoalescer
 
+# Account the tools act for; None means the single-account token.json client.
+current_user_id: ContextVar[str | None] = ContextVar("current_user_id", default=None)
+# Set while a batch of agent runs is in flight: single writes are grouped into batch requests.
+current_write_coalescer: ContextVar[WriteCoalescer | None] = ContextVar("current_write_coalescer", default=None)
+# Listing started speculatively for the request being served (see ListPrefetch).
+current_list_prefetch: ContextVar[ListPrefetch | None] = ContextVar("current_list_prefetch", default=None)
+
+# The API quota is per project, so every client (one per user) shares one scheduler.
+_request_scheduler = RequestScheduler(
+    rate=float(os.getenv("GOOGLE_TASKS_RATE_LIMIT", "25")),
+    burst=float(os.getenv("GOOGLE_TASKS_RATE_BURST", "50")),
+    max_attempts=int(os.getenv("GOOGLE_TASKS_MAX_ATTEMPTS", "4")),
+    base_delay=float(os.getenv("GOOGLE_TASKS_BACKOFF_BASE", "0.5")),
+    max_delay=float(os.getenv("GOOGLE_TASKS_BACKOFF_MAX", "32")),
+)
+# Identical task reads of one account issued together share a single API call.
+_single_flight = SingleFlight(window=float(os.getenv("GOOGLE_TASKS_COALESCE_WINDOW", "0.5")))
+# Prefetches mostly wait on the API; the HTTP pool still caps concurrent connections.
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GOOGLE_TASKS_PREFETCH_WORKERS", "32")),
+    thread_name_prefix="list-prefetch",
+)
 _google_tasks_client: GoogleTask | None = None
+_google_tasks_clients: GoogleTaskClientCache | None = None
+_google_tasks_client_lock = threading.Lock()
+_interactive_auth = True
+
+
+def disable_interactive_auth() -> None:
+    """Never open the browser OAuth flow in this process (e.g. the HTTP server)."""
+    global _interactive_auth
+    _interactive_auth = False
+
+
+@contextmanager
+def acting_as(user_id: str | None) -> Iterator[None]:
+    """Route Google Tasks calls made inside the block to ``user_id``'s account."""
+    token = current_user_id.set(user_id)
+    try:
+        yield
+    finally:
+        current_user_id.reset(token)
+
+
+@contextmanager
+def coalescing_writes(window: float) -> Iterator[WriteCoalescer]:
+    """Send the write tools' calls made inside the block as batched API requests."""
+    coalescer = WriteCoalescer(get_google_tasks_client(), window=window)
+    token = current_write_coalescer.set(coalescer)
+    try:
+        yield coalescer
+    finally:
+        current_write_coalescer.reset(token)
+        coalescer.flush()
+
+
+def _coalescer_for(client: GoogleTask) -> WriteCoalescer | None:
+    coalescer = current_write_coalescer.get()
+    return coalescer if coalescer is not None and coalescer.client is client else None
+
+
+def _mirrors_enabled() -> bool:
+    return os.getenv("GOOGLE_TASKS_MIRROR_ENABLED", "true").lower() != "false"
 
 
-def _get_google_tasks_client() -> GoogleTask:
+def _build_task_mirror(scope: str = "@default") -> TaskMirror:
+    return TaskMirror(
+        max_staleness=float(os.getenv("GOOGLE_TASKS_MIRROR_MAX_STALENESS", "30")),
+        db_path=os.getenv("GOOGLE_TASKS_MIRROR_DB") or None,
+        scope=scope,
+    )
+
+
+def _build_client(
+    user_id: str | None = None,
+    credentials: Credentials | None = None,
+    on_credentials_refresh: Callable[[Credentials], None] | None = None,
+) -> GoogleTask:
+    # Mirror scopes ("<tasklist>" or "<user>:<tasklist>") keep SQLite rows apart.
+    prefix = "" if user_id is None else f"{user_id}:"
+    return GoogleTask(
+        mirror_factory=(lambda tasklist: _build_task_mirror(f"{prefix}{tasklist}")) if _mirrors_enabled() else None,
+        use_etags=os.getenv("GOOGLE_TASKS_ETAG_CHECK", "true").lower() != "false",
+        pool_size=int(os.getenv("GOOGLE_TASKS_POOL_SIZE", "10")),
+        pool_timeout=float(os.getenv("GOOGLE_TASKS_POOL_TIMEOUT", "30")),
+        credentials=credentials,
+        interactive=_interactive_auth,
+        scheduler=_request_scheduler,
+        single_flight=_single_flight,
+        on_credentials_refresh=on_credentials_refresh,
+    )
+
+
+def build_credential_store() -> CredentialStore | None:
+    """Encrypted per-user credential store, or None when no key is configured."""
+    key = os.getenv("GOOGLE_TASKS_CREDENTIALS_KEY")
+    if not key:
+        return None
+    return CredentialStore(
+        key,
+        backend=os.getenv("GOOGLE_TASKS_CREDENTIALS_BACKEND", "file"),
+        location=os.getenv("GOOGLE_TASKS_CREDENTIALS_PATH", "credential_store"),
+    )
+
+
+def _get_client_cache() -> GoogleTaskClientCache:
+    global _google_tasks_clients
+    if _google_tasks_clients is None:
+        with _google_tasks_client_lock:
+            if _google_tasks_clients is None:
+                store = build_credential_store()
+                if store is None:
+                    raise AuthorizationRequiredError("Per-user accounts require GOOGLE_TASKS_CREDENTIALS_KEY.")
+                _google_tasks_clients = GoogleTaskClientCache(
+                    store,
+                    factory=_build_client,
+                    max_clients=int(os.getenv("GOOGLE_TASKS_MAX_CLIENTS", "100")),
+                    refresh_margin=float(os.getenv("GOOGLE_TASKS_TOKEN_REFRESH_MARGIN", "300")),
+                )
+    return _google_tasks_clients
+
+
+def get_google_tasks_client() -> GoogleTask:
+    """Tasks client for the current user; concurrent first calls build it only once."""
+    user_id = current_user_id.get()
+    if user_id is not None:
+        return _get_client_cache().get(user_id)
     global _google_tasks_client
     if _google_tasks_client is None:
-        _google_tasks_client = GoogleTask()
+        with _google_tasks_client_lock:
+            if _google_tasks_client is None:
+                _google_tasks_client = _build_client()
     return _google_tasks_client
 
 
+def set_google_tasks_client(client: GoogleTask | None) -> None:
+    """Install a prebuilt single-account client (e.g. one backed by a fake transport)."""
+    global _google_tasks_client
+    with _google_tasks_client_lock:
+        _google_tasks_client = client
+
+
+def google_tasks_pool_stats() -> dict[str, Any]:
+    """Connection pool metrics of the single-account client, empty until it is built."""
+    client = _google_tasks_client
+    return client.poolStats() if client is not None else {}
+
+
+def google_tasks_scheduler_stats() -> dict[str, Any]:
+    """Quota limiter and retry counters shared by every Tasks client."""
+    return _request_scheduler.stats()
+
+
+def google_tasks_single_flight_stats() -> dict[str, Any]:
+    """Task reads answered by a shared call instead of one of their own, across every client."""
+    return _single_flight.stats()
+
+
+def google_tasks_client_cache_stats() -> dict[str, Any]:
+    """Per-user client cache metrics, empty until a user request arrives."""
+    clients = _google_tasks_clients
+    return clients.stats() if clients is not None else {}
+
+
+def google_tasks_version() -> int | None:
+    """Task-list version of fresh mirrors, used to key cached agent answers; None when a sync is due."""
+    return get_google_tasks_client().getTasksVersion()
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold().strip())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _resolve_tasklist(client: GoogleTask, tasklist: str | None) -> str:
+    """Map a task list id or title (case and accent-insensitive) to its id."""
+    if not tasklist or tasklist == "@default":
+        return "@default"
+    task_lists = client.getTaskLists()
+    if task_lists is None:
+        return tasklist
+    for task_list in task_lists:
+        if task_list["id"] == tasklist:
+            return tasklist
+    wanted = _fold(tasklist)
+    for task_list in task_lists:
+        if _fold(task_list.get("title") or "") == wanted:
+            return task_list["id"]
+    raise ValueError(f"Unknown task list: {tasklist}. Use google_tasks_tasklists to see the available lists.")
+
+
 def _serialize_task(task: dict[str, Any]) -> dict[str, Any]:
     return {
         "id": task.get("id"),
@@ -28,23 +225,78 @@ def _serialize_task(task: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+_TASKLIST_DESCRIPTION = "Task list id or title. Defaults to the user's default list."
+
+
+@tool(
+    "google_tasks_tasklists",
+    description="List the user's Google Tasks lists (id and title). The first one is the default list.",
+)
+def google_tasks_tasklists() -> dict[str, Any]:
+    try:
+        task_lists = get_google_tasks_client().getTaskLists()
+        if task_lists is None:
+            return {"ok": False, "error": "Task lists could not be loaded."}
+        return {
+            "ok": True,
+            "count": len(task_lists),
+            "tasklists": [{"id": task_list["id"], "title": task_list.get("title")} for task_list in task_lists],
+        }
+    except Exception as error:
+        return {"ok": False, "error": f"Failed to list task lists: {error}"}
+
+
 class ListTasksInput(BaseModel):
     limit: int = Field(
         default=20,
         ge=1,
         le=100,
-        description="Maximum number of tasks returned (1 to 100).",
+        description="Maximum number of tasks returned (1 to 100), per list when all_lists is true.",
+    )
+    tasklist: str | None = Field(default=None, description=_TASKLIST_DESCRIPTION)
+    all_lists: bool = Field(
+        default=False,
+        description="List tasks of every task list at once, grouped by list.",
     )
 @tool(
     "google_tasks_list",
     args_schema=ListTasksInput,
-    description="List tasks from the default Google Tasks list.",
+    description="List tasks from one Google Tasks list (the default one unless tasklist is given) or from all lists.",
 )
-def google_tasks_list(limit: int = 20) -> dict[str, Any]:
+def google_tasks_list(limit: int = 20, tasklist: str | None = None, all_lists: bool = False) -> dict[str, Any]:
     """Return task list in a predictable structure for agent consumption."""
+    prefetch = current_list_prefetch.get()
+    if prefetch is not None:
+        reused = prefetch.serve(limit, tasklist, all_lists)
+        if reused is not None:
+            return reused
+    return _list_tasks(limit, tasklist, all_lists)
+
+
+def _list_tasks(limit: int, tasklist: str | None, all_lists: bool) -> dict[str, Any]:
     try:
-        tasks = _get_google_tasks_client().getTasks() or []
-        serialized = [_serialize_task(task) for task in tasks[:limit]]
+        client = get_google_tasks_client()
+        if all_lists:
+            task_lists = client.getAllTasks(limit=limit)
+            if task_lists is None:
+                return {"ok": False, "error": "Task lists could not be loaded."}
+            grouped = [
+                {
+                    "id": task_list["id"],
+                    "title": task_list["title"],
+                    "count": len(task_list["tasks"]),
+                    "tasks": [_serialize_task(task) for task in task_list["tasks"]],
+                }
+                for task_list in task_lists
+            ]
+            return {
+                "ok": True,
+                "count": sum(task_list["count"] for task_list in grouped),
+                "tasklists": grouped,
+                "message": "Tasks listed successfully.",
+            }
+        tasks = client.getCachedTasks(limit=limit, tasklist=_resolve_tasklist(client, tasklist)) or []
+        serialized = [_serialize_task(task) for task in tasks]
         return {
             "ok": True,
             "count": len(serialized),
@@ -55,6 +307,192 @@ def google_tasks_list(limit: int = 20) -> dict[str, Any]:
         return {"ok": False, "error": f"Failed to list tasks: {error}"}
 
 
+class ListPrefetch:
+    """``google_tasks_list(all_lists=True)`` started before anyone asked for it.
+
+    The listing runs in the background from the moment the request arrives;
+    list calls it covers (every list or a single one, at most ``limit`` tasks
+    each) wait for it instead of going to the API again. After a write in the
+    same turn it is stale and list calls fetch fresh data.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.stale = False
+        # The copied context keeps the user, deadline and trace of the request.
+        self._future = _prefetch_executor.submit(copy_context().run, _list_tasks, limit, None, True)
+        _prefetch_stats.record("started")
+
+    def result(self) -> dict[str, Any]:
+        return self._future.result()
+
+    async def aresult(self) -> dict[str, Any]:
+        return await asyncio.wrap_future(self._future)
+
+    def serve(self, limit: int, tasklist: str | None, all_lists: bool) -> dict[str, Any] | None:
+        """Answer a google_tasks_list call from the prefetch, or None when it does not cover it."""
+        if self.stale or limit > self.limit:
+            return None
+        listed = self.result()
+        if not listed.get("ok"):
+            return None
+        grouped = [
+            {**task_list, "count": len(task_list["tasks"][:limit]), "tasks": task_list["tasks"][:limit]}
+            for task_list in listed["tasklists"]
+        ]
+        if all_lists:
+            _prefetch_stats.record("served")
+            return {
+                "ok": True,
+                "count": sum(task_list["count"] for task_list in grouped),
+                "tasklists": grouped,
+                "message": "Tasks listed successfully.",
+            }
+        try:
+            tasklist_id = _resolve_tasklist(get_google_tasks_client(), tasklist)
+        except Exception:
+            return None
+        if tasklist_id == "@default":
+            # Lists come back in getTaskLists order, the default one first.
+            match = grouped[0] if grouped else None
+        else:
+            match = next((task_list for task_list in grouped if task_list["id"] == tasklist_id), None)
+        if match is None:
+            return None
+        _prefetch_stats.record("served")
+        return {
+            "ok": True,
+            "count": match["count"],
+            "tasks": match["tasks"],
+            "message": "Tasks listed successfully.",
+        }
+
+
+class _PrefetchStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {"started": 0, "served": 0, "discarded": 0}
+
+    def record(self, event: str) -> None:
+        with self._lock:
+            self._counts[event] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+_prefetch_stats = _PrefetchStats()
+
+
+@contextmanager
+def using_list_prefetch(prefetch: ListPrefetch | None) -> Iterator[ListPrefetch | None]:
+    """Let google_tasks_list calls made inside the block reuse ``prefetch``."""
+    token = current_list_prefetch.set(prefetch)
+    try:
+        yield prefetch
+    finally:
+        current_list_prefetch.reset(token)
+
+
+def discard_list_prefetch() -> None:
+    """Stop serving the current prefetch; called after a write changed the task lists."""
+    prefetch = current_list_prefetch.get()
+    if prefetch is not None and not prefetch.stale:
+        prefetch.stale = True
+        _prefetch_stats.record("discarded")
+
+
+def google_tasks_prefetch_stats() -> dict[str, int]:
+    """Speculative listings started, list calls they answered and listings dropped after writes."""
+    return _prefetch_stats.snapshot()
+
+
+def _updated_key(value: str) -> str | None:
+    """``value`` in the form of the API's ``updated`` timestamps (UTC, milliseconds), or None if invalid.
+
+    A bare date is kept as is: it sorts before every timestamp of that day.
+    """
+    try:
+        if len(value) == 10:
+            return date.fromisoformat(value).isoformat()
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class SearchTasksInput(BaseModel):
+    query: str | None = Field(
+        default=None,
+        description="Words to look for in task titles and notes (accents and case are ignored; word prefixes match).",
+    )
+    status: str | None = Field(default=None, description="Only tasks with this status: needsAction or completed.")
+    due_from: str | None = Field(default=None, description="Only tasks due on or after this date (YYYY-MM-DD).")
+    due_to: str | None = Field(default=None, description="Only tasks due on or before this date (YYYY-MM-DD).")
+    updated_after: str | None = Field(
+        default=None,
+        description="Only tasks changed after this moment (RFC3339, e.g. 2026-02-25T12:00:00Z) or on/after this date (YYYY-MM-DD).",
+    )
+    tasklist: str | None = Field(default=None, description="Task list id or title. Searches every list when omitted.")
+    limit: int = Field(default=10, ge=1, le=50, description="Maximum number of tasks returned (1 to 50).")
+
+
+@tool(
+    "google_tasks_search",
+    args_schema=SearchTasksInput,
+    description=(
+        "Find tasks across all Google Tasks lists by words in the title or notes, status, due-date range "
+        "and last-change time. "
+        "Results are ranked by relevance and carry the id of their task list."
+    ),
+)
+def google_tasks_search(
+    query: str | None = None,
+    status: str | None = None,
+    due_from: str | None = None,
+    due_to: str | None = None,
+    updated_after: str | None = None,
+    tasklist: str | None = None,
+    limit: int = 10,
+) -> dict[str, Any]:
+    if status not in (None, "needsAction", "completed"):
+        return {"ok": False, "error": "Invalid status. Use one of: needsAction, completed."}
+    updated_key = _updated_key(updated_after) if updated_after else None
+    if updated_after and updated_key is None:
+        return {"ok": False, "error": "Invalid updated_after. Use RFC3339 (e.g. 2026-02-25T12:00:00Z) or YYYY-MM-DD."}
+    try:
+        client = get_google_tasks_client()
+        tasklist_id = None
+        if tasklist:
+            tasklist_id = _resolve_tasklist(client, tasklist)
+            if tasklist_id == "@default":
+                # The index is keyed by real list ids; the default list comes first.
+                tasklist_id = (client.getTaskLists() or [{"id": None}])[0]["id"]
+        found = client.searchTasks(
+            query=query,
+            status=status,
+            due_from=due_from[:10] if due_from else None,
+            due_to=due_to[:10] if due_to else None,
+            updated_after=updated_key,
+            tasklist=tasklist_id,
+            limit=limit,
+        )
+        if found is None:
+            return {"ok": False, "error": "Tasks could not be searched."}
+        matches, total = found
+        return {
+            "ok": True,
+            "count": len(matches),
+            "total_matches": total,
+            "tasks": [{**_serialize_task(task), "tasklist": task_list} for task_list, task, _ in matches],
+        }
+    except Exception as error:
+        return {"ok": False, "error": f"Failed to search tasks: {error}"}
+
+
 class CreateTaskInput(BaseModel):
     title: str = Field(..., min_length=1, description="Task title.")
     notes: str | None = Field(default=None, description="Optional task notes.")
@@ -62,14 +500,26 @@ class CreateTaskInput(BaseModel):
         default=None,
         description="Optional due date in RFC3339 format (e.g. 2026-02-25T12:00:00.000Z).",
     )
+    tasklist: str | None = Field(default=None, description=_TASKLIST_DESCRIPTION)
 @tool(
     "google_tasks_create",
     args_schema=CreateTaskInput,
-    description="Create a task in Google Tasks default list.",
+    description="Create a task in a Google Tasks list (the default one unless tasklist is given).",
 )
-def google_tasks_create(title: str, notes: str | None = None, due: str | None = None) -> dict[str, Any]:
+def google_tasks_create(
+    title: str,
+    notes: str | None = None,
+    due: str | None = None,
+    tasklist: str | None = None,
+) -> dict[str, Any]:
     try:
-        created = _get_google_tasks_client().createTask(title=title, notes=notes, due=due)
+        client = get_google_tasks_client()
+        resolved = _resolve_tasklist(client, tasklist)
+        coalescer = _coalescer_for(client)
+        if coalescer is not None:
+            created = coalescer.create({"title": title, "notes": notes, "due": due}, tasklist=resolved)
+        else:
+            created = client.createTask(title=title, notes=notes, due=due, tasklist=resolved)
         if created is None:
             return {"ok": False, "error": "Task could not be created."}
         return {"ok": True, "task": _serialize_task(created), "message": "Task created successfully."}
@@ -77,6 +527,26 @@ def google_tasks_create(title: str, notes: str | None = None, due: str | None =
         return {"ok": False, "error": f"Failed to create task: {error}"}
 
 
+def _validate_update(
+    title: str | None,
+    notes: str | None,
+    due: str | None,
+    status: str | None,
+) -> str | None:
+    if status not in (None, "needsAction", "completed"):
+        return "Invalid status. Use one of: needsAction, completed."
+    if not any(value is not None for value in (title, notes, due, status)):
+        return "At least one field to update must be provided."
+    return None
+
+
+def _conflict_result(conflict: TaskConflictError) -> dict[str, Any]:
+    result = {"ok": False, "conflict": True, "task_id": conflict.task_id, "error": str(conflict)}
+    if conflict.current is not None:
+        result["task"] = _serialize_task(conflict.current)
+    return result
+
+
 class UpdateTaskInput(BaseModel):
     task_id: str = Field(..., min_length=1, description="Task ID to update.")
     title: str | None = Field(default=None, description="New task title.")
@@ -89,6 +559,7 @@ class UpdateTaskInput(BaseModel):
         default=None,
         description="Task status. Valid values: needsAction or completed.",
     )
+    tasklist: str | None = Field(default=None, description=_TASKLIST_DESCRIPTION)
 @tool(
     "google_tasks_update",
     args_schema=UpdateTaskInput,
@@ -100,41 +571,47 @@ def google_tasks_update(
     notes: str | None = None,
     due: str | None = None,
     status: str | None = None,
+    tasklist: str | None = None,
 ) -> dict[str, Any]:
-    if status not in (None, "needsAction", "completed"):
-        return {
-            "ok": False,
-            "error": "Invalid status. Use one of: needsAction, completed.",
-        }
-
-    if not any(value is not None for value in (title, notes, due, status)):
-        return {"ok": False, "error": "At least one field to update must be provided."}
+    validation_error = _validate_update(title=title, notes=notes, due=due, status=status)
+    if validation_error is not None:
+        return {"ok": False, "error": validation_error}
 
     try:
-        updated = _get_google_tasks_client().updateTask(
-            task_id=task_id,
-            title=title,
-            notes=notes,
-            due=due,
-            status=status,
-        )
+        client = get_google_tasks_client()
+        changes = {"task_id": task_id, "title": title, "notes": notes, "due": due, "status": status}
+        resolved = _resolve_tasklist(client, tasklist)
+        coalescer = _coalescer_for(client)
+        if coalescer is not None:
+            updated = coalescer.update(changes, tasklist=resolved)
+        else:
+            updated = client.updateTask(**changes, tasklist=resolved)
         if updated is None:
             return {"ok": False, "error": "Task could not be updated."}
         return {"ok": True, "task": _serialize_task(updated), "message": "Task updated successfully."}
+    except TaskConflictError as conflict:
+        return _conflict_result(conflict)
     except Exception as error:
         return {"ok": False, "error": f"Failed to update task: {error}"}
 
 
 class DeleteTaskInput(BaseModel):
     task_id: str = Field(..., min_length=1, description="Task ID to delete.")
+    tasklist: str | None = Field(default=None, description=_TASKLIST_DESCRIPTION)
 @tool(
     "google_tasks_delete",
     args_schema=DeleteTaskInput,
-    description="Delete a task by task ID from Google Tasks default list.",
+    description="Delete a task by task ID from a Google Tasks list (the default one unless tasklist is given).",
 )
-def google_tasks_delete(task_id: str) -> dict[str, Any]:
+def google_tasks_delete(task_id: str, tasklist: str | None = None) -> dict[str, Any]:
     try:
-        deleted = _get_google_tasks_client().deleteTask(task_id=task_id)
+        client = get_google_tasks_client()
+        resolved = _resolve_tasklist(client, tasklist)
+        coalescer = _coalescer_for(client)
+        if coalescer is not None:
+            deleted = coalescer.delete(task_id, tasklist=resolved)
+        else:
+            deleted = client.deleteTask(task_id=task_id, tasklist=resolved)
         if not deleted:
             return {"ok": False, "error": "Task could not be deleted."}
         return {"ok": True, "task_id": task_id, "message": "Task deleted successfully."}
@@ -142,9 +619,158 @@ def google_tasks_delete(task_id: str) -> dict[str, Any]:
         return {"ok": False, "error": f"Failed to delete task: {error}"}
 
 
+def _group_by_tasklist(client: GoogleTask, tasklists: list[str | None]) -> dict[str, list[int]]:
+    """Indexes of bulk items per resolved task list; each list gets its own batch."""
+    groups: dict[str, list[int]] = {}
+    for index, tasklist in enumerate(tasklists):
+        groups.setdefault(_resolve_tasklist(client, tasklist), []).append(index)
+    return groups
+
+
+def _bulk_result(results: list[dict[str, Any]], action: str) -> dict[str, Any]:
+    succeeded = sum(1 for result in results if result["ok"])
+    return {
+        "ok": succeeded == len(results),
+        "count": len(results),
+        "succeeded": succeeded,
+        "results": results,
+        "message": f"{succeeded} of {len(results)} tasks {action}.",
+    }
+
+
+class BulkCreateTasksInput(BaseModel):
+    tasks: list[CreateTaskInput] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Tasks to create (1 to 50).",
+    )
+@tool(
+    "google_tasks_bulk_create",
+    args_schema=BulkCreateTasksInput,
+    description="Create several tasks with a single request; each task may name its own tasklist.",
+)
+def google_tasks_bulk_create(tasks: list[CreateTaskInput]) -> dict[str, Any]:
+    try:
+        client = get_google_tasks_client()
+        created: list[dict[str, Any] | None] = [None] * len(tasks)
+        for tasklist, indexes in _group_by_tasklist(client, [task.tasklist for task in tasks]).items():
+            batch = client.batchCreateTasks(
+                [{"title": tasks[index].title, "notes": tasks[index].notes, "due": tasks[index].due} for index in indexes],
+                tasklist=tasklist,
+            )
+            for index, task in zip(indexes, batch):
+                created[index] = task
+        results = [
+            {"ok": True, "task": _serialize_task(task)}
+            if task is not None
+            else {"ok": False, "error": "Task could not be created."}
+            for task in created
+        ]
+        return _bulk_result(results, "created")
+    except Exception as error:
+        return {"ok": False, "error": f"Failed to create tasks: {error}"}
+
+
+class BulkUpdateTasksInput(BaseModel):
+    updates: list[UpdateTaskInput] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Task updates to apply (1 to 50), each with its task ID.",
+    )
+
+
+@tool(
+    "google_tasks_bulk_update",
+    args_schema=BulkUpdateTasksInput,
+    description="Update several existing tasks by task ID with a single request; each update may name its own tasklist.",
+)
+def google_tasks_bulk_update(updates: list[UpdateTaskInput]) -> dict[str, Any]:
+    results: list[dict[str, Any] | None] = [None] * len(updates)
+    pending: list[tuple[int, UpdateTaskInput]] = []
+    for index, update in enumerate(updates):
+        validation_error = _validate_update(
+            title=update.title, notes=update.notes, due=update.due, status=update.status
+        )
+        if validation_error is not None:
+            results[index] = {"ok": False, "task_id": update.task_id, "error": validation_error}
+        else:
+            pending.append((index, update))
+
+    try:
+        client = get_google_tasks_client()
+        groups = _group_by_tasklist(client, [update.tasklist for _, update in pending])
+        for tasklist, positions in groups.items():
+            # If-Match guards each patch like a single update does; stale etags are
+            # settled inside the batch call and only real conflicts come back.
+            batch = client.batchUpdateTasks(
+                [pending[position][1].model_dump() for position in positions],
+                tasklist=tasklist,
+                check_etags=True,
+            )
+            for position, task in zip(positions, batch):
+                index, update = pending[position]
+                if isinstance(task, TaskConflictError):
+                    results[index] = _conflict_result(task)
+                elif task is None:
+                    results[index] = {"ok": False, "task_id": update.task_id, "error": "Task could not be updated."}
+                else:
+                    results[index] = {"ok": True, "task": _serialize_task(task)}
+        return _bulk_result(results, "updated")
+    except Exception as error:
+        return {"ok": False, "error": f"Failed to update tasks: {error}"}
+
+
+class BulkDeleteTasksInput(BaseModel):
+    task_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Task IDs to delete (1 to 50).",
+    )
+    tasklist: str | None = Field(default=None, description=_TASKLIST_DESCRIPTION)
+@tool(
+    "google_tasks_bulk_delete",
+    args_schema=BulkDeleteTasksInput,
+    description="Delete several tasks of one Google Tasks list by task ID with a single request.",
+)
+def google_tasks_bulk_delete(task_ids: list[str], tasklist: str | None = None) -> dict[str, Any]:
+    try:
+        client = get_google_tasks_client()
+        deleted = client.batchDeleteTasks(task_ids, tasklist=_resolve_tasklist(client, tasklist))
+        results = [
+            {"ok": True, "task_id": task_id}
+            if ok
+            else {"ok": False, "task_id": task_id, "error": "Task could not be deleted."}
+            for task_id, ok in zip(task_ids, deleted)
+        ]
+        return _bulk_result(results, "deleted")
+    except Exception as error:
+        return {"ok": False, "error": f"Failed to delete tasks: {error}"}
+
+
 GOOGLE_TASKS_TOOLS = [
+    google_tasks_tasklists,
     google_tasks_list,
+    google_tasks_search,
     google_tasks_create,
     google_tasks_update,
     google_tasks_delete,
+    google_tasks_bulk_create,
+    google_tasks_bulk_update,
+    google_tasks_bulk_delete,
 ]
+
+# Tools that change remote state; used to order conflicting calls and to
+# invalidate anything derived from the task list.
+GOOGLE_TASKS_WRITE_TOOLS = frozenset(
+    {
+        "google_tasks_create",
+        "google_tasks_update",
+        "google_tasks_delete",
+        "google_tasks_bulk_create",
+        "google_tasks_bulk_update",
+        "google_tasks_bulk_delete",
+    }
+)
@@ -0,0 +1,122 @@
+import itertools
+import os
+from typing import Any
+
+import pytest
+from google.oauth2.credentials import Credentials
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.fake_tasks import FakeTasksBackend
+from src.services.GoogleTasks.googleTask import GoogleTask
+
+# The tests run offline: dummy keys satisfy the clients built at import time.
+os.environ.setdefault("LANGFUSE_TRACING_ENABLED", "false")
+os.environ.setdefault("LANGFUSE_PUBLIC_KEY", "pk-offline-test")
+os.environ.setdefault("LANGFUSE_SECRET_KEY", "sk-offline-test")
+os.environ.setdefault("GOOGLE_API_KEY", "offline-test")
+
+_ids = itertools.count(1)
+
+
+class FakeTasksClient:
+    """In-memory stand-in for GoogleTask with one task list and the calls the tools make."""
+
+    def __init__(self, titles: list[str]) -> None:
+        self.task_list = {"id": "list-1", "title": "Minhas tarefas"}
+        self.tasks = [self._new(title) for title in titles]
+        self.list_calls = 0
+
+    def _new(self, title: str, **fields: Any) -> dict[str, Any]:
+        return {"id": f"task-{next(_ids)}", "title": title, "status": "needsAction", **fields}
+
+    def getTaskLists(self) -> list[dict]:
+        return [self.task_list]
+
+    def getCachedTasks(self, limit: int | None = None, tasklist: str = "@default") -> list[dict]:
+        self.list_calls += 1
+        return self.tasks[:limit]
+
+    def getAllTasks(self, limit: int | None = None) -> list[dict]:
+        self.list_calls += 1
+        return [{**self.task_list, "tasks": self.tasks[:limit]}]
+
+    def createTask(
+        self,
+        title: str,
+        notes: str | None = None,
+        due: str | None = None,
+        status: str | None = None,
+        tasklist: str = "@default",
+    ) -> dict:
+        task = self._new(title, notes=notes, due=due)
+        self.tasks.append(task)
+        return task
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Calls ``tool`` with ``args`` for a new question, then answers once the result is in."""
+
+    tool: str
+    args: dict[str, Any]
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(self, messages: list[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        last_human = max(index for index, message in enumerate(messages) if isinstance(message, HumanMessage))
+        if any(isinstance(message, ToolMessage) for message in messages[last_human:]):
+            reply = AIMessage(content="Pronto.")
+        else:
+            reply = AIMessage(
+                content="",
+                tool_calls=[{"name": self.tool, "args": self.args, "id": f"call-{next(_ids)}", "type": "tool_call"}],
+            )
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+
+@pytest.fixture
+def fake_tasks(monkeypatch: pytest.MonkeyPatch) -> FakeTasksClient:
+    client = FakeTasksClient(["pagar conta de luz", "comprar pão", "ligar para o cliente"])
+    monkeypatch.setattr("src.tools.tools._google_tasks_client", client)
+    return client
+
+
+@pytest.fixture
+def scripted_model(monkeypatch: pytest.MonkeyPatch):
+    """Install a ScriptedChatModel built from ``tool`` and ``args``."""
+
+    def install(tool: str, args: dict[str, Any]) -> ScriptedChatModel:
+        model = ScriptedChatModel(tool=tool, args=args)
+        monkeypatch.setattr("src.models.model._model", model)
+        monkeypatch.setattr("src.models.model._model_with_tools", model)
+        return model
+
+    return install
+
+
+@pytest.fixture
+def tasks_backend(monkeypatch: pytest.MonkeyPatch) -> FakeTasksBackend:
+    """In-memory Tasks API behind a real GoogleTask, installed as the tools' client."""
+    backend = FakeTasksBackend(latency=0)
+    client = GoogleTask(credentials=Credentials(token="offline-test"), http_factory=backend.http, interactive=False)
+    monkeypatch.setattr("src.tools.tools._google_tasks_client", client)
+    return backend
+
+
+@pytest.fixture
+def edit_remotely(tasks_backend: FakeTasksBackend):
+    """Change a task behind the client's back, as another device would."""
+
+    def edit(list_id: str, task_id: str, **fields: Any) -> None:
+        with tasks_backend._lock:
+            task = tasks_backend._lists[list_id]["tasks"][task_id]
+            task.update(fields)
+            tasks_backend._touch(task)
+
+    return edit
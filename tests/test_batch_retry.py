@@ -0,0 +1,44 @@
+"""Throttled parts of a batch are sent again; other failed parts are reported as they are."""
+from google.oauth2.credentials import Credentials
+
+from benchmarks.fake_tasks import FakeTasksBackend
+from src.services.GoogleTasks.googleTask import GoogleTask
+from src.services.GoogleTasks.requestScheduler import RequestScheduler
+
+
+def _client(backend: FakeTasksBackend, sleeps: list[float]) -> GoogleTask:
+    scheduler = RequestScheduler(max_attempts=8, base_delay=0.01, sleep=sleeps.append)
+    return GoogleTask(
+        credentials=Credentials(token="offline-test"),
+        http_factory=backend.http,
+        scheduler=scheduler,
+        interactive=False,
+    )
+
+
+def test_batch_resends_throttled_parts_until_they_succeed():
+    backend = FakeTasksBackend(error_rate=0.5, error_status=429, retry_after=0.2)
+    list_id = backend.add_list("Minhas tarefas")
+    sleeps: list[float] = []
+    client = _client(backend, sleeps)
+
+    created = client.batchCreateTasks([{"title": f"t{i}"} for i in range(10)], tasklist=list_id)
+
+    assert all(task is not None for task in created)
+    assert sorted(task["title"] for task in created) == sorted(f"t{i}" for i in range(10))
+    assert client.schedulerStats()["retries"]["rate_limited"] == backend.errors
+    # Each round waits at least the Retry-After of the throttled parts.
+    assert sleeps and min(sleeps) >= 0.2
+
+
+def test_batch_does_not_resend_parts_that_may_have_run():
+    backend = FakeTasksBackend(error_rate=1.0, error_status=503)
+    list_id = backend.add_list("Minhas tarefas")
+    sleeps: list[float] = []
+    client = _client(backend, sleeps)
+
+    created = client.batchCreateTasks([{"title": "a"}, {"title": "b"}], tasklist=list_id)
+
+    assert created == [None, None]
+    assert backend.stats()["operations"] == {"tasks.insert": 2}
+    assert sleeps == []
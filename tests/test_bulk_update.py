@@ -0,0 +1,26 @@
+"""Bulk updates settle stale etags inside the batch and report other failures as they are."""
+from src.tools.tools import get_google_tasks_client, google_tasks_bulk_update
+
+
+def test_bulk_update_reports_conflicts_and_failures_per_item(tasks_backend, edit_remotely):
+    list_id = tasks_backend.add_list("Minhas tarefas")
+    moved, stale, kept = (tasks_backend.add_task(list_id, title=title) for title in ("a", "b", "c"))
+    get_google_tasks_client().getAllTasks()  # remembers every etag
+    edit_remotely(list_id, moved["id"], title="remote")
+    edit_remotely(list_id, stale["id"], notes="remote notes")
+    tasks_backend.reset_stats()
+
+    result = google_tasks_bulk_update.invoke({"updates": [
+        {"task_id": moved["id"], "title": "mine", "tasklist": list_id},
+        {"task_id": stale["id"], "title": "b2", "tasklist": list_id},
+        {"task_id": kept["id"], "title": "c2", "tasklist": list_id},
+        {"task_id": "missing", "title": "x", "tasklist": list_id},
+    ]})
+
+    conflict, merged, updated, missing = result["results"]
+    assert conflict["conflict"] is True and conflict["task"]["title"] == "remote"
+    assert merged["ok"] and merged["task"]["title"] == "b2" and merged["task"]["notes"] == "remote notes"
+    assert updated["ok"] and updated["task"]["title"] == "c2"
+    assert missing == {"ok": False, "task_id": "missing", "error": "Task could not be updated."}
+    # One batch, a re-read per stale item and one retried patch; the 404 is not retried.
+    assert tasks_backend.stats()["operations"] == {"tasks.patch": 5, "tasks.get": 2}
@@ -0,0 +1,66 @@
+"""Tokens refreshed while serving a user's requests are written back to their encrypted store entry."""
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography.fernet import Fernet
+from google.oauth2.credentials import Credentials
+
+from benchmarks.fake_tasks import FakeTasksBackend
+from src.services.GoogleTasks.clientCache import GoogleTaskClientCache
+from src.services.GoogleTasks.credentialStore import CredentialStore
+from src.services.GoogleTasks.googleTask import GoogleTask
+
+
+def _utcnow() -> datetime:
+    # google-auth keeps expiry as a naive UTC datetime.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def offline_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    tokens = itertools.count(1)
+
+    def refresh(self: Credentials, request: object) -> None:
+        self.token = f"fresh-{next(tokens)}"
+        self.expiry = _utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", refresh)
+
+
+def test_refreshed_tokens_are_saved_for_their_user(tmp_path, offline_refresh):
+    store = CredentialStore(Fernet.generate_key(), location=str(tmp_path))
+    store.put("ana", Credentials(
+        token="expired",
+        refresh_token="refresh",
+        client_id="client",
+        client_secret="secret",
+        token_uri="https://oauth2.googleapis.com/token",
+        expiry=_utcnow() - timedelta(minutes=1),
+    ))
+    backend = FakeTasksBackend()
+    backend.add_list("Minhas tarefas")
+
+    def factory(user_id, credentials, on_refresh):
+        return GoogleTask(
+            credentials=credentials,
+            http_factory=backend.http,
+            interactive=False,
+            on_credentials_refresh=on_refresh,
+        )
+
+    cache = GoogleTaskClientCache(store, factory=factory, refresh_interval=3600)
+    try:
+        client = cache.get("ana")
+        # The expired token is refreshed before the first request goes out.
+        assert client.getTaskLists()
+        assert store.get("ana").token == "fresh-1"
+
+        # A 401 makes the connection refresh on its own, in the middle of a request.
+        backend.error_rate, backend.error_status = 1.0, 401
+        assert client.createTask(title="x") is None
+        # AuthorizedHttp refreshes once per 401 it gets back; the newest token is the one kept.
+        assert store.get("ana").token == "fresh-3"
+        assert cache.stats()["token_refreshes"] == 2
+    finally:
+        cache.close()
@@ -0,0 +1,46 @@
+"""Nodes return state deltas: the operator.add reducers must not re-append history."""
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.agent.main import get_agent
+
+# (user input, tool the model calls, its args, whether the snapshot is preloaded)
+SCENARIOS = [
+    ("liste as tarefas que falam de luz", "google_tasks_list", {"limit": 5}, True),
+    ("crie comprar leite", "google_tasks_create", {"title": "comprar leite"}, False),
+]
+
+
+def _stream(user_input: str) -> list[dict]:
+    state = {"messages": [HumanMessage(content=user_input)], "llm_calls": 0, "used_tools": []}
+    return list(get_agent().stream(state, stream_mode="values"))
+
+
+@pytest.mark.parametrize(("user_input", "tool", "args", "preloaded"), SCENARIOS)
+def test_each_step_only_appends_its_new_messages(fake_tasks, scripted_model, user_input, tool, args, preloaded):
+    scripted_model(tool, args)
+    steps = [step["messages"] for step in _stream(user_input)]
+
+    assert len(steps) > 2
+    for previous, current in zip(steps, steps[1:]):
+        assert current[: len(previous)] == previous
+        # A hop adds at most a model reply, a preloaded snapshot or one result per tool call.
+        assert len(current) - len(previous) <= 2
+    # The fake client must serve every call, or the run would only cover the error paths.
+    assert all(json.loads(message.content)["ok"] for message in steps[-1] if isinstance(message, ToolMessage))
+    assert not any("error" in str(message.content).lower() for message in steps[-1] if isinstance(message, SystemMessage))
+    # Human, snapshot, tool call, tool result, answer and finalize_node's final message.
+    snapshot = [SystemMessage] if preloaded else []
+    assert [type(message) for message in steps[-1]] == [
+        HumanMessage, *snapshot, AIMessage, ToolMessage, AIMessage, AIMessage,
+    ]
+
+
+@pytest.mark.parametrize(("user_input", "tool", "args", "preloaded"), SCENARIOS)
+def test_used_tools_holds_each_call_once(fake_tasks, scripted_model, user_input, tool, args, preloaded):
+    scripted_model(tool, args)
+
+    snapshot = ["google_tasks_list"] if preloaded else []
+    assert _stream(user_input)[-1]["used_tools"] == [*snapshot, tool]
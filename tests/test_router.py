@@ -0,0 +1,30 @@
+"""A routed listing is answered from one list call, before any snapshot or model call."""
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agent.main import get_agent
+
+
+def _run(user_input: str) -> dict:
+    state = {"messages": [HumanMessage(content=user_input)], "llm_calls": 0, "used_tools": []}
+    return get_agent().invoke(state)
+
+
+def test_routed_listing_makes_one_list_call(fake_tasks, scripted_model):
+    scripted_model("google_tasks_list", {"limit": 5})
+
+    final = _run("liste minhas tarefas")
+
+    assert fake_tasks.list_calls == 1
+    assert final["used_tools"] == ["google_tasks_list", "router:list"]
+    assert final["llm_calls"] == 0
+    assert [type(message) for message in final["messages"]] == [HumanMessage, AIMessage, AIMessage]
+    assert "comprar pão" in final["messages"][-1].content
+
+
+def test_unrouted_request_still_gets_the_snapshot(fake_tasks, scripted_model):
+    scripted_model("google_tasks_list", {"limit": 5})
+
+    final = _run("liste as tarefas que falam de luz")
+
+    assert final["used_tools"] == ["google_tasks_list", "google_tasks_list"]
+    assert final["llm_calls"] == 2
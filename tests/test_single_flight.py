@@ -0,0 +1,28 @@
+"""Results kept for the sharing window are dropped when it ends, without waiting for another call."""
+import gc
+import time
+import weakref
+
+from src.services.GoogleTasks.singleFlight import SingleFlight
+
+
+class Owner:
+    pass
+
+
+def test_kept_result_expires_without_a_later_call():
+    flight = SingleFlight(window=0.05)
+    owner = Owner()
+    owner_ref = weakref.ref(owner)
+
+    assert flight.do((owner, "tasklists.list"), lambda: ["list"]) == ["list"]
+    assert flight.do((owner, "tasklists.list"), lambda: ["other"]) == ["list"]  # shared within the window
+    del owner
+
+    deadline = time.monotonic() + 2.0
+    while owner_ref() is not None and time.monotonic() < deadline:
+        time.sleep(0.02)
+        gc.collect()
+    # Nothing held on to the key once the window passed.
+    assert owner_ref() is None
+    assert flight.stats()["shared_window"] == 1
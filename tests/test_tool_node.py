@@ -0,0 +1,39 @@
+"""tool_node runs a turn's independent calls in parallel without a process-wide cap."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain.tools import tool
+from langchain_core.messages import AIMessage
+
+from src.agent.config import TOOL_MAX_WORKERS
+from src.agent.nodes.tool_node import tool_node
+from src.models.model import tools_by_name
+
+
+def _turn(calls: int) -> dict:
+    tool_calls = [
+        {"name": "wait_for_all", "args": {"task_id": f"task-{index}"}, "id": f"call-{index}", "type": "tool_call"}
+        for index in range(calls)
+    ]
+    return {"messages": [AIMessage(content="", tool_calls=tool_calls)], "llm_calls": 1, "used_tools": []}
+
+
+def test_concurrent_turns_do_not_share_the_worker_cap(monkeypatch):
+    turns = 2
+    # Every call of both turns must be running at once for the barrier to open.
+    barrier = threading.Barrier(turns * TOOL_MAX_WORKERS, timeout=5)
+
+    @tool("wait_for_all")
+    def wait_for_all(task_id: str) -> dict:
+        """Wait until every call is running."""
+        barrier.wait()
+        return {"ok": True, "task_id": task_id}
+
+    monkeypatch.setitem(tools_by_name, "wait_for_all", wait_for_all)
+    with ThreadPoolExecutor(max_workers=turns) as requests:
+        results = list(requests.map(tool_node, [_turn(TOOL_MAX_WORKERS)] * turns))
+
+    for result in results:
+        assert [message.content for message in result["messages"]] == [
+            f'{{"ok":true,"task_id":"task-{index}"}}' for index in range(TOOL_MAX_WORKERS)
+        ]
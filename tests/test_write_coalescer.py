@@ -0,0 +1,32 @@
+"""Coalesced updates raise real conflicts and return other failures without retrying them."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.services.GoogleTasks.googleTask import TaskConflictError
+from src.services.GoogleTasks.writeCoalescer import WriteCoalescer
+from src.tools.tools import get_google_tasks_client
+
+
+def test_coalesced_updates_only_retry_stale_etags(tasks_backend, edit_remotely):
+    list_id = tasks_backend.add_list("Minhas tarefas")
+    moved, kept = (tasks_backend.add_task(list_id, title=title) for title in ("a", "b"))
+    client = get_google_tasks_client()
+    client.getAllTasks()  # remembers every etag
+    edit_remotely(list_id, moved["id"], title="remote")
+    tasks_backend.reset_stats()
+    coalescer = WriteCoalescer(client, window=0.05)
+
+    updates = [{"task_id": task_id, "title": "mine"} for task_id in (moved["id"], kept["id"], "missing")]
+    with ThreadPoolExecutor(max_workers=len(updates)) as writers:
+        futures = [writers.submit(coalescer.update, update, list_id) for update in updates]
+        with pytest.raises(TaskConflictError) as conflict:
+            futures[0].result()
+        updated, missing = futures[1].result(), futures[2].result()
+
+    assert conflict.value.current["title"] == "remote"
+    assert updated["title"] == "mine"
+    assert missing is None
+    assert coalescer.stats()["batches"] == 1 and coalescer.stats()["conflicts"] == 1
+    # One batch and the re-read of the moved task; nothing else goes out.
+    assert tasks_backend.stats()["operations"] == {"tasks.patch": 3, "tasks.get": 1}